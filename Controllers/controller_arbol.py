@@ -1,9 +1,13 @@
 """
 Controlador del arbol de expresión
 """
+from Controllers.trabajador_arbol import TrabajadorArbol
+from Modelos.analizador_incremental import AnalizadorIncremental
 from Modelos.arbol import ArbolDeExpresion
-from Screens.arbol_visualizer import ArbolVisualizer
-from utils.helpers import balancear_parentesis, eliminar_espacios, validar_expresion
+from Modelos.cache_expresiones import CacheExpresiones
+from Modelos.lexer import ErrorLexico
+from Screens.layout_arbol import calcular_layout
+from utils.instrumentacion import Instrumentacion
 
 
 class Controlador:
@@ -14,17 +18,30 @@ class Controlador:
     y la visualización gráfica.
     """
 
-    def __init__(self, vista):
+    RETARDO_VIVO_MS = 150     # Pausa al escribir antes de analizar en modo en vivo
+    INTERVALO_SONDEO_MS = 30  # Cada cuánto se revisan los mensajes del trabajador
+
+    def __init__(self, vista, capacidad_cache=128):
         """
         Inicializa el controlador y asocia la vista a la clase. 
         Configura los eventos necesarios para interactuar con la vista.
 
         Args:
             vista (Vista): Instancia de la clase Vista que contiene la interfaz gráfica.
+            capacidad_cache (int): Número de expresiones recientes que se conservan
+                                   ya construidas y evaluadas.
         """
         self.vista = vista
         self.arbol = ArbolDeExpresion()
-        self.visualizador = None
+        self.instrumentacion = Instrumentacion()
+        # Los paneles leen los recorridos por páginas de los generadores del árbol
+        self.cache = CacheExpresiones(capacidad_cache, self.instrumentacion, recorridos=False)
+        self.analizador = AnalizadorIncremental()  # Solo se usa desde el trabajador
+        self.trabajador = TrabajadorArbol()
+        self._analisis_pendiente = None
+        self._sondeo = None
+        self._al_terminar = None
+        self._al_fallar = None
         self._configurar_eventos()
 
     def _configurar_eventos(self):
@@ -34,9 +51,63 @@ class Controlador:
         """
         self.vista.configurar_comandos(
             generar_arbol_callback=self.generar_arbol,
-            graficar_arbol_callback=self.graficar_arbol
+            graficar_arbol_callback=self.graficar_arbol,
+            expresion_modificada_callback=self.expresion_modificada,
+            cancelar_callback=self.cancelar,
+            diagnostico_callback=self.abrir_diagnostico
         )
 
+    def _en_segundo_plano(self, tarea, al_terminar, al_fallar):
+        """
+        Ejecuta una tarea en el trabajador y programa la revisión de sus mensajes.
+        Cualquier tarea anterior que siga en curso queda reemplazada.
+
+        Args:
+            tarea (callable): Función (progreso) que se ejecuta en el trabajador.
+            al_terminar (func): Se llama en el hilo de la interfaz con el resultado.
+            al_fallar (func): Se llama en el hilo de la interfaz con la excepción.
+        """
+        self._al_terminar = al_terminar
+        self._al_fallar = al_fallar
+        self.trabajador.solicitar(tarea)
+        self.vista.mostrar_progreso("Procesando", 0.0)
+        if self._sondeo is None:
+            self._sondeo = self.vista.programar(
+                self.INTERVALO_SONDEO_MS, self._revisar_trabajador)
+
+    def _revisar_trabajador(self):
+        """
+        Recoge los mensajes de la tarea vigente: actualiza el progreso y, cuando
+        termina, entrega el resultado o el error. Mientras haya una tarea en curso
+        se vuelve a programar.
+        """
+        self._sondeo = None
+        for _, tipo, dato in self.trabajador.mensajes():
+            if tipo == TrabajadorArbol.PROGRESO:
+                self.vista.mostrar_progreso(*dato)
+                continue
+            al_terminar, al_fallar = self._al_terminar, self._al_fallar
+            self._al_terminar = self._al_fallar = None
+            self.vista.ocultar_progreso()
+            if tipo == TrabajadorArbol.LISTO:
+                al_terminar(dato)
+            else:
+                al_fallar(dato)
+        if self._al_terminar is not None:
+            self._sondeo = self.vista.programar(
+                self.INTERVALO_SONDEO_MS, self._revisar_trabajador)
+
+    def cancelar(self):
+        """
+        Cancela la tarea en curso; la vista conserva los últimos resultados.
+        """
+        if self._al_terminar is None:
+            return
+        self.trabajador.cancelar()
+        self._al_terminar = self._al_fallar = None
+        self.vista.ocultar_progreso()
+        self.vista.mostrar_estado("Operación cancelada.")
+
     def generar_arbol(self):
         """
         Valida la expresión ingresada por el usuario, y si es válida, 
@@ -51,57 +122,194 @@ class Controlador:
                 "Error", "Por favor ingrese una expresión aritmética.")
             return
 
-        # Validar si la expresión contiene caracteres válidos
-        if not validar_expresion(expresion):
+        # Construir el árbol de expresión (o reutilizarlo de la caché) en el
+        # trabajador; el analizador léxico valida caracteres, paréntesis y orden
+        # de los tokens
+        self._en_segundo_plano(lambda progreso: self.cache.obtener(expresion, progreso),
+                               self._mostrar_generado, self._mostrar_error_generar)
+
+    def _mostrar_generado(self, resultado):
+        """
+        Muestra el árbol construido por el trabajador, o el error de su evaluación.
+
+        Args:
+            resultado (ResultadoExpresion): Recorridos y evaluación de la expresión.
+        """
+        self.arbol = resultado.arbol
+        if resultado.error is not None:
             self.vista.mostrar_error(
-                "Error", "La expresión contiene caracteres inválidos.")
+                "Error", f"Expresión no válida: {resultado.error}")
             return
+        self._actualizar_vista_resultados(resultado)
 
-        # Verificar si los paréntesis están balanceados
-        if not balancear_parentesis(expresion):
-            self.vista.mostrar_error(
-                "Error", "Los paréntesis no están balanceados.")
+    def _mostrar_error_generar(self, error):
+        """
+        Muestra el error producido al construir el árbol.
+
+        Args:
+            error (Exception): La excepción lanzada en el trabajador.
+        """
+        if isinstance(error, ErrorLexico):
+            self.vista.mostrar_error("Error", str(error))
+        else:
+            self.vista.mostrar_error("Error", f"Expresión no válida: {error}")
+
+    def expresion_modificada(self):
+        """
+        Con el modo en vivo activo, programa un nuevo análisis de la expresión.
+        Las pulsaciones seguidas se agrupan: solo se analiza cuando el usuario deja
+        de escribir durante `RETARDO_VIVO_MS` milisegundos.
+        """
+        if self._analisis_pendiente is not None:
+            self.vista.cancelar(self._analisis_pendiente)
+            self._analisis_pendiente = None
+        if self.vista.modo_vivo_activo():
+            self._analisis_pendiente = self.vista.programar(
+                self.RETARDO_VIVO_MS, self.analizar_en_vivo)
+        else:
+            self.vista.mostrar_estado("")
+
+    def analizar_en_vivo(self):
+        """
+        Analiza y evalúa la expresión actual en el trabajador, de forma incremental,
+        reutilizando el trabajo de la versión anterior. Los errores se muestran bajo
+        la entrada en lugar de en un cuadro de diálogo, para no interrumpir la
+        escritura.
+        """
+        self._analisis_pendiente = None
+        expresion = self.vista.obtener_expresion()
+        if not expresion.strip():
+            self.vista.mostrar_estado("")
+            self.vista.mostrar_evaluacion("")
             return
 
-        # Limpiar espacios en blanco antes de procesar la expresión
-        expresion = eliminar_espacios(expresion)
+        def tarea(progreso):
+            progreso("Analizando", 0.0)
+            with self.instrumentacion.etapa("analisis_incremental"):
+                raiz = self.analizador.actualizar(expresion)
+            progreso("Evaluando", 0.5)
+            with self.instrumentacion.etapa("evaluacion_incremental"):
+                try:
+                    return raiz, self.analizador.evaluar(), None
+                except (ZeroDivisionError, ValueError, OverflowError) as e:
+                    return raiz, None, e
 
-        try:
-            # Construir el árbol de expresión
-            self.arbol.construir_arbol(expresion)
-            self.visualizador = ArbolVisualizer(self.arbol)
-            self._actualizar_vista_resultados()
-        except Exception as e:
-            self.vista.mostrar_error("Error", f"Expresión no válida: {e}")
+        self._en_segundo_plano(tarea, self._mostrar_en_vivo,
+                               lambda error: self.vista.mostrar_estado(str(error)))
+
+    def _mostrar_en_vivo(self, resultado):
+        """
+        Muestra el resultado del análisis en vivo.
 
-    def _actualizar_vista_resultados(self):
+        Args:
+            resultado (tuple): (raíz del árbol, evaluación, error de evaluación o None)
+        """
+        raiz, evaluacion, error = resultado
+        self.arbol = ArbolDeExpresion()
+        self.arbol.raiz = raiz
+        if error is not None:
+            self.vista.mostrar_estado(f"Expresión no válida: {error}")
+            return
+        self.vista.mostrar_estado("")
+        self.vista.mostrar_evaluacion(str(evaluacion))
+
+    def _actualizar_vista_resultados(self, resultado):
         """
         Actualiza la vista con los resultados de los recorridos del árbol 
         (inorden, preorden, postorden) y el resultado de la evaluación de la expresión.
-        """
-        resultado_inorden = self.arbol.imprimir_inorden(
-            self.arbol.raiz).strip()
-        resultado_preorden = self.arbol.imprimir_preorden(
-            self.arbol.raiz).strip()
-        resultado_postorden = self.arbol.imprimir_postorden(
-            self.arbol.raiz).strip()
-        resultado_evaluacion = str(self.arbol.evaluar_arbol(self.arbol.raiz))
 
+        Args:
+            resultado (ResultadoExpresion): Recorridos y evaluación de la expresión.
+        """
         # Actualizar los campos de resultados en la vista
-        self.vista.mostrar_resultados(
-            inorden=resultado_inorden,
-            preorden=resultado_preorden,
-            postorden=resultado_postorden,
-            evaluacion=resultado_evaluacion
-        )
+        arbol = resultado.arbol
+        with self.instrumentacion.etapa("mostrar_resultados"):
+            self.vista.mostrar_resultados(
+                inorden=arbol.recorrer_inorden(arbol.raiz),
+                preorden=arbol.recorrer_preorden(arbol.raiz),
+                postorden=arbol.recorrer_postorden(arbol.raiz),
+                evaluacion=str(resultado.evaluacion)
+            )
+            # Las métricas solo se muestran si ya se calcularon (la caché las
+            # calcula al medir las etapas): no se paga un recorrido más por árbol
+            metricas = arbol.metricas(calcular=False)
+            self.vista.mostrar_estado(metricas.resumen() if metricas is not None else "")
 
     def graficar_arbol(self):
         """
         Verifica si el árbol de expresión ha sido generado, 
-        y luego llama al visualizador para mostrar el gráfico del árbol.
+        calcula su layout ordenado en el trabajador y lo dibuja en el lienzo de la vista.
         Muestra un mensaje de error si el árbol no ha sido generado aún.
         """
         if self.arbol.raiz is None:
             self.vista.mostrar_error("Error", "Primero genere el árbol.")
             return
-        self.visualizador.graficar_arbol()
+        raiz = self.arbol.raiz
+
+        def tarea(progreso):
+            progreso("Calculando el layout", 0.0)
+            with self.instrumentacion.etapa("layout") as medicion:
+                layout = calcular_layout(raiz)
+            medicion.nodos = len(layout)
+            return layout
+
+        self._en_segundo_plano(
+            tarea, self._dibujar_arbol,
+            lambda error: self.vista.mostrar_error("Error", str(error)))
+
+    def _dibujar_arbol(self, layout):
+        """
+        Dibuja en la vista el layout calculado por el trabajador.
+
+        Args:
+            layout (LayoutArbol): Las posiciones calculadas de los nodos.
+        """
+        with self.instrumentacion.etapa("dibujar") as medicion:
+            self.vista.mostrar_arbol(layout)
+        medicion.nodos = len(layout)
+
+    def activar_instrumentacion(self, activa=True):
+        """
+        Activa o desactiva la medición por etapas. Desactivada, su costo es
+        prácticamente nulo.
+
+        Args:
+            activa (bool): True para medir, False para dejar de hacerlo.
+        """
+        if activa:
+            self.instrumentacion.activar()
+        else:
+            self.instrumentacion.desactivar()
+
+    def estadisticas(self):
+        """
+        Devuelve el resumen de las mediciones por etapa.
+
+        Returns:
+            dict: Para cada etapa, veces, tiempos total, medio, máximo y último,
+                  pico de memoria y nodos (ver `Instrumentacion.estadisticas`).
+        """
+        return self.instrumentacion.estadisticas()
+
+    def volcar_traza(self, ruta):
+        """
+        Guarda las mediciones como traza JSON (formato de eventos de Chrome).
+
+        Args:
+            ruta (str): Ruta del archivo de salida.
+        """
+        try:
+            self.instrumentacion.volcar_json(ruta)
+        except OSError as e:
+            self.vista.mostrar_error("Error", f"No se pudo guardar la traza: {e}")
+
+    def abrir_diagnostico(self):
+        """
+        Abre el panel de diagnóstico de la vista con las estadísticas actuales.
+        """
+        self.vista.abrir_diagnostico(
+            estadisticas=self.estadisticas,
+            activar=self.activar_instrumentacion,
+            limpiar=self.instrumentacion.limpiar,
+            guardar_traza=self.volcar_traza,
+            activa=self.instrumentacion.activa)
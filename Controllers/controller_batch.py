@@ -0,0 +1,209 @@
+"""
+Controlador de procesamiento por lotes (sin interfaz gráfica)
+"""
+import argparse
+import json
+import math
+import sys
+from collections import deque
+from itertools import islice
+
+from Modelos.cache_expresiones import CacheExpresiones
+from Modelos.presupuesto import PresupuestoEvaluacion, PresupuestoExcedido
+
+# Por proceso, solo para `procesar`, que no guarda nada: la entrada casi nunca
+# repite líneas y cada árbol se libera al escribir su registro, así la memoria
+# de cada trabajador no crece con la longitud ni la cantidad de las líneas
+_procesador = CacheExpresiones(capacidad=1)
+
+
+def valor_json(valor):
+    """
+    Convierte el resultado de una evaluación en un valor representable en JSON.
+    Los números no finitos y los complejos se escriben como texto.
+    """
+    if isinstance(valor, float) and math.isfinite(valor):
+        return valor
+    return str(valor)
+
+
+def procesar_expresion(numero_linea, expresion):
+    """
+    Construye, recorre y evalúa una expresión.
+
+    Args:
+        numero_linea (int): Número de la línea de entrada (desde 1).
+        expresion (str): La expresión aritmética.
+
+    Returns:
+        dict: Registro con la expresión, sus recorridos, su valor y el error, si lo hubo.
+              Si la evaluación superó el presupuesto, 'limite' describe qué límite
+              (ver `PresupuestoExcedido.como_dict`).
+    """
+    registro = {'linea': numero_linea, 'expresion': expresion, 'inorden': None,
+                'preorden': None, 'postorden': None, 'valor': None, 'error': None,
+                'limite': None}
+    try:
+        resultado = _procesador.procesar(expresion)
+    except Exception as e:
+        registro['error'] = str(e)
+        return registro
+    registro['inorden'] = resultado.inorden
+    registro['preorden'] = resultado.preorden
+    registro['postorden'] = resultado.postorden
+    if resultado.error is not None:
+        registro['error'] = str(resultado.error)
+        if isinstance(resultado.error, PresupuestoExcedido):
+            registro['limite'] = resultado.error.como_dict()
+    else:
+        registro['valor'] = valor_json(resultado.evaluacion)
+    return registro
+
+
+def configurar_presupuesto(presupuesto):
+    """
+    Fija el presupuesto de evaluación del proceso. Se llama en el proceso
+    principal y como inicializador de cada trabajador.
+
+    Args:
+        presupuesto (PresupuestoEvaluacion): Los límites, o None para no limitar.
+    """
+    _procesador.presupuesto = presupuesto
+
+
+def procesar_lote(lineas):
+    """
+    Procesa un lote de líneas y devuelve el texto JSONL ya serializado, para que
+    el trabajo pesado y la serialización ocurran en el proceso trabajador.
+
+    Args:
+        lineas (list): Tuplas (numero_linea, expresion).
+
+    Returns:
+        str: Una línea JSON por expresión.
+    """
+    return "".join(json.dumps(procesar_expresion(numero, expresion), ensure_ascii=False) + "\n"
+                   for numero, expresion in lineas)
+
+
+def leer_lotes(entrada, tamano_lote):
+    """
+    Lee la entrada de forma perezosa y la agrupa en lotes, omitiendo líneas vacías.
+
+    Args:
+        entrada (io.TextIOBase): Flujo de texto con una expresión por línea.
+        tamano_lote (int): Número máximo de expresiones por lote.
+
+    Yields:
+        list: Tuplas (numero_linea, expresion).
+    """
+    lineas = ((numero, linea.strip())
+              for numero, linea in enumerate(entrada, start=1))
+    no_vacias = ((numero, linea) for numero, linea in lineas if linea)
+    while True:
+        lote = list(islice(no_vacias, tamano_lote))
+        if not lote:
+            return
+        yield lote
+
+
+def ejecutar_batch(entrada, salida, trabajadores=1, tamano_lote=256, presupuesto=None):
+    """
+    Procesa todas las expresiones de `entrada` y escribe los resultados en `salida`
+    en el mismo orden. Con varios trabajadores, los lotes se reparten en un pool de
+    procesos y solo se mantienen en vuelo `2 * trabajadores` lotes, por lo que la
+    memoria no crece con el tamaño de la entrada.
+
+    Args:
+        entrada (io.TextIOBase): Flujo de texto con una expresión por línea.
+        salida (io.TextIOBase): Flujo donde se escriben los registros JSONL.
+        trabajadores (int): Número de procesos trabajadores.
+        tamano_lote (int): Número de expresiones por lote.
+        presupuesto (PresupuestoEvaluacion): Límites de la evaluación de cada expresión.
+    """
+    configurar_presupuesto(presupuesto)
+    lotes = leer_lotes(entrada, tamano_lote)
+    if trabajadores <= 1:
+        for lote in lotes:
+            salida.write(procesar_lote(lote))
+        salida.flush()
+        return
+
+    # El pool de procesos solo se importa cuando se usa
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=trabajadores, initializer=configurar_presupuesto,
+                             initargs=(presupuesto,)) as pool:
+        en_vuelo = deque()
+        for lote in lotes:
+            en_vuelo.append(pool.submit(procesar_lote, lote))
+            if len(en_vuelo) >= 2 * trabajadores:
+                salida.write(en_vuelo.popleft().result())
+        while en_vuelo:
+            salida.write(en_vuelo.popleft().result())
+    salida.flush()
+
+
+def agregar_argumentos_presupuesto(parser):
+    """
+    Agrega a un `ArgumentParser` las opciones de los límites de evaluación.
+
+    Args:
+        parser (argparse.ArgumentParser): El analizador de argumentos.
+    """
+    parser.add_argument('--max-nodos', type=int,
+                        help="nodos evaluados como máximo por expresión")
+    parser.add_argument('--max-magnitud', type=float,
+                        help="valor absoluto máximo de los resultados intermedios")
+    parser.add_argument('--max-exponente', type=float,
+                        help="valor absoluto máximo de los exponentes de '^'")
+    parser.add_argument('--limite-segundos', type=float,
+                        help="tiempo máximo de evaluación por expresión")
+
+
+def presupuesto_desde_argumentos(args):
+    """
+    Crea el presupuesto de evaluación a partir de las opciones de
+    `agregar_argumentos_presupuesto`.
+
+    Args:
+        args (argparse.Namespace): Los argumentos ya analizados.
+
+    Returns:
+        PresupuestoEvaluacion: Los límites, o None si no se pidió ninguno.
+    """
+    limites = (args.max_nodos, args.max_magnitud, args.max_exponente, args.limite_segundos)
+    if any(limite is not None for limite in limites):
+        return PresupuestoEvaluacion(*limites)
+    return None
+
+
+def main(argv=None):
+    """
+    Punto de entrada del modo por lotes.
+
+    Args:
+        argv (list): Argumentos de la línea de comandos (sin el subcomando).
+    """
+    parser = argparse.ArgumentParser(
+        prog="main.py batch",
+        description="Evalúa expresiones línea por línea y escribe resultados JSONL.")
+    parser.add_argument('archivo', nargs='?', default='-',
+                        help="archivo de expresiones ('-' o vacío para stdin)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="número de procesos trabajadores")
+    parser.add_argument('--lote', type=int, default=256,
+                        help="expresiones por lote enviado a cada trabajador")
+    agregar_argumentos_presupuesto(parser)
+    args = parser.parse_args(argv)
+    presupuesto = presupuesto_desde_argumentos(args)
+
+    if args.archivo == '-':
+        ejecutar_batch(sys.stdin, sys.stdout, args.workers, args.lote, presupuesto)
+    else:
+        with open(args.archivo, encoding='utf-8') as entrada:
+            ejecutar_batch(entrada, sys.stdout, args.workers, args.lote, presupuesto)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,508 @@
+"""
+Servidor local de evaluación (asyncio, JSON delimitado por líneas)
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import deque
+
+from Controllers.controller_batch import (agregar_argumentos_presupuesto,
+                                          presupuesto_desde_argumentos, valor_json)
+from Modelos.cache_expresiones import CacheExpresiones
+from Modelos.presupuesto import PresupuestoExcedido
+
+# Suma de las longitudes de las expresiones guardadas en la caché; cada carácter
+# cuesta unos 18 bytes de árbol, así que son unos 75 MB por proceso
+MAX_CARACTERES_CACHE = 1 << 22
+
+# Caché por proceso (el del servidor o cada trabajador), caliente entre solicitudes.
+# No guarda los recorridos como texto: se producen solo si una solicitud los pide
+_cache = CacheExpresiones(capacidad=4096, recorridos=False,
+                          max_caracteres=MAX_CARACTERES_CACHE)
+
+VENTANA_RECIENTE = 10.0  # Segundos que abarca el rendimiento "reciente"
+
+
+def configurar_presupuesto(presupuesto):
+    """
+    Fija el presupuesto de evaluación de la caché del proceso. Se llama en el
+    proceso del servidor y como inicializador de cada trabajador.
+
+    Args:
+        presupuesto (PresupuestoEvaluacion): Los límites, o None para no limitar.
+    """
+    _cache.presupuesto = presupuesto
+
+
+def evaluar_solicitud(solicitud):
+    """
+    Construye (o toma de la caché) y evalúa la expresión de una solicitud.
+
+    Una solicitud es un objeto JSON con 'expresion' y, opcionalmente, 'id' (se
+    devuelve tal cual), 'variables' (un objeto con sus valores), 'recorridos'
+    (true para incluir inorden, preorden y postorden en la respuesta) y
+    'metricas' (true para incluir el tamaño, la altura, las hojas y el
+    histograma de operadores del árbol; ver `IndiceMetricas.como_dict`).
+
+    Args:
+        solicitud (dict): La solicitud ya decodificada.
+
+    Returns:
+        dict: 'id', 'valor', 'error' y 'limite' (ver `PresupuestoExcedido.como_dict`),
+              más los recorridos y las métricas si se pidieron.
+    """
+    respuesta = {'id': solicitud.get('id'), 'valor': None, 'error': None, 'limite': None}
+    expresion = solicitud.get('expresion')
+    if not isinstance(expresion, str):
+        respuesta['error'] = "La solicitud no tiene una 'expresion' de texto."
+        return respuesta
+    try:
+        resultado = _cache.obtener(expresion)
+    except Exception as e:
+        respuesta['error'] = str(e)
+        return respuesta
+    variables = solicitud.get('variables')
+    try:
+        if variables is not None:
+            if not isinstance(variables, dict):
+                raise ValueError("'variables' debe ser un objeto JSON.")
+            arbol = resultado.arbol
+            valor = arbol.evaluar_arbol(arbol.raiz, variables, _cache.presupuesto)
+        elif resultado.error is not None:
+            error = resultado.error
+            respuesta['error'] = str(error)
+            if isinstance(error, PresupuestoExcedido):
+                respuesta['limite'] = error.como_dict()
+            valor = None
+        else:
+            valor = resultado.evaluacion
+        if valor is not None:
+            respuesta['valor'] = valor_json(valor)
+    except PresupuestoExcedido as e:
+        respuesta['error'] = str(e)
+        respuesta['limite'] = e.como_dict()
+    except Exception as e:
+        respuesta['error'] = str(e)
+    if solicitud.get('recorridos'):
+        arbol = resultado.arbol
+        respuesta['inorden'] = "  ".join(arbol.recorrer_inorden(arbol.raiz))
+        respuesta['preorden'] = "  ".join(arbol.recorrer_preorden(arbol.raiz))
+        respuesta['postorden'] = "  ".join(arbol.recorrer_postorden(arbol.raiz))
+    if solicitud.get('metricas'):
+        respuesta['metricas'] = resultado.arbol.metricas().como_dict()
+    return respuesta
+
+
+def evaluar_lote(solicitudes):
+    """
+    Evalúa un lote de solicitudes y serializa cada respuesta, para que el
+    trabajo pesado y la serialización ocurran fuera del bucle de eventos.
+
+    Args:
+        solicitudes (list): Las solicitudes ya decodificadas.
+
+    Returns:
+        list: Tuplas (texto JSON de la respuesta, True si la respuesta es un error).
+    """
+    respuestas = []
+    for solicitud in solicitudes:
+        respuesta = evaluar_solicitud(solicitud)
+        respuestas.append((json.dumps(respuesta, ensure_ascii=False),
+                           respuesta['error'] is not None))
+    return respuestas
+
+
+def _respuesta_error(identificador, mensaje):
+    """
+    Devuelve el texto JSON de una respuesta de error.
+    """
+    return json.dumps({'id': identificador, 'valor': None, 'error': mensaje, 'limite': None},
+                      ensure_ascii=False)
+
+
+def _percentil(ordenados, fraccion):
+    """
+    Devuelve el percentil `fraccion` (entre 0 y 1) de una lista ya ordenada.
+    """
+    if not ordenados:
+        return None
+    return ordenados[round(fraccion * (len(ordenados) - 1))]
+
+
+class ServidorEvaluacion:
+    """
+    Servidor asyncio que comparte un proceso ya inicializado (y su caché de
+    árboles) entre muchos clientes locales, por TCP en localhost o por un socket
+    Unix. Cada línea recibida es una solicitud JSON y cada línea enviada su
+    respuesta, en el mismo orden en que llegaron por esa conexión.
+
+    - Micro-lotes: las solicitudes de todas las conexiones van a una sola cola;
+      se agrupan hasta `tamano_lote` (esperando como mucho `espera_lote` a que
+      lleguen más) y cada lote se evalúa en el ejecutor con una sola llamada.
+    - Ejecutor: con `trabajadores` > 0, un pool de procesos (la evaluación es
+      CPU pura y no libera el GIL); con 0, un solo hilo, que mantiene libre el
+      bucle de eventos. Como mucho hay `2 * trabajadores` lotes en vuelo.
+    - Contrapresión: cada conexión tiene como mucho `max_pendientes` solicitudes
+      sin responder; al llegar al límite se deja de leer su socket, y el control
+      de flujo de TCP frena al cliente. Las respuestas se escriben esperando a
+      que el socket las acepte (`drain`).
+    - Estadísticas: solicitudes, lotes, rendimiento y percentiles de latencia
+      (desde que se lee la solicitud hasta que se escribe su respuesta), con la
+      solicitud {"op": "estadisticas"} o `estadisticas()`.
+    """
+
+    def __init__(self, trabajadores=0, tamano_lote=64, espera_lote=0.002,
+                 max_pendientes=64, presupuesto=None, limite_linea=1 << 24,
+                 muestras_latencia=10000):
+        """
+        Args:
+            trabajadores (int): Procesos trabajadores; 0 para evaluar en un hilo.
+            tamano_lote (int): Número máximo de solicitudes por lote.
+            espera_lote (float): Segundos que se espera a completar un lote que
+                                 todavía no está lleno.
+            max_pendientes (int): Solicitudes sin responder por conexión.
+            presupuesto (PresupuestoEvaluacion): Límites de la evaluación de cada
+                                                 expresión.
+            limite_linea (int): Longitud máxima en bytes de una solicitud.
+            muestras_latencia (int): Cuántas latencias recientes se guardan para
+                                     los percentiles.
+        """
+        if tamano_lote < 1 or max_pendientes < 1:
+            raise ValueError("El tamaño de lote y las solicitudes pendientes deben ser al menos 1.")
+        self.trabajadores = trabajadores
+        self.tamano_lote = tamano_lote
+        self.espera_lote = espera_lote
+        self.max_pendientes = max_pendientes
+        self.presupuesto = presupuesto
+        self.limite_linea = limite_linea
+        self._cola = None
+        self._ejecutor = None
+        self._en_vuelo = None
+        self._servidor = None
+        self._agrupador = None
+        self._tareas = set()
+        self._conexiones = {}  # Tarea de `_atender` -> escritor de su conexión
+        self._cerrando = False
+        self.inicio = None
+        self.conexiones = 0
+        self.solicitudes = 0
+        self.errores = 0
+        self.lotes = 0
+        self.evaluadas = 0
+        self._latencias = deque(maxlen=muestras_latencia)  # (fin, segundos)
+
+    def _crear_ejecutor(self):
+        """
+        Crea el ejecutor donde se evalúan los lotes.
+        """
+        configurar_presupuesto(self.presupuesto)
+        if self.trabajadores > 0:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+
+            # Los trabajadores se crean a demanda; con fork heredarían los sockets
+            # de las conexiones abiertas y cerrarlas no avisaría al cliente
+            metodo = ('forkserver' if 'forkserver' in multiprocessing.get_all_start_methods()
+                      else 'spawn')
+            return ProcessPoolExecutor(max_workers=self.trabajadores,
+                                       mp_context=multiprocessing.get_context(metodo),
+                                       initializer=configurar_presupuesto,
+                                       initargs=(self.presupuesto,))
+        from concurrent.futures import ThreadPoolExecutor
+
+        return ThreadPoolExecutor(max_workers=1)
+
+    async def iniciar(self, host='127.0.0.1', puerto=8765, ruta_socket=None):
+        """
+        Abre el socket y empieza a aceptar conexiones.
+
+        Args:
+            host (str): Dirección TCP donde escuchar.
+            puerto (int): Puerto TCP; 0 para elegir uno libre.
+            ruta_socket (str): Si se indica, escucha en este socket Unix en lugar de TCP.
+
+        Returns:
+            asyncio.Server: El servidor, ya escuchando.
+        """
+        self._cola = asyncio.Queue()
+        self._ejecutor = self._crear_ejecutor()
+        self._en_vuelo = asyncio.Semaphore(2 * max(1, self.trabajadores))
+        self.inicio = time.perf_counter()
+        self._agrupador = asyncio.create_task(self._agrupar())
+        if ruta_socket is not None:
+            self._servidor = await asyncio.start_unix_server(
+                self._atender, path=ruta_socket, limit=self.limite_linea)
+        else:
+            self._servidor = await asyncio.start_server(
+                self._atender, host, puerto, limit=self.limite_linea)
+        return self._servidor
+
+    async def cerrar(self):
+        """
+        Deja de aceptar conexiones, cierra las abiertas, detiene el agrupador y
+        los lotes en curso, espera a que todas esas tareas terminen y libera el
+        ejecutor. Las solicitudes que aún no tenían respuesta se descartan.
+        """
+        self._cerrando = True
+        if self._servidor is not None:
+            self._servidor.close()
+        tareas = list(self._conexiones) + list(self._tareas)
+        if self._agrupador is not None:
+            tareas.append(self._agrupador)
+        for escritor in self._conexiones.values():
+            escritor.close()
+        for tarea in tareas:
+            tarea.cancel()
+        await asyncio.gather(*tareas, return_exceptions=True)
+        if self._servidor is not None:
+            await self._servidor.wait_closed()
+        if self._ejecutor is not None:
+            self._ejecutor.shutdown(wait=False, cancel_futures=True)
+
+    def direcciones(self):
+        """
+        Devuelve las direcciones donde escucha el servidor.
+
+        Returns:
+            list: Tuplas (host, puerto) o rutas de sockets Unix.
+        """
+        return [conector.getsockname() for conector in self._servidor.sockets]
+
+    async def _atender(self, lector, escritor):
+        """
+        Atiende una conexión: lee solicitudes mientras haya lugar en su cola de
+        pendientes y deja que `_escribir_respuestas` las conteste en orden.
+        """
+        if self._cerrando:
+            escritor.close()
+            return
+        pendientes = asyncio.Queue(self.max_pendientes)
+        escritura = asyncio.create_task(self._escribir_respuestas(pendientes, escritor))
+        self._conexiones[asyncio.current_task()] = escritor
+        self.conexiones += 1
+        cancelada = False
+        try:
+            while True:
+                try:
+                    linea = await lector.readline()
+                except ValueError:
+                    # La línea supera `limite_linea`: no se puede seguir leyendo en orden
+                    futuro = asyncio.get_running_loop().create_future()
+                    futuro.set_result((_respuesta_error(
+                        None, f"Solicitud de más de {self.limite_linea} bytes."), True))
+                    await pendientes.put((futuro, time.perf_counter()))
+                    break
+                except ConnectionError:
+                    break
+                if not linea:
+                    break
+                linea = linea.strip()
+                if linea:
+                    # Espera si la conexión ya tiene `max_pendientes` solicitudes
+                    await pendientes.put((self._despachar(linea), time.perf_counter()))
+        except asyncio.CancelledError:
+            # `cerrar` ya cerró el socket: las respuestas pendientes se descartan
+            cancelada = True
+            escritura.cancel()
+            await asyncio.gather(escritura, return_exceptions=True)
+            if not self._cerrando:
+                raise
+        finally:
+            if not cancelada:
+                await pendientes.put(None)
+                await escritura
+            del self._conexiones[asyncio.current_task()]
+            self.conexiones -= 1
+
+    def _despachar(self, linea):
+        """
+        Decodifica una solicitud y la encola para el próximo lote, o la responde
+        de inmediato si es inválida o pide las estadísticas.
+
+        Returns:
+            asyncio.Future: Se resuelve con (texto de la respuesta, es_error).
+        """
+        futuro = asyncio.get_running_loop().create_future()
+        try:
+            solicitud = json.loads(linea)
+        except ValueError as e:
+            futuro.set_result((_respuesta_error(None, f"JSON inválido: {e}"), True))
+            return futuro
+        if not isinstance(solicitud, dict):
+            futuro.set_result((_respuesta_error(None, "La solicitud debe ser un objeto JSON."),
+                               True))
+            return futuro
+        operacion = solicitud.get('op', 'evaluar')
+        if operacion == 'estadisticas':
+            futuro.set_result((json.dumps({'id': solicitud.get('id'),
+                                           'estadisticas': self.estadisticas()}), False))
+        elif operacion == 'evaluar':
+            self._cola.put_nowait((solicitud, futuro))
+        else:
+            futuro.set_result((_respuesta_error(solicitud.get('id'),
+                                                f"Operación desconocida: {operacion}"), True))
+        return futuro
+
+    async def _escribir_respuestas(self, pendientes, escritor):
+        """
+        Escribe las respuestas de una conexión en el orden de sus solicitudes.
+        Si el cliente se desconecta, sigue vaciando la cola sin escribir para que
+        la lectura no quede bloqueada.
+        """
+        conectado = True
+        while True:
+            pendiente = await pendientes.get()
+            if pendiente is None:
+                break
+            futuro, llegada = pendiente
+            texto, es_error = await futuro
+            self.solicitudes += 1
+            if es_error:
+                self.errores += 1
+            fin = time.perf_counter()
+            self._latencias.append((fin, fin - llegada))
+            if not conectado:
+                continue
+            try:
+                escritor.write(texto.encode('utf-8') + b"\n")
+                await escritor.drain()
+            except ConnectionError:
+                conectado = False
+                escritor.close()
+        if conectado:
+            escritor.close()
+        try:
+            await escritor.wait_closed()
+        except ConnectionError:
+            pass
+
+    async def _agrupar(self):
+        """
+        Forma los lotes: espera un lugar en el ejecutor y la primera solicitud,
+        y si el lote no está lleno espera `espera_lote` a que lleguen más.
+        Mientras el ejecutor está ocupado, las solicitudes se acumulan en la cola
+        y el siguiente lote sale lleno sin esperar.
+        """
+        cola = self._cola
+        while True:
+            await self._en_vuelo.acquire()
+            lote = [await cola.get()]
+            if cola.qsize() < self.tamano_lote - 1 and self.espera_lote > 0:
+                await asyncio.sleep(self.espera_lote)
+            while len(lote) < self.tamano_lote and not cola.empty():
+                lote.append(cola.get_nowait())
+            tarea = asyncio.create_task(self._ejecutar(lote))
+            self._tareas.add(tarea)
+            tarea.add_done_callback(self._tareas.discard)
+
+    async def _ejecutar(self, lote):
+        """
+        Evalúa un lote en el ejecutor y resuelve el futuro de cada solicitud.
+        """
+        try:
+            respuestas = await asyncio.get_running_loop().run_in_executor(
+                self._ejecutor, evaluar_lote, [solicitud for solicitud, _ in lote])
+        except Exception as e:
+            respuestas = [(_respuesta_error(solicitud.get('id'), f"Error interno: {e}"), True)
+                          for solicitud, _ in lote]
+        finally:
+            self._en_vuelo.release()
+        self.lotes += 1
+        self.evaluadas += len(lote)
+        for (_, futuro), respuesta in zip(lote, respuestas):
+            if not futuro.done():
+                futuro.set_result(respuesta)
+
+    def estadisticas(self):
+        """
+        Resume la actividad del servidor desde que se inició.
+
+        Returns:
+            dict: 'solicitudes', 'errores', 'lotes', 'lote_medio', 'en_cola',
+                  'conexiones', 'segundos', 'por_segundo' (promedio total),
+                  'por_segundo_reciente' (últimos `VENTANA_RECIENTE` segundos) y
+                  'latencia_ms' (media, p50, p95, p99 y máximo de las últimas
+                  solicitudes).
+        """
+        ahora = time.perf_counter()
+        segundos = ahora - self.inicio if self.inicio is not None else 0.0
+        ordenadas = sorted(latencia for _, latencia in self._latencias)
+        recientes = sum(1 for fin, _ in self._latencias if fin >= ahora - VENTANA_RECIENTE)
+        ventana = min(VENTANA_RECIENTE, segundos) or 1.0
+        latencia_ms = {'media': None, 'p50': None, 'p95': None, 'p99': None, 'max': None}
+        if ordenadas:
+            latencia_ms = {'media': sum(ordenadas) / len(ordenadas) * 1000,
+                           'p50': _percentil(ordenadas, 0.50) * 1000,
+                           'p95': _percentil(ordenadas, 0.95) * 1000,
+                           'p99': _percentil(ordenadas, 0.99) * 1000,
+                           'max': ordenadas[-1] * 1000}
+        return {
+            'solicitudes': self.solicitudes,
+            'errores': self.errores,
+            'lotes': self.lotes,
+            'lote_medio': self.evaluadas / self.lotes if self.lotes else 0.0,
+            'en_cola': self._cola.qsize() if self._cola is not None else 0,
+            'conexiones': self.conexiones,
+            'segundos': segundos,
+            'por_segundo': self.solicitudes / segundos if segundos else 0.0,
+            'por_segundo_reciente': recientes / ventana,
+            'latencia_ms': latencia_ms,
+        }
+
+
+async def servir(servidor, host='127.0.0.1', puerto=8765, ruta_socket=None):
+    """
+    Inicia el servidor y atiende conexiones hasta que se cancele (Ctrl+C).
+
+    Args:
+        servidor (ServidorEvaluacion): El servidor a ejecutar.
+        host (str): Dirección TCP donde escuchar.
+        puerto (int): Puerto TCP.
+        ruta_socket (str): Socket Unix donde escuchar en lugar de TCP.
+    """
+    await servidor.iniciar(host, puerto, ruta_socket)
+    print(f"Escuchando en {', '.join(map(str, servidor.direcciones()))}",
+          file=sys.stderr, flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await servidor.cerrar()
+        print(json.dumps(servidor.estadisticas(), ensure_ascii=False), file=sys.stderr)
+
+
+def main(argv=None):
+    """
+    Punto de entrada del modo servidor.
+
+    Args:
+        argv (list): Argumentos de la línea de comandos (sin el subcomando).
+    """
+    parser = argparse.ArgumentParser(
+        prog="main.py servidor",
+        description="Atiende solicitudes JSON (una por línea) de evaluación de expresiones.")
+    parser.add_argument('--host', default='127.0.0.1', help="dirección TCP donde escuchar")
+    parser.add_argument('--puerto', type=int, default=8765, help="puerto TCP")
+    parser.add_argument('--socket', help="ruta de un socket Unix (en lugar de TCP)")
+    parser.add_argument('--workers', type=int, default=0,
+                        help="procesos trabajadores (0: evaluar en un hilo del servidor)")
+    parser.add_argument('--lote', type=int, default=64,
+                        help="solicitudes como máximo por lote")
+    parser.add_argument('--espera-ms', type=float, default=2.0,
+                        help="milisegundos que se espera a completar un lote")
+    parser.add_argument('--max-pendientes', type=int, default=64,
+                        help="solicitudes sin responder por conexión antes de dejar de leerla")
+    agregar_argumentos_presupuesto(parser)
+    args = parser.parse_args(argv)
+
+    servidor = ServidorEvaluacion(args.workers, args.lote, args.espera_ms / 1000,
+                                  args.max_pendientes, presupuesto_desde_argumentos(args))
+    try:
+        asyncio.run(servir(servidor, args.host, args.puerto, args.socket))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Trabajador en segundo plano para las tareas pesadas de la interfaz
+"""
+import queue
+import threading
+
+
+class OperacionCancelada(Exception):
+    """
+    Se lanza dentro de una tarea cuando fue cancelada o reemplazada por otra más
+    nueva, para interrumpirla en el siguiente punto de progreso.
+    """
+
+
+class TrabajadorArbol:
+    """
+    Ejecuta las tareas (construir, evaluar, calcular el layout) en un hilo aparte
+    para que el bucle de eventos de Tk nunca se congele.
+
+    Cada tarea recibe un número de generación; al pedir una tarea nueva o al
+    cancelar, la generación avanza y todo lo anterior queda obsoleto: las tareas
+    pendientes se descartan sin ejecutarse, la que está en curso se interrumpe en
+    su siguiente aviso de progreso y sus resultados tardíos se ignoran.
+
+    El hilo de la interfaz recoge los mensajes con `mensajes()`, que nunca bloquea,
+    desde una función programada con `root.after`.
+    """
+
+    PROGRESO = 'progreso'
+    LISTO = 'listo'
+    ERROR = 'error'
+
+    def __init__(self):
+        """
+        Crea las colas y arranca el hilo trabajador (como demonio, para que no
+        impida cerrar la aplicación).
+        """
+        self.generacion = 0
+        self._tareas = queue.Queue()
+        self._mensajes = queue.Queue()
+        self._hilo = threading.Thread(
+            target=self._ejecutar, name="trabajador-arbol", daemon=True)
+        self._hilo.start()
+
+    def solicitar(self, tarea):
+        """
+        Encola una tarea y deja obsoletas todas las anteriores.
+
+        Args:
+            tarea (callable): Función (progreso) que hace el trabajo y devuelve su
+                              resultado. Debe llamar a `progreso(etapa, fraccion)`
+                              de vez en cuando; esa llamada lanza
+                              `OperacionCancelada` si la tarea quedó obsoleta.
+
+        Returns:
+            int: La generación asignada a la tarea.
+        """
+        self.generacion += 1
+        self._tareas.put((self.generacion, tarea))
+        return self.generacion
+
+    def cancelar(self):
+        """
+        Deja obsoletas todas las tareas pendientes y la que está en curso.
+        """
+        self.generacion += 1
+
+    def detener(self):
+        """
+        Cancela todo y termina el hilo trabajador.
+        """
+        self.cancelar()
+        self._tareas.put((None, None))
+
+    def mensajes(self):
+        """
+        Extrae, sin bloquear, los mensajes de la tarea vigente. Los de tareas
+        obsoletas se descartan.
+
+        Returns:
+            list: Tuplas (generacion, tipo, dato) con tipo `PROGRESO` (dato:
+                  (etapa, fraccion)), `LISTO` (dato: el resultado) o `ERROR`
+                  (dato: la excepción).
+        """
+        vigentes = []
+        while True:
+            try:
+                mensaje = self._mensajes.get_nowait()
+            except queue.Empty:
+                return vigentes
+            if mensaje[0] == self.generacion:
+                vigentes.append(mensaje)
+
+    def _ejecutar(self):
+        """
+        Bucle del hilo trabajador: toma las tareas en orden y omite las obsoletas.
+        """
+        while True:
+            generacion, tarea = self._tareas.get()
+            if tarea is None:
+                return
+            if generacion != self.generacion:
+                continue
+
+            def progreso(etapa, fraccion, generacion=generacion):
+                if generacion != self.generacion:
+                    raise OperacionCancelada()
+                self._mensajes.put((generacion, self.PROGRESO, (etapa, fraccion)))
+
+            try:
+                resultado = tarea(progreso)
+            except OperacionCancelada:
+                continue
+            except Exception as e:
+                self._mensajes.put((generacion, self.ERROR, e))
+                continue
+            self._mensajes.put((generacion, self.LISTO, resultado))
@@ -0,0 +1,174 @@
+"""
+Almacén compacto de nodos
+"""
+from array import array
+
+from Modelos.programa import (CODIGOS_OPERADOR, OP_NUMERO, OP_VARIABLE,
+                              SIMBOLOS_OPERADOR, ProgramaPostfijo)
+
+SIN_HIJO = -1
+
+
+class AlmacenNodos:
+    """
+    Representación compacta de un árbol de expresión en arreglos paralelos.
+    Cada nodo es un índice: su código de operación, su constante y los índices
+    de sus hijos izquierdo y derecho (`SIN_HIJO` si no existe). En las hojas de
+    variable la constante es el índice del nombre en `nombres_variables`.
+    """
+
+    def __init__(self):
+        """
+        Inicializa el almacén con los arreglos vacíos.
+        """
+        self.codigos = array('B')
+        self.constantes = array('d')
+        self.izquierdos = array('i')
+        self.derechos = array('i')
+        self.nombres_variables = []
+        self._indices_variables = {}
+
+    def __len__(self):
+        return len(self.codigos)
+
+    @classmethod
+    def desde_nodo(cls, raiz):
+        """
+        Copia un árbol de nodos al almacén, agregando cada nodo después de sus hijos.
+        Los subárboles compartidos se copian una sola vez.
+
+        Args:
+            raiz (Nodo): La raíz del árbol a copiar.
+
+        Returns:
+            tuple: (almacén, índice de la raíz)
+        """
+        almacen = cls()
+        indices = {}
+        pila = [(raiz, False)]
+        while pila:
+            nodo, visitado = pila.pop()
+            if nodo in indices:
+                continue
+            if nodo.izq is None and nodo.der is None:
+                indices[nodo] = almacen.hoja(nodo.valor)
+            elif visitado:
+                indices[nodo] = almacen.operador(
+                    nodo.valor, indices[nodo.izq], indices[nodo.der])
+            else:
+                pila.append((nodo, True))
+                pila.append((nodo.der, False))
+                pila.append((nodo.izq, False))
+        return almacen, indices[raiz]
+
+    def hoja(self, valor):
+        """
+        Agrega un nodo hoja con un valor numérico o el nombre de una variable.
+
+        Args:
+            valor (float | str): El número o la variable que representa la hoja.
+
+        Returns:
+            int: El índice del nodo creado.
+        """
+        if isinstance(valor, str):
+            indice = self._indices_variables.get(valor)
+            if indice is None:
+                indice = self._indices_variables[valor] = len(
+                    self.nombres_variables)
+                self.nombres_variables.append(valor)
+            self.codigos.append(OP_VARIABLE)
+            self.constantes.append(indice)
+        else:
+            self.codigos.append(OP_NUMERO)
+            self.constantes.append(valor)
+        self.izquierdos.append(SIN_HIJO)
+        self.derechos.append(SIN_HIJO)
+        return len(self.codigos) - 1
+
+    def operador(self, operador, izq, der):
+        """
+        Agrega un nodo operador con sus dos hijos.
+
+        Args:
+            operador (str): El símbolo del operador.
+            izq (int): Índice del hijo izquierdo.
+            der (int): Índice del hijo derecho.
+
+        Returns:
+            int: El índice del nodo creado.
+
+        Raises:
+            ValueError: Si el operador no es válido.
+        """
+        codigo = CODIGOS_OPERADOR.get(operador)
+        if codigo is None:
+            raise ValueError(f"Operador desconocido: {operador}")
+        self.codigos.append(codigo)
+        self.constantes.append(0.0)
+        self.izquierdos.append(izq)
+        self.derechos.append(der)
+        return len(self.codigos) - 1
+
+    def a_programa(self):
+        """
+        Convierte el almacén en un programa postfijo. Como `construir_arbol` agrega
+        cada nodo después de sus hijos, el orden de los índices ya es el postorden
+        y basta con copiar los arreglos de códigos y constantes.
+
+        Returns:
+            ProgramaPostfijo: El programa equivalente al árbol almacenado.
+        """
+        return ProgramaPostfijo(array('B', self.codigos), array('d', self.constantes),
+                                list(self.nombres_variables))
+
+    def vista(self, indice):
+        """
+        Devuelve una vista tipo `Nodo` del nodo en la posición indicada.
+
+        Args:
+            indice (int): El índice del nodo.
+
+        Returns:
+            NodoVista: La vista del nodo, o None si el índice es `SIN_HIJO`.
+        """
+        if indice == SIN_HIJO:
+            return None
+        return NodoVista(self, indice)
+
+
+class NodoVista:
+    """
+    Vista de solo lectura de un nodo del `AlmacenNodos` con la misma interfaz
+    que `Nodo` (valor, izq, der), para el código que espera objetos.
+    """
+
+    __slots__ = ('almacen', 'indice')
+
+    def __init__(self, almacen, indice):
+        self.almacen = almacen
+        self.indice = indice
+
+    @property
+    def valor(self):
+        codigo = self.almacen.codigos[self.indice]
+        if codigo == OP_NUMERO:
+            return self.almacen.constantes[self.indice]
+        if codigo == OP_VARIABLE:
+            return self.almacen.nombres_variables[int(self.almacen.constantes[self.indice])]
+        return SIMBOLOS_OPERADOR[codigo]
+
+    @property
+    def izq(self):
+        return self.almacen.vista(self.almacen.izquierdos[self.indice])
+
+    @property
+    def der(self):
+        return self.almacen.vista(self.almacen.derechos[self.indice])
+
+    def __eq__(self, otro):
+        return (isinstance(otro, NodoVista) and otro.almacen is self.almacen
+                and otro.indice == self.indice)
+
+    def __hash__(self):
+        return hash((id(self.almacen), self.indice))
@@ -0,0 +1,354 @@
+"""
+Análisis incremental de expresiones
+"""
+from bisect import bisect_right
+
+from Modelos.arbol import ArbolDeExpresion
+from Modelos.lexer import (ABRE, CIERRA, NUMERO, OPERADOR, POSICION, TEXTO,
+                           VARIABLE, ErrorLexico, escanear)
+from Modelos.nodo import Nodo
+
+
+def _prefijo_comun(a, b):
+    """
+    Longitud del prefijo común de dos cadenas, por búsqueda binaria sobre
+    comparaciones de rebanadas (que se hacen en C).
+    """
+    bajo, alto = 0, min(len(a), len(b))
+    while bajo < alto:
+        medio = (bajo + alto + 1) // 2
+        if a[bajo:medio] == b[bajo:medio]:
+            bajo = medio
+        else:
+            alto = medio - 1
+    return bajo
+
+
+def _sufijo_comun(a, b, limite):
+    """
+    Longitud del sufijo común de dos cadenas, sin superar `limite`.
+    """
+    bajo, alto = 0, limite
+    largo_a, largo_b = len(a), len(b)
+    while bajo < alto:
+        medio = (bajo + alto + 1) // 2
+        if a[largo_a - medio:largo_a - bajo] == b[largo_b - medio:largo_b - bajo]:
+            bajo = medio
+        else:
+            alto = medio - 1
+    return bajo
+
+
+class AnalizadorIncremental:
+    """
+    Vuelve a analizar y evaluar una expresión que se edita poco a poco (por ejemplo
+    mientras se escribe) reutilizando el trabajo de la versión anterior:
+
+    - Solo se vuelven a escanear los tokens de la zona editada; los anteriores y
+      posteriores se conservan (los posteriores, desplazados).
+    - El análisis se reanuda desde el último punto de control guardado antes de la
+      edición, con el estado completo de las pilas.
+    - Cada grupo entre paréntesis que no toca la edición se reutiliza tal cual: la
+      tabla de saltos indica dónde se cierra y qué subárbol produjo, y el análisis
+      salta directamente al paréntesis de cierre.
+    - La evaluación reutiliza los valores ya calculados de esos subárboles.
+
+    El árbol resultante es idéntico al que produce `ArbolDeExpresion.construir_arbol`
+    y los errores tienen los mismos mensajes y columnas.
+    """
+
+    INTERVALO_PUNTOS = 256  # Tokens mínimos entre dos puntos de control
+    MAX_TRAMOS = 64         # Tramos de posiciones antes de consolidarlos
+
+    def __init__(self):
+        """
+        Inicializa el analizador sin ninguna expresión.
+        """
+        self.arbol = ArbolDeExpresion()
+        self.texto = ""
+        self.tokens_reescaneados = 0
+        self._tokens = []
+        self._cortes = [0]   # Primer índice de cada tramo de tokens
+        self._ajustes = [0]  # Desplazamiento de las posiciones de cada tramo
+        self.grupos_reutilizados = 0
+        self._grupos = {}   # Índice de '(' -> (índice de su ')', subárbol del grupo)
+        self._puntos = []   # (índice, pila_nodos, pila_operadores, aperturas, espera_operando)
+        self._valores = {}  # Subárbol ya evaluado -> valor
+        self._anclas = set()  # Subárboles nuevos cuyo valor conviene guardar
+        self._analizado = False
+
+    def actualizar(self, texto):
+        """
+        Analiza la nueva versión de la expresión y actualiza `self.arbol`.
+
+        Args:
+            texto (str): La expresión completa tras la edición.
+
+        Returns:
+            Nodo: La raíz del árbol de la nueva expresión.
+
+        Raises:
+            ErrorLexico: Si la expresión es inválida; el árbol anterior se conserva.
+        """
+        if texto == self.texto and self._analizado:
+            return self.arbol.raiz
+        primero = self._reescanear(texto)
+        self.texto = texto
+        self._analizado = False
+        self.arbol.raiz = self._analizar(primero)
+        self.arbol.programa = None
+        self.arbol.funcion = None
+        self._analizado = True
+        return self.arbol.raiz
+
+    def evaluar(self):
+        """
+        Evalúa el árbol actual reutilizando los valores de los subárboles que no
+        cambiaron desde la evaluación anterior.
+
+        Returns:
+            float: El resultado de la expresión.
+
+        Raises:
+            ZeroDivisionError: Si se intenta realizar una división por cero.
+            ValueError: Si la expresión contiene variables (no tienen valor aquí).
+            OverflowError: Si una potencia desborda el rango de los float.
+        """
+        valores = self._valores
+        anclas = self._anclas
+        aplicar_operador = self.arbol.aplicar_operador
+        resultados = []
+        pila = [(self.arbol.raiz, False)]
+        while pila:
+            actual, visitado = pila.pop()
+            if visitado:
+                der_valor = resultados.pop()
+                izq_valor = resultados.pop()
+                valor = aplicar_operador(actual.valor, izq_valor, der_valor)
+                resultados.append(valor)
+                if actual in anclas:
+                    valores[actual] = valor
+            elif actual in valores:
+                resultados.append(valores[actual])
+            elif actual.izq is None and actual.der is None:
+                if isinstance(actual.valor, str):
+                    raise ValueError(f"Variable sin valor: {actual.valor}")
+                resultados.append(actual.valor)
+            else:
+                pila.append((actual, True))
+                pila.append((actual.der, False))
+                pila.append((actual.izq, False))
+        return resultados.pop()
+
+    def _posicion(self, indice):
+        """
+        Posición actual del token `indice` en el texto: la guardada en el token más
+        el ajuste del tramo al que pertenece.
+        """
+        tramo = bisect_right(self._cortes, indice) - 1
+        return self._tokens[indice][POSICION] + self._ajustes[tramo]
+
+    def _reescanear(self, texto):
+        """
+        Actualiza los tokens escaneando solo la zona que cambió, y traslada la
+        tabla de grupos y los puntos de control a los nuevos índices.
+
+        Los tokens posteriores a la edición no se copian con su nueva posición:
+        se registra un tramo de índices con un ajuste común (`_cortes` y
+        `_ajustes`), de modo que el costo no depende de cuánto texto sigue a la
+        edición. Los tramos se consolidan cuando se acumulan demasiados.
+
+        Args:
+            texto (str): La expresión completa tras la edición.
+
+        Returns:
+            int: El índice del primer token que pudo cambiar.
+        """
+        anterior = self.texto
+        tokens = self._tokens
+        prefijo = _prefijo_comun(anterior, texto)
+        sufijo = _sufijo_comun(anterior, texto, min(len(anterior), len(texto)) - prefijo)
+        desplazamiento = len(texto) - len(anterior)
+
+        # Primer token que llega hasta la zona editada (o la toca por la derecha,
+        # porque un carácter nuevo puede extenderlo)
+        bajo, alto = 0, len(tokens)
+        while bajo < alto:
+            medio = (bajo + alto) // 2
+            if self._posicion(medio) + len(tokens[medio][TEXTO]) < prefijo:
+                bajo = medio + 1
+            else:
+                alto = medio
+        primero = bajo
+        inicio = 0
+        if primero:
+            inicio = self._posicion(primero - 1) + len(tokens[primero - 1][TEXTO])
+
+        # Escanear hasta coincidir con el inicio de un token anterior dentro del
+        # sufijo común: desde ahí los tokens son los mismos
+        inicio_sufijo = len(anterior) - sufijo
+        siguiente = primero
+        nuevos = []
+        for token in escanear(texto, inicio):
+            posicion_anterior = token[POSICION] - desplazamiento
+            if posicion_anterior >= inicio_sufijo:
+                while (siguiente < len(tokens) and
+                       self._posicion(siguiente) < posicion_anterior):
+                    siguiente += 1
+                if (siguiente < len(tokens) and
+                        self._posicion(siguiente) == posicion_anterior):
+                    break
+            nuevos.append(token)
+        else:
+            siguiente = len(tokens)
+        self._tokens = tokens[:primero] + nuevos + tokens[siguiente:]
+        self.tokens_reescaneados = len(nuevos)
+
+        # Tramos: los anteriores a la edición, los tokens nuevos (ya con su
+        # posición real) y los posteriores, desplazados
+        salto = len(nuevos) - (siguiente - primero)
+        tramo_cola = bisect_right(self._cortes, siguiente) - 1
+        tramos = [(corte, ajuste) for corte, ajuste in zip(self._cortes, self._ajustes)
+                  if corte < primero]
+        tramos.append((primero, 0))
+        tramos.append((siguiente + salto, self._ajustes[tramo_cola] + desplazamiento))
+        tramos.extend((corte + salto, ajuste + desplazamiento) for corte, ajuste in
+                      zip(self._cortes[tramo_cola + 1:], self._ajustes[tramo_cola + 1:]))
+        self._cortes = []
+        self._ajustes = []
+        for corte, ajuste in tramos:
+            if self._cortes and self._cortes[-1] == corte:
+                self._ajustes[-1] = ajuste
+            elif not self._ajustes or self._ajustes[-1] != ajuste:
+                self._cortes.append(corte)
+                self._ajustes.append(ajuste)
+        if len(self._cortes) > self.MAX_TRAMOS:
+            self._tokens = [(tipo, texto_token, valor, self._posicion(indice))
+                            for indice, (tipo, texto_token, valor, _)
+                            in enumerate(self._tokens)]
+            self._cortes = [0]
+            self._ajustes = [0]
+
+        # Los grupos que no tocan la edición siguen valiendo, con sus índices desplazados
+        grupos = {}
+        for apertura, grupo in self._grupos.items():
+            if grupo[0] < primero:
+                grupos[apertura] = grupo
+            elif apertura >= siguiente:
+                grupos[apertura + salto] = (grupo[0] + salto, grupo[1])
+        self._grupos = grupos
+        while self._puntos and self._puntos[-1][0] > primero:
+            self._puntos.pop()
+        self._podar_valores()
+        return primero
+
+    def _analizar(self, primero):
+        """
+        Construye el árbol con el mismo algoritmo de pilas que
+        `ArbolDeExpresion.construir_arbol`, reanudando desde el último punto de
+        control anterior a `primero` y saltando los grupos reutilizables. Valida el
+        orden de los tokens con las mismas reglas que el analizador léxico.
+
+        Args:
+            primero (int): Índice del primer token que pudo cambiar.
+
+        Returns:
+            Nodo: La raíz del árbol.
+
+        Raises:
+            ErrorLexico: En el primer error encontrado, con su columna.
+        """
+        arbol = self.arbol
+        precedencias = arbol.OPERADORES
+        tokens = self._tokens
+        grupos = self._grupos
+        puntos = self._puntos
+        anclas = self._anclas = set()
+        if puntos:
+            indice, pila_nodos, pila_operadores, aperturas, espera_operando = puntos[-1]
+            pila_nodos = list(pila_nodos)
+            pila_operadores = list(pila_operadores)
+            aperturas = list(aperturas)
+        else:
+            indice, pila_nodos, pila_operadores, aperturas, espera_operando = 0, [], [], [], True
+        proximo_punto = indice + self.INTERVALO_PUNTOS if puntos else 0
+        reutilizados = 0
+
+        total = len(tokens)
+        while indice < total:
+            if indice >= proximo_punto:
+                # El costo de copiar las pilas se amortiza espaciando los puntos
+                # al menos tanto como el tamaño de las pilas
+                puntos.append((indice, tuple(pila_nodos), tuple(pila_operadores),
+                               tuple(aperturas), espera_operando))
+                anclas.update(pila_nodos)
+                proximo_punto = indice + max(self.INTERVALO_PUNTOS,
+                                             len(pila_nodos) + len(aperturas))
+            tipo, texto, valor, _ = tokens[indice]
+            if tipo == NUMERO or tipo == VARIABLE:
+                if not espera_operando:
+                    raise ErrorLexico(
+                        f"Se esperaba un operador antes de '{texto}'", self._posicion(indice))
+                espera_operando = False
+                pila_nodos.append(Nodo(valor))
+            elif tipo == OPERADOR:
+                if espera_operando:
+                    raise ErrorLexico(
+                        f"Se esperaba un número o '(' antes de '{texto}'", self._posicion(indice))
+                espera_operando = True
+                while (pila_operadores and pila_operadores[-1] != '(' and
+                       precedencias.get(pila_operadores[-1], 0) >= precedencias[valor]):
+                    arbol.procesar_operador(pila_nodos, pila_operadores.pop())
+                pila_operadores.append(valor)
+            elif tipo == ABRE:
+                if not espera_operando:
+                    raise ErrorLexico(
+                        "Se esperaba un operador antes de '('", self._posicion(indice))
+                grupo = grupos.get(indice)
+                if grupo is not None:
+                    # Grupo intacto: se usa su subárbol y se salta hasta su cierre
+                    pila_nodos.append(grupo[1])
+                    espera_operando = False
+                    indice = grupo[0] + 1
+                    reutilizados += 1
+                    continue
+                aperturas.append(indice)
+                pila_operadores.append('(')
+            elif tipo == CIERRA:
+                if not aperturas:
+                    raise ErrorLexico(
+                        "Paréntesis de cierre sin apertura", self._posicion(indice))
+                if espera_operando:
+                    raise ErrorLexico(
+                        "Se esperaba un número o '(' antes de ')'", self._posicion(indice))
+                while pila_operadores[-1] != '(':
+                    arbol.procesar_operador(pila_nodos, pila_operadores.pop())
+                pila_operadores.pop()
+                grupos[aperturas.pop()] = (indice, pila_nodos[-1])
+                anclas.add(pila_nodos[-1])
+            else:  # INVALIDO o COMA
+                raise ErrorLexico(f"Carácter inválido '{texto}'", self._posicion(indice))
+            indice += 1
+
+        self.grupos_reutilizados = reutilizados
+        if aperturas:
+            raise ErrorLexico("Paréntesis sin cerrar", self._posicion(aperturas[0]))
+        if espera_operando:
+            raise ErrorLexico("Expresión incompleta", len(self.texto))
+        while pila_operadores:
+            arbol.procesar_operador(pila_nodos, pila_operadores.pop())
+        return pila_nodos.pop()
+
+    def _podar_valores(self):
+        """
+        Descarta los valores de subárboles que ya no forman parte de ningún grupo
+        ni punto de control, cuando se acumulan demasiados.
+        """
+        vivos = len(self._grupos) + len(self._puntos) + 64
+        if len(self._valores) <= 4 * vivos:
+            return
+        conservados = {subarbol for _, subarbol in self._grupos.values()}
+        for punto in self._puntos:
+            conservados.update(punto[1])
+        self._valores = {subarbol: valor for subarbol, valor in self._valores.items()
+                         if subarbol in conservados}
@@ -0,0 +1,169 @@
+"""
+Analizador Pratt (precedence climbing) guiado por un registro de operadores
+"""
+from Modelos.lexer import (ABRE, CIERRA, COMA, INVALIDO, NUMERO, OPERADOR, VARIABLE,
+                           ErrorLexico, escanear)
+from Modelos.nodo import Nodo
+
+# Tipos de marco: lo que queda pendiente cuando se termine el operando actual
+_INFIJO = 0     # Falta el operando derecho de un operador binario
+_PREFIJO = 1    # Falta el operando de un operador unario
+_GRUPO = 2      # Falta el ')' de un paréntesis
+_FUNCION = 3    # Falta ',' o ')' tras un argumento de una función
+
+
+def _token_inesperado(tipo, texto, posicion):
+    """
+    Devuelve el error para un token que no puede seguir a un operando completo.
+    """
+    if tipo == CIERRA:
+        return ErrorLexico("Paréntesis de cierre sin apertura", posicion)
+    if tipo == COMA:
+        return ErrorLexico("Coma fuera de los argumentos de una función", posicion)
+    if tipo == INVALIDO:
+        return ErrorLexico(f"Carácter inválido '{texto}'", posicion)
+    if tipo == OPERADOR:
+        return ErrorLexico(f"Operador binario desconocido '{texto}'", posicion)
+    return ErrorLexico(f"Se esperaba un operador antes de '{texto}'", posicion)
+
+
+def _nodo_funcion(definicion, argumentos, posicion):
+    """
+    Crea el nodo de una llamada: un argumento va en el hijo derecho, dos en ambos
+    hijos, y las variádicas se combinan de izquierda a derecha.
+    """
+    cantidad = len(argumentos)
+    if cantidad != definicion.aridad and not (definicion.variadica and cantidad >= 1):
+        minimo = "al menos 1" if definicion.variadica else str(definicion.aridad)
+        raise ErrorLexico(f"'{definicion.simbolo}' recibe {minimo} argumento(s), "
+                          f"no {cantidad}", posicion)
+    if definicion.aridad == 1:
+        nodo = Nodo(definicion.simbolo)
+        nodo.der = argumentos[0]
+        return nodo
+    nodo = argumentos[0]
+    for argumento in argumentos[1:]:
+        padre = Nodo(definicion.simbolo)
+        padre.izq = nodo
+        padre.der = argumento
+        nodo = padre
+    return nodo
+
+
+def construir_pratt(expresion, registro, tokens=None):
+    """
+    Construye el árbol de una expresión en una sola pasada con un analizador
+    Pratt: cada operador decide con su potencia de enlace si toma el operando
+    ya construido, así que no hay pila de operadores pendientes ni reglas por
+    operador en el bucle. En lugar de recursión se usa una pila de marcos (uno
+    por operando a medio construir), de modo que el anidamiento no está limitado
+    por la pila de Python.
+
+    El árbol usa `Nodo`: los operadores binarios y las funciones de dos
+    argumentos tienen ambos hijos; los operadores prefijos y las funciones de un
+    argumento solo tienen el hijo derecho.
+
+    Args:
+        expresion (str): La expresión aritmética en notación infija.
+        registro (RegistroOperadores): Los operadores y funciones reconocidos.
+        tokens (iterable): Tokens de `expresion` ya producidos por `lexer.escanear`.
+
+    Returns:
+        tuple: (raiz, extendido), donde `extendido` es True si el árbol usa algún
+               operador unario, función u operador con un núcleo propio, es
+               decir, algo que solo sabe evaluar el registro.
+
+    Raises:
+        ErrorLexico: En el primer error encontrado, con su columna.
+    """
+    infijos = registro.infijos
+    prefijos = registro.prefijos
+    funciones = registro.funciones
+    if tokens is None:
+        tokens = escanear(expresion)
+    tokens = iter(tokens)
+    fin = None
+    marcos = []
+    minimo = 0          # Potencia de enlace que debe superar el próximo operador
+    extendido = False
+    operando = None     # Operando completo a la izquierda, o None si se espera uno
+    token = next(tokens, fin)
+    while True:
+        if operando is None:
+            if token is fin:
+                raise ErrorLexico("Expresión incompleta", len(expresion))
+            tipo, texto, valor, posicion = token
+            if tipo == NUMERO or (tipo == VARIABLE and texto not in funciones):
+                operando = Nodo(valor)
+            elif tipo == VARIABLE:
+                token = next(tokens, fin)
+                if token is fin or token[0] != ABRE:
+                    raise ErrorLexico(f"Se esperaba '(' después de '{texto}'",
+                                      len(expresion) if token is fin else token[3])
+                marcos.append((_FUNCION, funciones[texto], minimo, posicion, []))
+                minimo = 0
+            elif tipo == ABRE:
+                marcos.append((_GRUPO, None, minimo, posicion, None))
+                minimo = 0
+            elif texto in prefijos and (tipo == OPERADOR or tipo == INVALIDO):
+                definicion = prefijos[texto]
+                marcos.append((_PREFIJO, definicion, minimo, posicion, None))
+                minimo = definicion.potencia_derecha
+            elif tipo == INVALIDO and texto not in infijos:
+                raise ErrorLexico(f"Carácter inválido '{texto}'", posicion)
+            elif tipo == CIERRA and all(marco[0] <= _PREFIJO for marco in marcos):
+                raise ErrorLexico("Paréntesis de cierre sin apertura", posicion)
+            else:
+                raise ErrorLexico(f"Se esperaba un número o '(' antes de '{texto}'", posicion)
+            token = next(tokens, fin)
+            continue
+
+        if token is not fin:
+            tipo, texto, valor, posicion = token
+            if tipo == OPERADOR or tipo == INVALIDO:
+                definicion = infijos.get(texto)
+                if definicion is None:
+                    raise _token_inesperado(tipo, texto, posicion)
+                if definicion.potencia_izquierda > minimo:
+                    marcos.append((_INFIJO, definicion, minimo, posicion, operando))
+                    minimo = definicion.potencia_derecha
+                    operando = None
+                    token = next(tokens, fin)
+                    continue
+
+        # El operador siguiente (si lo hay) enlaza menos: se cierra el marco superior
+        if not marcos:
+            if token is fin:
+                return operando, extendido
+            raise _token_inesperado(*token[:2], token[3])
+        clase, definicion, minimo, inicio, dato = marcos.pop()
+        if clase == _INFIJO:
+            nodo = Nodo(definicion.simbolo)
+            nodo.izq = dato
+            nodo.der = operando
+            operando = nodo
+            if not definicion.basico:
+                extendido = True
+        elif clase == _PREFIJO:
+            nodo = Nodo(definicion.simbolo)
+            nodo.der = operando
+            operando = nodo
+            extendido = True
+        elif token is fin:
+            raise ErrorLexico("Paréntesis sin cerrar", inicio)
+        elif clase == _GRUPO:
+            if token[0] != CIERRA:
+                raise _token_inesperado(*token[:2], token[3])
+            token = next(tokens, fin)
+        else:
+            dato.append(operando)
+            if token[0] == COMA:
+                marcos.append((clase, definicion, minimo, inicio, dato))
+                minimo = 0
+                operando = None
+            elif token[0] == CIERRA:
+                operando = _nodo_funcion(definicion, dato, inicio)
+                extendido = True
+            else:
+                raise _token_inesperado(*token[:2], token[3])
+            token = next(tokens, fin)
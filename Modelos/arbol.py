@@ -1,8 +1,121 @@
 """
     Arbol
 """
-import re
+from Modelos.almacen_nodos import AlmacenNodos
+from Modelos.analizador_pratt import construir_pratt
+from Modelos.compilador import compilar_funcion
+from Modelos.evaluador_incremental import EvaluadorIncremental
+from Modelos.lexer import ABRE, CIERRA, NUMERO, POSICION, VARIABLE, escanear, tokenizar
+from Modelos.metricas import IndiceMetricas
 from Modelos.nodo import Nodo
+from Modelos.optimizador import optimizar
+from Modelos.presupuesto import evaluar_con_presupuesto
+from Modelos.programa import ProgramaPostfijo
+
+
+def _informar_progreso(tokens, progreso, longitud, cada=4096):
+    """
+    Reenvía los tokens y cada `cada` tokens informa qué fracción de la expresión
+    se lleva analizada. Solo se usa cuando se pide progreso, así que la
+    construcción normal no paga ningún costo extra.
+
+    Args:
+        tokens (iterable): Los tokens producidos por el analizador léxico.
+        progreso (callable): Función (fraccion) que recibe un valor entre 0 y 1.
+        longitud (int): Longitud total de la expresión.
+
+    Yields:
+        tuple: Los mismos tokens, en orden.
+    """
+    for numero, token in enumerate(tokens, start=1):
+        if numero % cada == 0:
+            progreso(token[POSICION] / longitud)
+        yield token
+
+
+def _reducir(pila_nodos, operador):
+    """
+    Reemplaza los dos operandos del tope de la pila por un `Nodo` con el operador.
+    """
+    nodo = Nodo(operador)
+    nodo.der = pila_nodos.pop()  # Operando derecho
+    nodo.izq = pila_nodos.pop()  # Operando izquierdo
+    pila_nodos.append(nodo)
+
+
+class _Construccion:
+    """
+    Estado de una construcción con el algoritmo de pilas: dónde se crean los
+    nodos y, al compartir subárboles, los ya internados por clave estructural y
+    su tamaño expandido.
+    """
+
+    __slots__ = ('almacen', 'internados', 'tamanos')
+
+    def __init__(self, compacto, compartir):
+        self.almacen = AlmacenNodos() if compacto else None
+        self.internados = {} if compartir else None
+        self.tamanos = {} if compartir else None
+
+    def funciones(self):
+        """
+        Devuelve las funciones que crean hojas y reducen operadores en este modo,
+        elegidas una sola vez para no preguntar por el modo en cada nodo.
+
+        Returns:
+            tuple: (hoja(valor), reducir(pila_nodos, operador)).
+        """
+        if self.internados is not None:
+            return self._internar_hoja, self._reducir_compartido
+        if self.almacen is not None:
+            return self.almacen.hoja, self._reducir_compacto
+        return Nodo, _reducir
+
+    def _reducir_compacto(self, pila_nodos, operador):
+        """
+        Reemplaza los dos operandos del tope de la pila por un nodo del almacén.
+        """
+        der = pila_nodos.pop()
+        pila_nodos.append(self.almacen.operador(operador, pila_nodos.pop(), der))
+
+    def _internar_hoja(self, valor):
+        """
+        Devuelve la hoja compartida con el valor dado, creándola la primera vez.
+
+        Args:
+            valor (float | str): El número o la variable de la hoja.
+
+        Returns:
+            Nodo | int: El nodo (o su índice en el almacén compacto).
+        """
+        clave = (valor,)
+        nodo = self.internados.get(clave)
+        if nodo is None:
+            nodo = self.almacen.hoja(valor) if self.almacen is not None else Nodo(valor)
+            self.internados[clave] = nodo
+            self.tamanos[nodo] = 1
+        return nodo
+
+    def _reducir_compartido(self, pila_nodos, operador):
+        """
+        Reemplaza los dos operandos del tope de la pila por el nodo compartido
+        `izq operador der`, creándolo la primera vez. Como los hijos ya están
+        internados, basta con compararlos por identidad.
+        """
+        der = pila_nodos.pop()
+        izq = pila_nodos.pop()
+        clave = (operador, izq, der)
+        nodo = self.internados.get(clave)
+        if nodo is None:
+            if self.almacen is not None:
+                nodo = self.almacen.operador(operador, izq, der)
+            else:
+                nodo = Nodo(operador)
+                nodo.izq = izq
+                nodo.der = der
+            self.internados[clave] = nodo
+            self.tamanos[nodo] = 1 + self.tamanos[izq] + self.tamanos[der]
+        pila_nodos.append(nodo)
 
 
 class ArbolDeExpresion:
@@ -19,45 +132,133 @@ class ArbolDeExpresion:
         Inicializa un árbol de expresión con la raíz vacía.
         """
         self.raiz = None
-
-    def construir_arbol(self, expresion):
+        self.programa = None
+        self.funcion = None
+        self.incremental = None
+        self._metricas = None
+        self.almacen = None
+        self.compartido = False
+        self.registro = None
+        self.extendido = False
+        self.nodos_expandidos = 0
+        self.nodos_unicos = 0
+
+    def construir_arbol(self, expresion, compacto=False, compartir=False, progreso=None,
+                        tokens=None, registro=None):
         """
         Construye un árbol de expresión a partir de una expresión aritmética en notación infija.
         Utiliza un algoritmo basado en pilas para convertir la expresión infija en un árbol.
+        Con un `registro` se usa en su lugar el analizador Pratt (ver
+        `Modelos.analizador_pratt`), que admite operadores unarios, funciones y
+        asociatividad a la derecha.
 
         Args:
             expresion (str): La expresión aritmética en notación infija que se utilizará para
                              construir el árbol de expresión.
+            compacto (bool): Si es True, los nodos se guardan en un `AlmacenNodos`
+                             (arreglos paralelos) y `self.raiz` es una `NodoVista`.
+            compartir (bool): Si es True, los subárboles estructuralmente idénticos se
+                              construyen una sola vez y se comparten (un DAG).
+            progreso (callable): Función (fraccion) llamada periódicamente con la
+                                 fracción analizada; si lanza una excepción, la
+                                 construcción se interrumpe con ella.
+            tokens (iterable): Tokens de `expresion` ya producidos por
+                               `lexer.tokenizar` (o `lexer.escanear` con un
+                               `registro`), para no volver a analizarla.
+            registro (RegistroOperadores): Operadores y funciones del analizador
+                                           Pratt; el árbol lo guarda para evaluarse.
 
         Raises:
-            ValueError: Si se encuentra un operador inválido durante la construcción del árbol.
+            ErrorLexico: Si la expresión es inválida; indica la columna del primer error.
+            ValueError: Si se pide `compacto` o `compartir` junto con un `registro`.
         """
-        tokens = self.tokenizar_expresion(expresion)
+        if registro is not None:
+            self._construir_pratt(expresion, compacto, compartir, progreso, tokens, registro)
+            return
+        # Todo se construye aparte y el árbol solo cambia si el análisis termina:
+        # un error léxico a mitad de la expresión deja intacto el árbol anterior
+        construccion = _Construccion(compacto, compartir)
+        hoja, reducir = construccion.funciones()
         pila_nodos = []
         pila_operadores = []
 
-        for token in tokens:
-            if self.es_numero(token):
-                nodo = Nodo(float(token))
-                pila_nodos.append(nodo)
-            elif token == '(':
-                pila_operadores.append(token)
-            elif token == ')':
+        if tokens is None:
+            tokens = tokenizar(expresion)
+        if progreso is not None:
+            tokens = _informar_progreso(tokens, progreso, len(expresion))
+        for tipo, _, valor, _ in tokens:
+            if tipo == NUMERO or tipo == VARIABLE:
+                pila_nodos.append(hoja(valor))
+            elif tipo == ABRE:
+                pila_operadores.append(valor)
+            elif tipo == CIERRA:
                 while pila_operadores and pila_operadores[-1] != '(':
-                    self.procesar_operador(pila_nodos, pila_operadores.pop())
+                    reducir(pila_nodos, pila_operadores.pop())
                 pila_operadores.pop()
-            elif token in self.OPERADORES:
+            else:
+                operador = valor
                 while (pila_operadores and pila_operadores[-1] != '(' and
-                       self.OPERADORES.get(pila_operadores[-1], 0) >= self.OPERADORES[token]):
-                    self.procesar_operador(pila_nodos, pila_operadores.pop())
-                pila_operadores.append(token)
+                       self.OPERADORES.get(pila_operadores[-1], 0) >= self.OPERADORES[operador]):
+                    reducir(pila_nodos, pila_operadores.pop())
+                pila_operadores.append(operador)
 
         # Procesar cualquier operador restante
         while pila_operadores:
-            self.procesar_operador(pila_nodos, pila_operadores.pop())
+            reducir(pila_nodos, pila_operadores.pop())
 
         # La raíz del árbol es el último nodo en la pila
-        self.raiz = pila_nodos.pop()
+        raiz = pila_nodos.pop()
+        almacen = construccion.almacen
+        if construccion.internados is not None:
+            self.nodos_expandidos = construccion.tamanos[raiz]
+            self.nodos_unicos = len(construccion.internados)
+        else:
+            self.nodos_expandidos = self.nodos_unicos = 0
+        self.raiz = almacen.vista(raiz) if almacen is not None else raiz
+        self.registro = None
+        self.extendido = False
+        self.almacen = almacen
+        self.compartido = compartir
+        self.programa = None
+        self.funcion = None
+        self.incremental = None
+        self._metricas = None
+
+    def _construir_pratt(self, expresion, compacto, compartir, progreso, tokens, registro):
+        """
+        Construye el árbol con el analizador Pratt; ver `construir_arbol`.
+        """
+        if compacto or compartir:
+            raise ValueError("El analizador Pratt no admite los modos compacto ni compartir.")
+        if tokens is None:
+            tokens = escanear(expresion)
+        if progreso is not None:
+            tokens = _informar_progreso(tokens, progreso, len(expresion))
+        raiz, extendido = construir_pratt(expresion, registro, tokens)
+        self.raiz = raiz
+        self.registro = registro
+        self.extendido = extendido
+        self.almacen = None
+        self.compartido = False
+        self.nodos_expandidos = self.nodos_unicos = 0
+        self.programa = None
+        self.funcion = None
+        self.incremental = None
+        self._metricas = None
+
+    def _exigir_basico(self, operacion):
+        """
+        Comprueba que el árbol solo usa los operadores binarios básicos, los únicos
+        que entienden el programa postfijo, el optimizador, el evaluador
+        incremental y el formato binario.
+
+        Raises:
+            ValueError: Si el árbol tiene operadores unarios, funciones u operadores
+                        con un núcleo propio del registro.
+        """
+        if self.extendido:
+            raise ValueError(f"No se puede {operacion} un árbol con operadores unarios "
+                             f"o funciones; use evaluar_arbol o compilar_funcion.")
 
     def procesar_operador(self, pila_nodos, operador):
         """
@@ -68,10 +269,44 @@ class ArbolDeExpresion:
             pila_nodos (list): Pila que contiene los nodos de los operandos.
             operador (str): El operador que se aplicará a los operandos.
         """
-        nodo = Nodo(operador)
-        nodo.der = pila_nodos.pop()  # Operando derecho
-        nodo.izq = pila_nodos.pop()  # Operando izquierdo
-        pila_nodos.append(nodo)
+        if self.almacen is not None:
+            der = pila_nodos.pop()
+            izq = pila_nodos.pop()
+            pila_nodos.append(self.almacen.operador(operador, izq, der))
+            return
+        _reducir(pila_nodos, operador)
+
+    def razon_compresion(self):
+        """
+        Indica cuánto se redujo el árbol al compartir subárboles idénticos.
+
+        Returns:
+            float: Nodos del árbol expandido por cada nodo realmente creado
+                   (1.0 si el árbol no se construyó con `compartir=True`).
+        """
+        if not self.compartido or not self.nodos_unicos:
+            return 1.0
+        return self.nodos_expandidos / self.nodos_unicos
+
+    def metricas(self, calcular=True):
+        """
+        Devuelve el índice de métricas del árbol (tamaño, altura, hojas y
+        profundidad de cada nodo e histograma de operadores), calculándolo en la
+        primera llamada. Se reutiliza mientras la raíz no cambie: cambiar el
+        número de una hoja no altera ninguna métrica.
+
+        Args:
+            calcular (bool): Si es False y el índice todavía no existe, devuelve
+                             None en lugar de recorrer el árbol.
+
+        Returns:
+            IndiceMetricas: Las métricas del árbol actual.
+        """
+        if self._metricas is None or self._metricas.raiz is not self.raiz:
+            if not calcular:
+                return None
+            self._metricas = IndiceMetricas(self.raiz)
+        return self._metricas
 
     def tokenizar_expresion(self, expresion):
         """
@@ -83,67 +318,501 @@ class ArbolDeExpresion:
 
         Returns:
             list: Lista de tokens que contiene números, operadores y paréntesis.
+
+        Raises:
+            ErrorLexico: Si la expresión es inválida, en lugar de descartar caracteres.
         """
-        patron = r'\d+\.?\d*|[+*/^()-]'
-        tokens = re.findall(patron, expresion)
-        return tokens
+        return [texto for _, texto, _, _ in tokenizar(expresion)]
 
-    def es_numero(self, token):
+    def evaluar_arbol(self, nodo, variables=None, presupuesto=None):
         """
-        Verifica si un token es un número.
+        Evalúa el árbol de expresión para calcular el resultado aritmético.
+        El recorrido en postorden usa una pila explícita, por lo que no hay límite
+        de profundidad impuesto por la recursión de Python. Si el árbol comparte
+        subárboles, cada uno se evalúa una sola vez. Los nodos con un solo hijo
+        (el derecho) son operadores unarios o funciones del registro.
 
         Args:
-            token (str): El token a verificar.
+            nodo (Nodo): El nodo raíz del árbol o subárbol que se va a evaluar.
+            variables (dict): Valores de las variables por nombre.
+            presupuesto (PresupuestoEvaluacion): Límites de nodos, magnitud,
+                                                 exponente y tiempo; sin él, la
+                                                 evaluación no tiene límites.
 
         Returns:
-            bool: True si el token es un número, False si no lo es.
-        """
-        try:
-            float(token)
-            return True
-        except ValueError:
-            return False
+            float: El resultado de evaluar la expresión representada por el árbol.
 
-    def evaluar_arbol(self, nodo):
+        Raises:
+            ZeroDivisionError: Si se intenta realizar una división por cero.
+            ValueError: Si se encuentra un operador desconocido o una variable sin valor.
+            PresupuestoExcedido: Si se supera algún límite del presupuesto.
         """
-        Evalúa recursivamente el árbol de expresión para calcular el resultado aritmético.
+        aplicar = self.registro.aplicar_binario if self.extendido else self.aplicar_operador
+        if presupuesto is not None:
+            # Si las métricas ya se calcularon, el tamaño del árbol decide de
+            # antemano si la evaluación puede superar el límite de nodos; no se
+            # calculan solo para esto porque cuestan más que la evaluación misma
+            nodos = None
+            metricas = self._metricas
+            if (presupuesto.max_nodos is not None and metricas is not None
+                    and metricas.raiz is nodo and nodo is self.raiz):
+                nodos = metricas.nodos
+            return evaluar_con_presupuesto(nodo, presupuesto, aplicar, variables,
+                                           self.compartido, self.aplicar_unario, nodos)
+        valores = []
+        memo = {} if self.compartido else None
+        pila = [(nodo, False)]
+        while pila:
+            actual, visitado = pila.pop()
+            if actual.izq is None and actual.der is None:
+                valor = actual.valor
+                if isinstance(valor, str):
+                    # Nodo hoja (variable)
+                    if variables is None or valor not in variables:
+                        raise ValueError(f"Variable sin valor: {valor}")
+                    valor = variables[valor]
+                valores.append(valor)  # Nodo hoja (número)
+            elif visitado:
+                # Los subárboles ya están evaluados en la pila de valores
+                der_valor = valores.pop()
+                if actual.izq is None:
+                    valor = self.aplicar_unario(actual.valor, der_valor)
+                else:
+                    valor = aplicar(actual.valor, valores.pop(), der_valor)
+                valores.append(valor)
+                if memo is not None:
+                    memo[actual] = valor
+            elif memo is not None and actual in memo:
+                valores.append(memo[actual])
+            else:
+                pila.append((actual, True))
+                pila.append((actual.der, False))
+                if actual.izq is not None:
+                    pila.append((actual.izq, False))
+        return valores.pop()
+
+    def aplicar_operador(self, operador, izq_valor, der_valor):
+        """
+        Aplica un operador binario a dos valores ya evaluados.
 
         Args:
-            nodo (Nodo): El nodo raíz del árbol o subárbol que se va a evaluar.
+            operador (str): El operador a aplicar.
+            izq_valor (float): Valor del operando izquierdo.
+            der_valor (float): Valor del operando derecho.
 
         Returns:
-            float: El resultado de evaluar la expresión representada por el árbol.
+            float: El resultado de la operación.
 
         Raises:
             ZeroDivisionError: Si se intenta realizar una división por cero.
             ValueError: Si se encuentra un operador desconocido.
         """
-        if nodo.izq is None and nodo.der is None:
-            return nodo.valor  # Caso base: Nodo hoja (número)
-
-        # Evaluar los subárboles izquierdo y derecho
-        izq_valor = self.evaluar_arbol(nodo.izq)
-        der_valor = self.evaluar_arbol(nodo.der)
-
-        # Aplicar el operador en el nodo actual
-        if nodo.valor == '+':
+        if operador == '+':
             return izq_valor + der_valor
-        elif nodo.valor == '-':
+        elif operador == '-':
             return izq_valor - der_valor
-        elif nodo.valor == '*':
+        elif operador == '*':
             return izq_valor * der_valor
-        elif nodo.valor == '/':
+        elif operador == '/':
             if der_valor == 0:
                 raise ZeroDivisionError("Error: División entre cero.")
             return izq_valor / der_valor
-        elif nodo.valor == '^':
+        elif operador == '^':
             return izq_valor ** der_valor
         else:
-            raise ValueError(f"Operador desconocido: {nodo.valor}")
+            raise ValueError(f"Operador desconocido: {operador}")
+
+    def aplicar_unario(self, operador, valor):
+        """
+        Aplica un operador unario o una función de un argumento con el núcleo del
+        registro del árbol.
+
+        Args:
+            operador (str): El símbolo del operador o el nombre de la función.
+            valor (float): Valor del operando.
+
+        Returns:
+            float: El resultado de la operación.
+
+        Raises:
+            ValueError: Si el árbol no tiene registro o el operador no está en él.
+        """
+        if self.registro is None:
+            raise ValueError(f"Operador desconocido: {operador}")
+        return self.registro.aplicar_unario(operador, valor)
+
+    def optimizar(self):
+        """
+        Pliega los subárboles constantes y aplica identidades seguras (x*1, x+0,
+        x-0, x/1, x^1) sobre el árbol actual. Las operaciones que lanzarían un error
+        al evaluarse, como una división entre cero, se dejan sin plegar para que la
+        evaluación se comporte igual que antes.
+
+        Returns:
+            ReporteOptimizacion: Nodos antes y después, y operaciones aplicadas.
+
+        Raises:
+            ValueError: Si el árbol tiene operadores unarios o funciones.
+        """
+        self._exigir_basico("optimizar")
+        raiz, reporte = optimizar(self.raiz, self.aplicar_operador)
+        if self.almacen is not None and raiz is not None:
+            self.almacen, indice = AlmacenNodos.desde_nodo(raiz)
+            raiz = self.almacen.vista(indice)
+        self.raiz = raiz
+        self.programa = None
+        self.funcion = None
+        self.incremental = None
+        self._metricas = None
+        return reporte
+
+    def compilar(self):
+        """
+        Compila el árbol actual en un programa postfijo plano y lo guarda en
+        `self.programa` para reutilizarlo en evaluaciones posteriores.
+
+        Returns:
+            ProgramaPostfijo: El programa equivalente al árbol.
+
+        Raises:
+            ValueError: Si el árbol tiene operadores unarios o funciones.
+        """
+        self._exigir_basico("compilar")
+        if self.almacen is not None and not self.compartido:
+            self.programa = self.almacen.a_programa()
+        else:
+            self.programa = ProgramaPostfijo.desde_nodo(self.raiz)
+        return self.programa
+
+    def evaluar_compilado(self, variables=None):
+        """
+        Evalúa el árbol mediante su programa postfijo, compilándolo si aún no existe.
+        Devuelve el mismo resultado que `evaluar_arbol(self.raiz, variables)`.
+
+        Args:
+            variables (dict): Valores de las variables por nombre.
+
+        Returns:
+            float: El resultado de evaluar la expresión.
+
+        Raises:
+            ZeroDivisionError: Si se intenta realizar una división por cero.
+            ValueError: Si falta el valor de alguna variable.
+        """
+        programa = self.programa
+        if programa is None:
+            programa = self.compilar()
+        return programa.evaluar(variables)
+
+    def compilar_funcion(self):
+        """
+        Compila el árbol actual en una función nativa de Python (ver
+        `Modelos.compilador.compilar_funcion`) y la guarda en `self.funcion`, para
+        evaluar la misma fórmula muchas veces con distintos valores escalares:
+
+            f = arbol.compilar_funcion()
+            f(1.5, 2.0)         # en el orden de f.nombres_variables
+            f(x=1.5, y=2.0)
+
+        Returns:
+            function: La función, que recibe un argumento por variable.
+        """
+        if self.funcion is None:
+            self.funcion = compilar_funcion(self.raiz, self.compartido, self.registro)
+        return self.funcion
+
+    def preparar_incremental(self, variables=None):
+        """
+        Evalúa el árbol guardando el valor de cada subárbol (ver
+        `EvaluadorIncremental`), para que `actualizar_variable` y `actualizar_hoja`
+        solo recalculen los ancestros de lo que cambia.
+
+        Args:
+            variables (dict): Valores iniciales de las variables por nombre.
+
+        Returns:
+            EvaluadorIncremental: El evaluador, guardado en `self.incremental`.
+
+        Raises:
+            ValueError: Si falta el valor de alguna variable o el árbol tiene
+                        operadores unarios o funciones.
+        """
+        self._exigir_basico("evaluar incrementalmente")
+        self.incremental = EvaluadorIncremental(self.raiz, self.aplicar_operador, variables)
+        return self.incremental
+
+    def _evaluador_incremental(self):
+        """
+        Devuelve el evaluador incremental, creándolo si el árbol no tiene variables.
+
+        Raises:
+            ValueError: Si el árbol tiene variables y no se llamó a `preparar_incremental`.
+        """
+        if self.incremental is None:
+            self.preparar_incremental()
+        return self.incremental
+
+    def actualizar_variable(self, nombre, valor):
+        """
+        Cambia el valor de una variable y devuelve el nuevo resultado, recalculando
+        solo los nodos que dependen de ella.
+
+        Args:
+            nombre (str): El nombre de la variable.
+            valor (float): Su nuevo valor.
+
+        Returns:
+            float: El resultado de la expresión con el nuevo valor.
+
+        Raises:
+            ValueError: Si la variable no aparece en el árbol o no se preparó la
+                        evaluación incremental con los valores de las variables.
+            ZeroDivisionError: Si la expresión divide entre cero con el nuevo valor.
+        """
+        return self._evaluador_incremental().actualizar_variable(nombre, valor)
+
+    def actualizar_hoja(self, nodo, valor):
+        """
+        Cambia el número de una hoja del árbol y devuelve el nuevo resultado,
+        recalculando solo sus ancestros. Si la hoja está compartida (árbol
+        construido con `compartir=True`), cambia en todos los lugares donde aparece.
+
+        Args:
+            nodo (Nodo): La hoja a cambiar.
+            valor (float): Su nuevo valor.
+
+        Returns:
+            float: El resultado de la expresión con el nuevo valor.
+
+        Raises:
+            ValueError: Si el nodo no es una hoja numérica del árbol.
+            ZeroDivisionError: Si la expresión divide entre cero con el nuevo valor.
+        """
+        evaluador = self._evaluador_incremental()
+        try:
+            resultado = evaluador.actualizar_hoja(nodo, valor)
+        except ArithmeticError:
+            # El valor ya cambió en el evaluador; el árbol debe reflejarlo igual
+            self._fijar_hoja(nodo, valor)
+            raise
+        self._fijar_hoja(nodo, valor)
+        return resultado
+
+    def _fijar_hoja(self, nodo, valor):
+        """
+        Escribe el nuevo número de una hoja en el árbol y descarta sus formas
+        compiladas, que ya no le corresponden.
+        """
+        if self.almacen is not None:
+            self.almacen.constantes[nodo.indice] = valor
+        else:
+            nodo.valor = valor
+        self.programa = None
+        self.funcion = None
+
+    def evaluar_lote(self, variables, tamano_bloque=None, salida=None):
+        """
+        Evalúa el árbol una sola vez sobre columnas de NumPy, una fila por elemento.
+        Ver `ProgramaPostfijo.evaluar_lote`.
+
+        Args:
+            variables (dict): Arreglos de valores por nombre de variable.
+            tamano_bloque (int): Número de filas por bloque para acotar la memoria.
+            salida (tuple): Arreglos (valores, mascara) donde escribir el resultado.
+
+        Returns:
+            tuple: (valores, mascara) con el resultado y las filas con división entre cero.
+        """
+        programa = self.programa
+        if programa is None:
+            programa = self.compilar()
+        return programa.evaluar_lote(variables, tamano_bloque, salida)
+
+    def guardar(self, ruta, compartir=False):
+        """
+        Guarda el árbol en un archivo binario (ver `Modelos.serializacion`), para
+        cargarlo después sin volver a analizar la expresión.
+
+        Args:
+            ruta (str): Ruta del archivo de salida.
+            compartir (bool): Si es True, los subárboles idénticos se escriben una
+                              sola vez aunque el árbol no se haya construido con
+                              `compartir=True`.
+
+        Raises:
+            ValueError: Si el árbol está vacío o tiene operadores unarios o funciones.
+        """
+        from Modelos.serializacion import serializar
+
+        self._exigir_basico("guardar")
+        datos = serializar(self.raiz, compartir)
+        with open(ruta, 'wb') as archivo:
+            archivo.write(datos)
+
+    @classmethod
+    def cargar(cls, ruta, compacto=False):
+        """
+        Carga un árbol guardado con `guardar`.
+
+        Args:
+            ruta (str): Ruta del archivo.
+            compacto (bool): Si es True, los nodos se guardan en un `AlmacenNodos`.
+
+        Returns:
+            ArbolDeExpresion: El árbol cargado.
+
+        Raises:
+            ValueError: Si el archivo no contiene un árbol serializado válido.
+        """
+        from Modelos.serializacion import deserializar
+
+        with open(ruta, 'rb') as archivo:
+            return deserializar(archivo.read(), compacto)
+
+    def obtener_variables(self):
+        """
+        Devuelve los nombres de las variables de la expresión, en orden de aparición.
+
+        Returns:
+            list: Los nombres de las variables.
+        """
+        if self.extendido:
+            # Sin programa postfijo: las hojas en preorden van de izquierda a derecha
+            nombres = {}
+            for nodo in self._hojas_preorden():
+                if isinstance(nodo.valor, str):
+                    nombres.setdefault(nodo.valor)
+            return list(nombres)
+        programa = self.programa
+        if programa is None:
+            programa = self.compilar()
+        return list(programa.nombres_variables)
+
+    def _hojas_preorden(self):
+        """
+        Produce las hojas del árbol de izquierda a derecha.
+        """
+        pila = [self.raiz] if self.raiz is not None else []
+        while pila:
+            actual = pila.pop()
+            if actual.izq is None and actual.der is None:
+                yield actual
+                continue
+            pila.append(actual.der)
+            if actual.izq is not None:
+                pila.append(actual.izq)
+
+    def recorrer_inorden(self, nodo):
+        """
+        Recorre el árbol en inorden y produce el texto de cada nodo a medida que
+        lo visita. Solo guarda la pila del recorrido (tan alta como el árbol).
+
+        Args:
+            nodo (Nodo): El nodo raíz del árbol o subárbol a recorrer.
+
+        Yields:
+            str: El valor de cada nodo, en inorden.
+        """
+        pila = []
+        actual = nodo
+        while pila or actual is not None:
+            while actual is not None:
+                pila.append(actual)
+                actual = actual.izq
+            actual = pila.pop()
+            yield f"{actual.valor}"
+            actual = actual.der
+
+    def recorrer_preorden(self, nodo):
+        """
+        Recorre el árbol en preorden y produce el texto de cada nodo a medida que
+        lo visita. Solo guarda la pila del recorrido.
+
+        Args:
+            nodo (Nodo): El nodo raíz del árbol o subárbol a recorrer.
+
+        Yields:
+            str: El valor de cada nodo, en preorden.
+        """
+        pila = [nodo] if nodo is not None else []
+        while pila:
+            actual = pila.pop()
+            yield f"{actual.valor}"
+            if actual.der is not None:
+                pila.append(actual.der)
+            if actual.izq is not None:
+                pila.append(actual.izq)
+
+    def recorrer_postorden(self, nodo):
+        """
+        Recorre el árbol en postorden y produce el texto de cada nodo a medida
+        que lo visita. A diferencia de `imprimir_postorden`, no invierte una lista
+        con todos los nodos: cada nodo se apila dos veces (al bajar y al volver),
+        así que solo se guarda la pila del recorrido.
+
+        Args:
+            nodo (Nodo): El nodo raíz del árbol o subárbol a recorrer.
+
+        Yields:
+            str: El valor de cada nodo, en postorden.
+        """
+        pila = [(nodo, False)] if nodo is not None else []
+        while pila:
+            actual, visitado = pila.pop()
+            if visitado or (actual.izq is None and actual.der is None):
+                yield f"{actual.valor}"
+                continue
+            pila.append((actual, True))
+            if actual.der is not None:
+                pila.append((actual.der, False))
+            if actual.izq is not None:
+                pila.append((actual.izq, False))
+
+    def escribir_recorrido(self, nodo, orden, salida, separador="  ", tamano_bloque=1 << 16):
+        """
+        Escribe un recorrido en un flujo de texto (un archivo, `sys.stdout`, un
+        `io.StringIO`...) por bloques de unos `tamano_bloque` caracteres, sin
+        construir nunca el texto completo. El resultado es el mismo texto que
+        `imprimir_<orden>(nodo).strip()`.
+
+        Args:
+            nodo (Nodo): El nodo raíz del árbol o subárbol a recorrer.
+            orden (str): 'inorden', 'preorden' o 'postorden'.
+            salida (io.TextIOBase): Cualquier objeto con un método `write(str)`.
+            separador (str): El texto entre dos nodos.
+            tamano_bloque (int): Caracteres aproximados por cada llamada a `write`.
+
+        Returns:
+            int: El número de caracteres escritos.
+
+        Raises:
+            ValueError: Si el orden no existe.
+        """
+        recorridos = {'inorden': self.recorrer_inorden, 'preorden': self.recorrer_preorden,
+                      'postorden': self.recorrer_postorden}
+        if orden not in recorridos:
+            raise ValueError(f"Recorrido desconocido: {orden}")
+        escritos = 0
+        bloque = []
+        pendiente = 0
+        prefijo = ""
+        for texto in recorridos[orden](nodo):
+            bloque.append(prefijo)
+            bloque.append(texto)
+            prefijo = separador
+            pendiente += len(texto) + len(separador)
+            if pendiente >= tamano_bloque:
+                escritos += salida.write("".join(bloque)) or 0
+                bloque.clear()
+                pendiente = 0
+        if bloque:
+            escritos += salida.write("".join(bloque)) or 0
+        return escritos
 
     def imprimir_inorden(self, nodo, resultado=""):
         """
         Genera una representación en orden (inorden) de la expresión.
+        Se recorre con una pila explícita y el texto se une una sola vez al final.
 
         Args:
             nodo (Nodo): El nodo raíz del árbol o subárbol a recorrer.
@@ -152,15 +821,22 @@ class ArbolDeExpresion:
         Returns:
             str: La expresión aritmética recorrida en inorden.
         """
-        if nodo:
-            resultado = self.imprimir_inorden(nodo.izq, resultado)
-            resultado += f" {nodo.valor} "
-            resultado = self.imprimir_inorden(nodo.der, resultado)
-        return resultado
+        partes = []
+        pila = []
+        actual = nodo
+        while pila or actual is not None:
+            while actual is not None:
+                pila.append(actual)
+                actual = actual.izq
+            actual = pila.pop()
+            partes.append(f" {actual.valor} ")
+            actual = actual.der
+        return resultado + "".join(partes)
 
     def imprimir_preorden(self, nodo, resultado=""):
         """
         Genera una representación en preorden de la expresión.
+        Se recorre con una pila explícita y el texto se une una sola vez al final.
 
         Args:
             nodo (Nodo): El nodo raíz del árbol o subárbol a recorrer.
@@ -169,15 +845,22 @@ class ArbolDeExpresion:
         Returns:
             str: La expresión aritmética recorrida en preorden.
         """
-        if nodo:
-            resultado += f" {nodo.valor} "
-            resultado = self.imprimir_preorden(nodo.izq, resultado)
-            resultado = self.imprimir_preorden(nodo.der, resultado)
-        return resultado
+        partes = []
+        pila = [nodo] if nodo is not None else []
+        while pila:
+            actual = pila.pop()
+            partes.append(f" {actual.valor} ")
+            if actual.der is not None:
+                pila.append(actual.der)
+            if actual.izq is not None:
+                pila.append(actual.izq)
+        return resultado + "".join(partes)
 
     def imprimir_postorden(self, nodo, resultado=""):
         """
         Genera una representación en postorden de la expresión.
+        Se construye el recorrido (raíz, derecha, izquierda) con una pila explícita
+        y se invierte, lo que equivale al postorden.
 
         Args:
             nodo (Nodo): El nodo raíz del árbol o subárbol a recorrer.
@@ -186,8 +869,14 @@ class ArbolDeExpresion:
         Returns:
             str: La expresión aritmética recorrida en postorden.
         """
-        if nodo:
-            resultado = self.imprimir_postorden(nodo.izq, resultado)
-            resultado = self.imprimir_postorden(nodo.der, resultado)
-            resultado += f" {nodo.valor} "
-        return resultado
+        partes = []
+        pila = [nodo] if nodo is not None else []
+        while pila:
+            actual = pila.pop()
+            partes.append(f" {actual.valor} ")
+            if actual.izq is not None:
+                pila.append(actual.izq)
+            if actual.der is not None:
+                pila.append(actual.der)
+        partes.reverse()
+        return resultado + "".join(partes)
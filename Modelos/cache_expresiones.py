@@ -0,0 +1,236 @@
+"""
+Caché de expresiones
+"""
+import re
+import threading
+from collections import OrderedDict
+
+from Modelos.arbol import ArbolDeExpresion
+from Modelos.lexer import tokenizar
+from utils.instrumentacion import Instrumentacion
+
+# Espacios alrededor de operadores y paréntesis, que nunca cambian el significado
+_ESPACIOS_SIMBOLOS = re.compile(r' ?([-+*/^()]) ?')
+
+
+def _sin_progreso(etapa, fraccion):
+    """
+    Función de progreso que no informa nada.
+    """
+
+
+class ResultadoExpresion:
+    """
+    Resultado completo de procesar una expresión: el árbol construido, sus tres
+    recorridos (None si la caché no los calcula) y la evaluación (o el error
+    producido al evaluar).
+    """
+
+    __slots__ = ('arbol', 'inorden', 'preorden', 'postorden', 'evaluacion', 'error')
+
+    def __init__(self, arbol, inorden, preorden, postorden, evaluacion=None, error=None):
+        self.arbol = arbol
+        self.inorden = inorden
+        self.preorden = preorden
+        self.postorden = postorden
+        self.evaluacion = evaluacion
+        self.error = error
+
+
+class CacheExpresiones:
+    """
+    Caché acotada (LRU) de árboles y resultados, indexada por la expresión con los
+    espacios normalizados. Una expresión repetida cuesta una búsqueda en el
+    diccionario en lugar de volver a tokenizar, construir y evaluar.
+
+    Con `max_caracteres` la caché también se acota por tamaño: la memoria de una
+    entrada crece con la longitud de su expresión, así que se desalojan las
+    menos recientes hasta que la suma de las longitudes cabe en el límite, y una
+    expresión más larga que todo el límite se procesa sin guardarse.
+
+    Se puede usar desde varios hilos: las consultas y modificaciones del
+    diccionario se hacen con un candado, pero la construcción de una expresión
+    nueva ocurre fuera de él para no bloquear a los demás hilos.
+    """
+
+    def __init__(self, capacidad=128, instrumentacion=None, presupuesto=None,
+                 recorridos=True, max_caracteres=None):
+        """
+        Inicializa la caché vacía.
+
+        Args:
+            capacidad (int): Número máximo de expresiones guardadas.
+            instrumentacion (Instrumentacion): Dónde registrar el tiempo y la memoria
+                                               de cada etapa; por omisión, una
+                                               desactivada.
+            presupuesto (PresupuestoEvaluacion): Límites de la evaluación de cada
+                                                 expresión; si se superan, el
+                                                 resultado queda con el error.
+            recorridos (bool): Si es False, los recorridos no se calculan como texto
+                               (quedan en None) y quien los necesite los produce
+                               con `arbol.recorrer_*`, por ejemplo por páginas.
+            max_caracteres (int): Suma máxima de las longitudes (normalizadas) de
+                                  las expresiones guardadas; None para no
+                                  acotar más que por `capacidad`.
+        """
+        if capacidad < 1:
+            raise ValueError("La capacidad de la caché debe ser al menos 1.")
+        self.capacidad = capacidad
+        self.instrumentacion = instrumentacion or Instrumentacion()
+        self.presupuesto = presupuesto
+        self.recorridos = recorridos
+        self.max_caracteres = max_caracteres
+        self._entradas = OrderedDict()
+        self._caracteres = 0
+        self._candado = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+        self.omitidas = 0
+
+    def __len__(self):
+        return len(self._entradas)
+
+    @staticmethod
+    def normalizar(expresion):
+        """
+        Normaliza los espacios de una expresión para usarla como clave.
+
+        Args:
+            expresion (str): La expresión aritmética.
+
+        Returns:
+            str: La expresión sin espacios alrededor de operadores y paréntesis, y
+                 con los demás (por ejemplo entre dos números) reducidos a uno solo.
+        """
+        return _ESPACIOS_SIMBOLOS.sub(r'\1', " ".join(expresion.split()))
+
+    def obtener(self, expresion, progreso=None):
+        """
+        Devuelve el resultado de la expresión, construyéndolo si no está en la caché.
+
+        Args:
+            expresion (str): La expresión aritmética.
+            progreso (callable): Función (etapa, fraccion) que se informa durante la
+                                 construcción; ver `procesar`.
+
+        Returns:
+            ResultadoExpresion: El árbol, los recorridos y la evaluación.
+
+        Raises:
+            ErrorLexico: Si la expresión es inválida (los errores no se guardan).
+        """
+        with self.instrumentacion.etapa("cache"):
+            clave = self.normalizar(expresion)
+            with self._candado:
+                resultado = self._entradas.get(clave)
+                if resultado is not None:
+                    self._entradas.move_to_end(clave)
+                    self.aciertos += 1
+                    return resultado
+                self.fallos += 1
+
+        resultado = self.procesar(expresion, progreso)
+        max_caracteres = self.max_caracteres
+        with self._candado:
+            if max_caracteres is not None and len(clave) > max_caracteres:
+                self.omitidas += 1
+                return resultado
+            if clave not in self._entradas:
+                self._caracteres += len(clave)
+            self._entradas[clave] = resultado
+            self._entradas.move_to_end(clave)
+            while (len(self._entradas) > self.capacidad
+                   or max_caracteres is not None and self._caracteres > max_caracteres):
+                desalojada, _ = self._entradas.popitem(last=False)
+                self._caracteres -= len(desalojada)
+                self.desalojos += 1
+        return resultado
+
+    def procesar(self, expresion, progreso=None):
+        """
+        Construye el árbol de la expresión, calcula sus recorridos y lo evalúa.
+
+        Args:
+            expresion (str): La expresión aritmética.
+            progreso (callable): Función (etapa, fraccion) llamada al empezar cada
+                                 etapa y durante la construcción del árbol. Si lanza
+                                 una excepción, el procesamiento se interrumpe con
+                                 ella y nada se guarda en la caché.
+
+        Returns:
+            ResultadoExpresion: El resultado completo de la expresión.
+        """
+        etapa = self.instrumentacion.etapa
+        arbol = ArbolDeExpresion()
+        avance = None
+        if progreso is None:
+            progreso = _sin_progreso
+        else:
+            progreso("Construyendo el árbol", 0.0)
+            avance = lambda fraccion: progreso("Construyendo el árbol", fraccion)
+
+        tokens = None
+        if self.instrumentacion.activa:
+            # Al medir, el análisis léxico (que también valida) se separa de la
+            # construcción; sin medir, los tokens se consumen a medida que se producen
+            with etapa("tokenizar") as medicion:
+                tokens = list(tokenizar(expresion))
+            medicion.nodos = len(tokens)
+        with etapa("construir") as medicion:
+            arbol.construir_arbol(expresion, progreso=avance, tokens=tokens)
+        nodos = len(arbol.metricas()) if medicion.activa else None
+        medicion.nodos = nodos
+
+        inorden = preorden = postorden = None
+        if self.recorridos:
+            progreso("Calculando recorridos", 0.0)
+            with etapa("inorden") as medicion:
+                inorden = "  ".join(arbol.recorrer_inorden(arbol.raiz))
+            medicion.nodos = nodos
+            progreso("Calculando recorridos", 1 / 3)
+            with etapa("preorden") as medicion:
+                preorden = "  ".join(arbol.recorrer_preorden(arbol.raiz))
+            medicion.nodos = nodos
+            progreso("Calculando recorridos", 2 / 3)
+            with etapa("postorden") as medicion:
+                postorden = "  ".join(arbol.recorrer_postorden(arbol.raiz))
+            medicion.nodos = nodos
+        resultado = ResultadoExpresion(arbol, inorden, preorden, postorden)
+
+        progreso("Evaluando", 0.0)
+        with etapa("evaluar") as medicion:
+            try:
+                resultado.evaluacion = arbol.evaluar_arbol(arbol.raiz,
+                                                          presupuesto=self.presupuesto)
+            except (ZeroDivisionError, ValueError, OverflowError) as e:
+                resultado.error = e
+        medicion.nodos = nodos
+        return resultado
+
+    def limpiar(self):
+        """
+        Vacía la caché sin reiniciar los contadores.
+        """
+        with self._candado:
+            self._entradas.clear()
+            self._caracteres = 0
+
+    def estadisticas(self):
+        """
+        Devuelve los contadores de la caché.
+
+        Returns:
+            dict: Aciertos, fallos, desalojos, expresiones omitidas por largas,
+                  tamaño actual (en entradas y en caracteres) y capacidad.
+        """
+        with self._candado:
+            return {
+                'aciertos': self.aciertos,
+                'fallos': self.fallos,
+                'desalojos': self.desalojos,
+                'omitidas': self.omitidas,
+                'tamano': len(self._entradas),
+                'caracteres': self._caracteres,
+                'capacidad': self.capacidad,
+            }
@@ -0,0 +1,162 @@
+"""
+Compilación de árboles a funciones nativas de Python
+"""
+import keyword
+import math
+import unicodedata
+
+from Modelos.programa import CODIGOS_OPERADOR
+
+_SIMBOLOS_PYTHON = {'+': '+', '-': '-', '*': '*', '/': '/', '^': '**'}
+
+
+def _division_entre_cero():
+    raise ZeroDivisionError("Error: División entre cero.")
+
+
+def _nombre_parametro(nombre, indice):
+    """
+    Devuelve el nombre del parámetro para una variable: el mismo nombre si es un
+    identificador de Python utilizable, o uno generado si es una palabra clave,
+    choca con los nombres internos (que empiezan con `__`) o Python lo
+    normalizaría a otro nombre.
+    """
+    if (nombre.isidentifier() and not keyword.iskeyword(nombre)
+            and not nombre.startswith('__')
+            and unicodedata.normalize('NFKC', nombre) == nombre):
+        return nombre
+    return f"__v{indice}"
+
+
+def _nombre_nucleo(definicion, globales, nucleos):
+    """
+    Devuelve el nombre global con el que el código generado llama al núcleo de
+    una entrada del registro, agregándolo a `globales` la primera vez.
+    """
+    clave = (definicion.simbolo, definicion.aridad)
+    nombre = nucleos.get(clave)
+    if nombre is None:
+        nombre = nucleos[clave] = f"__f{len(nucleos)}"
+        globales[nombre] = definicion.nucleo
+    return nombre
+
+
+def compilar_funcion(raiz, compartido=False, registro=None):
+    """
+    Genera el código fuente de una función equivalente al árbol, lo compila con
+    `compile()` y devuelve la función. El código es una secuencia de
+    asignaciones sin saltos (una por operador) cuyas variables temporales se
+    reutilizan según la profundidad de la pila postfija, así que un árbol
+    balanceado usa pocas variables locales y un árbol profundo no choca con el
+    límite de anidamiento del compilador de Python.
+
+    La función recibe un argumento por variable, en el orden de
+    `funcion.nombres_variables` (el de aparición en la expresión); también se
+    pueden pasar por nombre si el nombre es un identificador de Python válido.
+    Devuelve exactamente el mismo valor que `ArbolDeExpresion.evaluar_arbol`.
+    Con un `registro`, los operadores unarios, las funciones y los operadores con
+    un núcleo propio se compilan como llamadas a su núcleo.
+
+    Args:
+        raiz (Nodo): La raíz del árbol.
+        compartido (bool): Si el árbol comparte subárboles; cada uno se calcula
+                           una sola vez.
+        registro (RegistroOperadores): El registro con el que se construyó el
+                                       árbol, si fue con el analizador Pratt.
+
+    Returns:
+        function: La función compilada, con los atributos `nombres_variables`
+                  (variables en orden de parámetros) y `fuente` (su código).
+
+    Raises:
+        ValueError: Si el árbol está vacío o tiene un operador desconocido.
+    """
+    if raiz is None:
+        raise ValueError("El árbol está vacío.")
+
+    referencias = None
+    if compartido:
+        # Cuántas veces se alcanza cada nodo; los que se alcanzan más de una vez
+        # se guardan en una variable propia que la pila no sobrescribe
+        referencias = {}
+        pila = [raiz]
+        while pila:
+            nodo = pila.pop()
+            veces = referencias.get(nodo, 0)
+            referencias[nodo] = veces + 1
+            if veces == 0 and nodo.der is not None:
+                pila.append(nodo.der)
+                if nodo.izq is not None:
+                    pila.append(nodo.izq)
+
+    globales = {'__division_entre_cero': _division_entre_cero}
+    nucleos = {}  # (símbolo, aridad) -> nombre global de su núcleo
+    parametros = {}
+    lineas = []
+    guardados = {}
+    operandos = []  # Texto de cada posición de la pila postfija
+    pila = [(raiz, False)]
+    while pila:
+        nodo, visitado = pila.pop()
+        if referencias is not None and nodo in guardados:
+            operandos.append(guardados[nodo])
+            continue
+        if nodo.izq is None and nodo.der is None:
+            valor = nodo.valor
+            if isinstance(valor, str):
+                texto = parametros.get(valor)
+                if texto is None:
+                    texto = parametros[valor] = _nombre_parametro(valor, len(parametros))
+            elif (type(valor) is float and math.isfinite(valor)
+                  and math.copysign(1.0, valor) > 0):
+                texto = repr(valor)
+            else:
+                # Negativos, no finitos o complejos (de un árbol optimizado) no
+                # siempre se pueden escribir como literal sin paréntesis
+                texto = f"__k{len(globales)}"
+                globales[texto] = valor
+        elif not visitado:
+            pila.append((nodo, True))
+            pila.append((nodo.der, False))
+            if nodo.izq is not None:
+                pila.append((nodo.izq, False))
+            continue
+        elif nodo.izq is None:
+            if registro is None:
+                raise ValueError(f"Operador desconocido: {nodo.valor}")
+            nucleo = _nombre_nucleo(registro.unario(nodo.valor), globales, nucleos)
+            der = operandos.pop()
+            texto = f"__t{len(operandos)}"
+            lineas.append(f"{texto} = {nucleo}({der})")
+        else:
+            definicion = registro.binario(nodo.valor) if registro is not None else None
+            if definicion is None or definicion.basico:
+                if nodo.valor not in CODIGOS_OPERADOR:
+                    raise ValueError(f"Operador desconocido: {nodo.valor}")
+                der = operandos.pop()
+                izq = operandos.pop()
+                texto = f"__t{len(operandos)}"
+                if nodo.valor == '/':
+                    lineas.append(f"if {der} == 0: __division_entre_cero()")
+                lineas.append(f"{texto} = {izq} {_SIMBOLOS_PYTHON[nodo.valor]} {der}")
+            else:
+                nucleo = _nombre_nucleo(definicion, globales, nucleos)
+                der = operandos.pop()
+                izq = operandos.pop()
+                texto = f"__t{len(operandos)}"
+                lineas.append(f"{texto} = {nucleo}({izq}, {der})")
+        if referencias is not None and referencias[nodo] > 1:
+            guardado = f"__s{len(guardados)}"
+            lineas.append(f"{guardado} = {texto}")
+            guardados[nodo] = texto = guardado
+        operandos.append(texto)
+
+    lineas.append(f"return {operandos.pop()}")
+    fuente = (f"def expresion({', '.join(parametros.values())}):\n    "
+              + "\n    ".join(lineas) + "\n")
+    espacio = dict(globales)
+    exec(compile(fuente, "<expresion>", "exec"), espacio)
+    funcion = espacio['expresion']
+    funcion.nombres_variables = list(parametros)
+    funcion.fuente = fuente
+    return funcion
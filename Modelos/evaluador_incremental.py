@@ -0,0 +1,293 @@
+"""
+Reevaluación incremental del árbol de expresión
+"""
+import heapq
+import math
+from array import array
+
+SIN_PADRE = -1
+
+
+def _mismo_valor(anterior, nuevo):
+    """
+    Indica si un valor recalculado es idéntico al anterior, de modo que no hace
+    falta recalcular a los ancestros. El cero con signo se distingue (0.0 y -0.0
+    pueden dar resultados distintos más arriba), también en las partes de un
+    complejo, y los errores nunca se consideran iguales.
+    """
+    tipo = type(nuevo)
+    if type(anterior) is not tipo or isinstance(nuevo, ArithmeticError):
+        return False
+    if nuevo != anterior:
+        return False
+    if tipo is int:
+        return True
+    if tipo is float:
+        return nuevo != 0 or math.copysign(1.0, nuevo) == math.copysign(1.0, anterior)
+    return repr(nuevo) == repr(anterior)
+
+
+class EvaluadorIncremental:
+    """
+    Guarda el valor de cada subárbol y un índice de padres para que, al cambiar
+    una hoja o una variable, solo se recalculen sus ancestros: O(profundidad) en
+    lugar de volver a evaluar todo el árbol.
+
+    Cada nodo distinto recibe un índice en postorden, así que los hijos siempre
+    tienen un índice menor que sus padres. Los nodos pendientes se recalculan en
+    orden creciente de índice (con un montículo), lo que garantiza que un nodo
+    se recalcula una sola vez y después de todos sus hijos, también en árboles
+    con subárboles compartidos (varios padres). Si un nodo recalculado no cambia
+    de valor, sus ancestros no se tocan.
+
+    Los errores aritméticos (división entre cero, desbordamiento) se guardan como
+    el valor del subárbol y se propagan hacia arriba, de modo que una actualización
+    posterior puede corregirlos; `resultado()` los lanza.
+    """
+
+    def __init__(self, raiz, aplicar_operador, variables=None):
+        """
+        Evalúa el árbol completo una vez y construye los índices.
+
+        Args:
+            raiz (Nodo): La raíz del árbol.
+            aplicar_operador (func): Función (operador, izq, der) que calcula una operación.
+            variables (dict): Valores iniciales de las variables por nombre.
+
+        Raises:
+            ValueError: Si el árbol está vacío o falta el valor de alguna variable.
+        """
+        if raiz is None:
+            raise ValueError("El árbol está vacío.")
+        self._aplicar = aplicar_operador
+        self._indices = {}
+        self._operadores = []
+        self._izquierdos = array('i')
+        self._derechos = array('i')
+        self._padres = array('i')
+        self._otros_padres = {}  # Solo para nodos compartidos: índice -> más padres
+        self._valores = []
+        self._hojas_variable = {}
+        self.nodos_recalculados = 0
+
+        indices = self._indices
+        pila = [(raiz, False)]
+        while pila:
+            nodo, visitado = pila.pop()
+            if not visitado and nodo in indices:
+                continue
+            if nodo.izq is None and nodo.der is None:
+                valor = nodo.valor
+                indice = self._agregar(nodo, None, SIN_PADRE, SIN_PADRE)
+                if isinstance(valor, str):
+                    if variables is None or valor not in variables:
+                        raise ValueError(f"Variable sin valor: {valor}")
+                    self._hojas_variable.setdefault(valor, []).append(indice)
+                    valor = variables[valor]
+                self._valores.append(valor)
+            elif visitado:
+                izq = indices[nodo.izq]
+                der = indices[nodo.der]
+                indice = self._agregar(nodo, nodo.valor, izq, der)
+                self._enlazar(izq, indice)
+                if der != izq:
+                    self._enlazar(der, indice)
+                self._valores.append(self._calcular(indice))
+            else:
+                pila.append((nodo, True))
+                pila.append((nodo.der, False))
+                pila.append((nodo.izq, False))
+
+    def __len__(self):
+        return len(self._valores)
+
+    def _agregar(self, nodo, operador, izq, der):
+        """
+        Registra un nodo nuevo y devuelve su índice.
+        """
+        indice = len(self._operadores)
+        self._indices[nodo] = indice
+        self._operadores.append(operador)
+        self._izquierdos.append(izq)
+        self._derechos.append(der)
+        self._padres.append(SIN_PADRE)
+        return indice
+
+    def _enlazar(self, hijo, padre):
+        """
+        Agrega `padre` a los padres de `hijo`.
+        """
+        if self._padres[hijo] == SIN_PADRE:
+            self._padres[hijo] = padre
+        else:
+            self._otros_padres.setdefault(hijo, []).append(padre)
+
+    def _calcular(self, indice):
+        """
+        Calcula el valor de un nodo operador a partir de los valores de sus hijos.
+        """
+        izq_valor = self._valores[self._izquierdos[indice]]
+        if isinstance(izq_valor, ArithmeticError):
+            return izq_valor
+        der_valor = self._valores[self._derechos[indice]]
+        if isinstance(der_valor, ArithmeticError):
+            return der_valor
+        try:
+            return self._aplicar(self._operadores[indice], izq_valor, der_valor)
+        except ArithmeticError as e:
+            return e
+
+    def _propagar(self, hojas):
+        """
+        Recalcula los ancestros de las hojas modificadas, en orden de postorden.
+
+        Args:
+            hojas (list): Índices de las hojas cuyo valor cambió.
+        """
+        padres = self._padres
+        otros_padres = self._otros_padres
+        valores = self._valores
+        if len(hojas) == 1 and not otros_padres:
+            # Sin nodos compartidos, los ancestros son un solo camino hasta la raíz
+            recalculados = 0
+            indice = padres[hojas[0]]
+            while indice != SIN_PADRE:
+                nuevo = self._calcular(indice)
+                recalculados += 1
+                if _mismo_valor(valores[indice], nuevo):
+                    break
+                valores[indice] = nuevo
+                indice = padres[indice]
+            self.nodos_recalculados = recalculados
+            return
+
+        pendientes = []
+        en_cola = set()
+
+        def encolar(hijo):
+            padre = padres[hijo]
+            if padre == SIN_PADRE:
+                return
+            for padre in (padre, *otros_padres.get(hijo, ())):
+                if padre not in en_cola:
+                    en_cola.add(padre)
+                    heapq.heappush(pendientes, padre)
+
+        for hoja in hojas:
+            encolar(hoja)
+        recalculados = 0
+        while pendientes:
+            indice = heapq.heappop(pendientes)
+            nuevo = self._calcular(indice)
+            recalculados += 1
+            if _mismo_valor(valores[indice], nuevo):
+                continue
+            valores[indice] = nuevo
+            encolar(indice)
+        self.nodos_recalculados = recalculados
+
+    def resultado(self):
+        """
+        Devuelve el valor actual de la raíz.
+
+        Returns:
+            float: El resultado de evaluar la expresión.
+
+        Raises:
+            ZeroDivisionError: Si la expresión divide entre cero.
+            OverflowError: Si algún resultado intermedio se desborda.
+        """
+        valor = self._valores[-1]
+        if isinstance(valor, ArithmeticError):
+            raise valor.with_traceback(None)
+        return valor
+
+    def valor_de(self, nodo):
+        """
+        Devuelve el valor guardado de un subárbol, sin recalcular nada.
+
+        Args:
+            nodo (Nodo): La raíz del subárbol.
+
+        Returns:
+            float: El valor del subárbol.
+
+        Raises:
+            ValueError: Si el nodo no pertenece al árbol.
+            ArithmeticError: Si el subárbol produce un error al evaluarse.
+        """
+        indice = self._indices.get(nodo)
+        if indice is None:
+            raise ValueError("El nodo no pertenece al árbol.")
+        valor = self._valores[indice]
+        if isinstance(valor, ArithmeticError):
+            raise valor.with_traceback(None)
+        return valor
+
+    def actualizar_variable(self, nombre, valor):
+        """
+        Cambia el valor de una variable y recalcula solo los ancestros de sus hojas.
+
+        Args:
+            nombre (str): El nombre de la variable.
+            valor (float): Su nuevo valor.
+
+        Returns:
+            float: El nuevo resultado de la expresión.
+
+        Raises:
+            ValueError: Si la variable no aparece en el árbol.
+            ArithmeticError: Si la expresión produce un error con el nuevo valor.
+        """
+        hojas = self._hojas_variable.get(nombre)
+        if hojas is None:
+            raise ValueError(f"Variable desconocida: {nombre}")
+        for hoja in hojas:
+            self._valores[hoja] = valor
+        self._propagar(hojas)
+        return self.resultado()
+
+    def actualizar_hoja(self, nodo, valor):
+        """
+        Cambia el valor de una hoja numérica y recalcula solo sus ancestros. No
+        modifica el nodo; ver `ArbolDeExpresion.actualizar_hoja`.
+
+        Args:
+            nodo (Nodo): La hoja a cambiar.
+            valor (float): Su nuevo valor.
+
+        Returns:
+            float: El nuevo resultado de la expresión.
+
+        Raises:
+            ValueError: Si el nodo no pertenece al árbol, no es una hoja o es una variable.
+            ArithmeticError: Si la expresión produce un error con el nuevo valor.
+        """
+        indice = self._indices.get(nodo)
+        if indice is None:
+            raise ValueError("El nodo no pertenece al árbol.")
+        if self._operadores[indice] is not None:
+            raise ValueError("El nodo no es una hoja.")
+        if isinstance(nodo.valor, str):
+            raise ValueError(f"La hoja es la variable {nodo.valor}; use actualizar_variable.")
+        self._valores[indice] = valor
+        self._propagar([indice])
+        return self.resultado()
+
+    def barrer(self, nombre, valores):
+        """
+        Evalúa la expresión para cada valor de una variable (un análisis
+        "¿qué pasaría si...?"), recalculando solo lo que depende de ella.
+
+        Args:
+            nombre (str): La variable a variar.
+            valores (iterable): Los valores a probar.
+
+        Yields:
+            tuple: (valor de la variable, resultado o el error aritmético producido)
+        """
+        for valor in valores:
+            try:
+                yield valor, self.actualizar_variable(nombre, valor)
+            except ArithmeticError as e:
+                yield valor, e
@@ -0,0 +1,139 @@
+"""
+Analizador léxico de expresiones
+"""
+import re
+
+# Índices de los campos de cada token
+TIPO = 0
+TEXTO = 1
+VALOR = 2
+POSICION = 3
+
+# Tipos de token
+NUMERO = 'numero'
+VARIABLE = 'variable'
+OPERADOR = 'operador'
+ABRE = '('
+CIERRA = ')'
+COMA = ','
+INVALIDO = 'invalido'
+
+# Un solo patrón cubre todas las clases de token; el último grupo captura
+# cualquier carácter inválido para que nunca se descarte en silencio.
+_PATRON = re.compile(
+    r'\s+|(\d+\.?\d*|\.\d+)|([-+*/^])|(\()|(\))|([^\W\d]\w*)|(,)|(.)', re.DOTALL)
+_GRUPO_NUMERO = 1
+_GRUPO_OPERADOR = 2
+_GRUPO_ABRE = 3
+_GRUPO_CIERRA = 4
+_GRUPO_VARIABLE = 5
+_TIPOS = (None, NUMERO, OPERADOR, ABRE, CIERRA, VARIABLE, COMA, INVALIDO)
+
+
+class ErrorLexico(ValueError):
+    """
+    Error encontrado al analizar una expresión. Indica la posición exacta
+    (desplazamiento desde 0) del primer carácter problemático.
+    """
+
+    def __init__(self, mensaje, posicion):
+        super().__init__(f"{mensaje} (columna {posicion + 1})")
+        self.posicion = posicion
+
+
+def escanear(expresion, inicio=0):
+    """
+    Produce los tokens de la expresión a partir de `inicio` sin validar su orden
+    ni el balance de paréntesis; las comas (que separan los argumentos de las
+    funciones del analizador Pratt) se producen como tokens `COMA` y los demás
+    caracteres no reconocidos como tokens de tipo `INVALIDO`. Como cada token
+    depende solo del texto desde su inicio, el análisis incremental puede volver
+    a escanear únicamente la zona editada.
+
+    Args:
+        expresion (str): La expresión aritmética a escanear.
+        inicio (int): Desplazamiento desde el que se empieza a escanear.
+
+    Yields:
+        tuple: Los tokens (tipo, texto, valor, posicion), igual que `tokenizar`.
+    """
+    for coincidencia in _PATRON.finditer(expresion, inicio):
+        grupo = coincidencia.lastindex
+        if grupo is None:
+            continue  # Espacios en blanco
+        texto = coincidencia.group()
+        tipo = _TIPOS[grupo]
+        yield (tipo, texto, float(texto) if tipo == NUMERO else texto,
+               coincidencia.start())
+
+
+def tokenizar(expresion):
+    """
+    Analiza la expresión en una sola pasada: valida los caracteres, verifica el
+    balance de paréntesis y el orden de operandos y operadores, convierte los
+    números a float y produce los tokens a medida que los encuentra.
+
+    Cada token es una tupla (tipo, texto, valor, posicion): el tipo es una de las
+    constantes del módulo, el valor es el float ya convertido para los números
+    (el nombre para las variables y el propio símbolo en los demás casos) y la
+    posición es el desplazamiento del token en la expresión. Se usan tuplas
+    porque crearlas cuesta mucho menos que instanciar una clase por token.
+
+    Args:
+        expresion (str): La expresión aritmética a analizar.
+
+    Yields:
+        tuple: Los tokens de la expresión en orden.
+
+    Raises:
+        ErrorLexico: En el primer error encontrado, con su columna.
+    """
+    aperturas = []  # Posiciones de los paréntesis abiertos sin cerrar
+    espera_operando = True
+    for coincidencia in _PATRON.finditer(expresion):
+        grupo = coincidencia.lastindex
+        if grupo is None:
+            continue  # Espacios en blanco
+        posicion = coincidencia.start()
+        texto = coincidencia.group()
+        if grupo == _GRUPO_NUMERO:
+            if not espera_operando:
+                raise ErrorLexico(
+                    f"Se esperaba un operador antes de '{texto}'", posicion)
+            espera_operando = False
+            yield (NUMERO, texto, float(texto), posicion)
+        elif grupo == _GRUPO_OPERADOR:
+            if espera_operando:
+                raise ErrorLexico(
+                    f"Se esperaba un número o '(' antes de '{texto}'", posicion)
+            espera_operando = True
+            yield (OPERADOR, texto, texto, posicion)
+        elif grupo == _GRUPO_ABRE:
+            if not espera_operando:
+                raise ErrorLexico(
+                    "Se esperaba un operador antes de '('", posicion)
+            aperturas.append(posicion)
+            yield (ABRE, texto, texto, posicion)
+        elif grupo == _GRUPO_CIERRA:
+            if not aperturas:
+                raise ErrorLexico(
+                    "Paréntesis de cierre sin apertura", posicion)
+            if espera_operando:
+                raise ErrorLexico(
+                    "Se esperaba un número o '(' antes de ')'", posicion)
+            aperturas.pop()
+            yield (CIERRA, texto, texto, posicion)
+        elif grupo == _GRUPO_VARIABLE:
+            if not espera_operando:
+                raise ErrorLexico(
+                    f"Se esperaba un operador antes de '{texto}'", posicion)
+            espera_operando = False
+            yield (VARIABLE, texto, texto, posicion)
+        else:
+            # Incluye la coma: esta gramática no tiene funciones
+            raise ErrorLexico(f"Carácter inválido '{texto}'", posicion)
+
+    if aperturas:
+        raise ErrorLexico("Paréntesis sin cerrar", aperturas[0])
+    if espera_operando:
+        raise ErrorLexico("Expresión incompleta", len(expresion))
@@ -0,0 +1,229 @@
+"""
+Índice de métricas del árbol de expresión
+"""
+
+SIN_HIJO = -1
+_COMPLETAR = object()  # Marca en la pila: el nodo de abajo ya tiene sus hijos
+
+
+def _contar(cantidad, palabra):
+    """
+    Devuelve la cantidad seguida de la palabra, en plural si no es 1.
+    """
+    return f"{cantidad} {palabra}" if cantidad == 1 else f"{cantidad} {palabra}s"
+
+
+class IndiceMetricas:
+    """
+    Tamaño, altura, hojas y profundidad de cada nodo, e histograma de operadores
+    de todo el árbol, calculados una sola vez para que el layout, el presupuesto
+    de evaluación y la interfaz los consulten en O(1) en lugar de volver a
+    recorrer el árbol.
+
+    Cada nodo distinto recibe un índice en postorden (los hijos antes que sus
+    padres) y sus métricas se guardan en listas paralelas. En un árbol con
+    subárboles compartidos (un DAG), el tamaño y las hojas cuentan cada
+    aparición, igual que los recorridos y el layout; la profundidad es la menor
+    de todas sus apariciones y el histograma también cuenta cada aparición.
+    """
+
+    __slots__ = ('raiz', '_indices', 'tamanos', 'alturas', 'hojas_subarbol',
+                 'profundidades', 'histograma')
+
+    def __init__(self, raiz):
+        """
+        Calcula las métricas con una pasada en postorden (tamaño, altura y hojas)
+        y otra sobre los índices en orden inverso (profundidad y apariciones de
+        cada operador). Ambas son iterativas.
+
+        Args:
+            raiz (Nodo): La raíz del árbol; puede ser None.
+        """
+        self.raiz = raiz
+        self._indices = indices = {}
+        # Listas y no arreglos: agregar a una lista es bastante más rápido
+        self.tamanos = tamanos = []
+        self.alturas = alturas = []
+        self.hojas_subarbol = hojas = []
+        izquierdos = []
+        derechos = []
+        agregar_tamano = tamanos.append
+        agregar_altura = alturas.append
+        agregar_hojas = hojas.append
+        agregar_izquierdo = izquierdos.append
+        agregar_derecho = derechos.append
+        # Un operador se apila dos veces: debajo de _COMPLETAR para calcularlo
+        # cuando sus hijos (apilados encima) ya tengan índice
+        pila = [raiz] if raiz is not None else []
+        apilar = pila.append
+        while pila:
+            nodo = pila.pop()
+            if nodo is _COMPLETAR:
+                nodo = pila.pop()
+                izq = nodo.izq
+                hijo_der = indices[nodo.der]
+                tamano = tamanos[hijo_der] + 1
+                altura = alturas[hijo_der] + 1
+                hojas_nodo = hojas[hijo_der]
+                if izq is None:
+                    hijo_izq = SIN_HIJO
+                else:
+                    hijo_izq = indices[izq]
+                    tamano += tamanos[hijo_izq]
+                    if alturas[hijo_izq] >= altura:
+                        altura = alturas[hijo_izq] + 1
+                    hojas_nodo += hojas[hijo_izq]
+                indices[nodo] = len(tamanos)
+                agregar_tamano(tamano)
+                agregar_altura(altura)
+                agregar_hojas(hojas_nodo)
+                agregar_izquierdo(hijo_izq)
+                agregar_derecho(hijo_der)
+            elif nodo not in indices:
+                izq = nodo.izq
+                der = nodo.der
+                if izq is None and der is None:
+                    indices[nodo] = len(tamanos)
+                    agregar_tamano(1)
+                    agregar_altura(0)
+                    agregar_hojas(1)
+                    agregar_izquierdo(SIN_HIJO)
+                    agregar_derecho(SIN_HIJO)
+                    continue
+                apilar(nodo)
+                apilar(_COMPLETAR)
+                apilar(der)
+                if izq is not None:
+                    apilar(izq)
+
+        # Los padres tienen índices mayores: de la raíz hacia abajo se conoce la
+        # menor profundidad y cuántas veces aparece cada nodo en el árbol expandido
+        total = len(tamanos)
+        self.profundidades = profundidades = [total] * total
+        apariciones = [0] * total
+        valores = list(indices)
+        histograma = {}
+        if total:
+            profundidades[total - 1] = 0
+            apariciones[total - 1] = 1
+        for indice in range(total - 1, -1, -1):
+            hijo_izq = izquierdos[indice]
+            hijo_der = derechos[indice]
+            if hijo_izq == SIN_HIJO and hijo_der == SIN_HIJO:
+                continue
+            operador = valores[indice].valor
+            histograma[operador] = histograma.get(operador, 0) + apariciones[indice]
+            profundidad = profundidades[indice] + 1
+            for hijo in (hijo_izq, hijo_der):
+                if hijo != SIN_HIJO:
+                    apariciones[hijo] += apariciones[indice]
+                    if profundidad < profundidades[hijo]:
+                        profundidades[hijo] = profundidad
+        self.histograma = histograma
+
+    def __len__(self):
+        """
+        Devuelve el número de nodos distintos (los compartidos una vez).
+        """
+        return len(self.tamanos)
+
+    def _indice(self, nodo):
+        """
+        Devuelve el índice de un nodo, o el de la raíz si `nodo` es None.
+
+        Raises:
+            ValueError: Si el árbol está vacío o el nodo no pertenece a él.
+        """
+        if nodo is None:
+            nodo = self.raiz
+        indice = self._indices.get(nodo) if nodo is not None else None
+        if indice is None:
+            raise ValueError("El nodo no pertenece al árbol.")
+        return indice
+
+    def tamano(self, nodo=None):
+        """
+        Devuelve el número de nodos del subárbol, contando cada aparición de los
+        subárboles compartidos.
+
+        Args:
+            nodo (Nodo): La raíz del subárbol; por omisión, la del árbol.
+        """
+        return self.tamanos[self._indice(nodo)]
+
+    def altura(self, nodo=None):
+        """
+        Devuelve la altura del subárbol (0 para una hoja).
+
+        Args:
+            nodo (Nodo): La raíz del subárbol; por omisión, la del árbol.
+        """
+        return self.alturas[self._indice(nodo)]
+
+    def hojas(self, nodo=None):
+        """
+        Devuelve el número de hojas del subárbol, contando cada aparición.
+
+        Args:
+            nodo (Nodo): La raíz del subárbol; por omisión, la del árbol.
+        """
+        return self.hojas_subarbol[self._indice(nodo)]
+
+    def profundidad(self, nodo):
+        """
+        Devuelve la distancia del nodo a la raíz; si el nodo está compartido,
+        la menor de sus apariciones.
+
+        Args:
+            nodo (Nodo): Un nodo del árbol.
+        """
+        return self.profundidades[self._indice(nodo)]
+
+    @property
+    def nodos(self):
+        """
+        Número de nodos del árbol expandido (0 si está vacío).
+        """
+        return self.tamanos[-1] if self.tamanos else 0
+
+    @property
+    def operadores(self):
+        """
+        Número de operadores y funciones del árbol expandido.
+        """
+        return sum(self.histograma.values())
+
+    def como_dict(self):
+        """
+        Devuelve las métricas del árbol completo en un diccionario serializable a JSON.
+
+        Returns:
+            dict: 'nodos', 'nodos_unicos', 'altura', 'hojas' e 'histograma'.
+        """
+        vacio = not self.tamanos
+        return {
+            'nodos': self.nodos,
+            'nodos_unicos': len(self),
+            'altura': 0 if vacio else self.alturas[-1],
+            'hojas': 0 if vacio else self.hojas_subarbol[-1],
+            'histograma': dict(sorted(self.histograma.items())),
+        }
+
+    def resumen(self):
+        """
+        Devuelve una línea con las métricas del árbol para mostrar en la interfaz.
+
+        Returns:
+            str: Por ejemplo "7 nodos · altura 2 · 4 hojas · *: 2, +: 1".
+        """
+        datos = self.como_dict()
+        partes = [_contar(datos['nodos'], "nodo")]
+        if datos['nodos_unicos'] != datos['nodos']:
+            partes.append(_contar(datos['nodos_unicos'], "distinto"))
+        partes.append(f"altura {datos['altura']}")
+        partes.append(_contar(datos['hojas'], "hoja"))
+        operadores = sorted(self.histograma.items(), key=lambda par: (-par[1], par[0]))
+        if operadores:
+            partes.append(", ".join(f"{operador}: {cantidad}"
+                                    for operador, cantidad in operadores))
+        return " · ".join(partes)
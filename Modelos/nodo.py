@@ -8,6 +8,8 @@ class Nodo:
     Entity Nodo del arbol 
     """
 
+    __slots__ = ('valor', 'izq', 'der')
+
     def __init__(self, valor):
         self.valor = valor
         self.izq = None
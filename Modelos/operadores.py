@@ -0,0 +1,273 @@
+"""
+Registro de operadores y funciones para el analizador Pratt
+"""
+import math
+
+IZQUIERDA = 'izquierda'
+DERECHA = 'derecha'
+
+INFIJO = 'infijo'
+PREFIJO = 'prefijo'
+FUNCION = 'funcion'
+
+
+def _sumar(izq, der):
+    return izq + der
+
+
+def _restar(izq, der):
+    return izq - der
+
+
+def _multiplicar(izq, der):
+    return izq * der
+
+
+def _dividir(izq, der):
+    if der == 0:
+        raise ZeroDivisionError("Error: División entre cero.")
+    return izq / der
+
+
+def _potencia(izq, der):
+    return izq ** der
+
+
+def _negar(valor):
+    return -valor
+
+
+def _identidad(valor):
+    return +valor
+
+
+# Núcleos con la misma semántica que `ArbolDeExpresion.aplicar_operador`: un
+# árbol que solo usa estos operadores se puede compilar, optimizar y guardar
+_NUCLEOS_BASICOS = {'+': _sumar, '-': _restar, '*': _multiplicar, '/': _dividir,
+                    '^': _potencia}
+
+
+class DefinicionOperador:
+    """
+    Una entrada del registro: cómo se analiza un operador o una función y cómo
+    se evalúa. Las precedencias se traducen a "potencias de enlace" del
+    analizador Pratt: un operador infijo toma el operando de su izquierda si su
+    potencia izquierda supera el mínimo vigente, y analiza el de su derecha con
+    su potencia derecha como nuevo mínimo (una menos para asociar a la derecha).
+    """
+
+    __slots__ = ('simbolo', 'tipo', 'precedencia', 'asociatividad', 'aridad',
+                 'variadica', 'nucleo', 'basico', 'potencia_izquierda',
+                 'potencia_derecha')
+
+    def __init__(self, simbolo, tipo, precedencia, asociatividad, aridad, variadica, nucleo):
+        self.simbolo = simbolo
+        self.tipo = tipo
+        self.precedencia = precedencia
+        self.asociatividad = asociatividad
+        self.aridad = aridad
+        self.variadica = variadica
+        self.nucleo = nucleo
+        self.basico = tipo == INFIJO and _NUCLEOS_BASICOS.get(simbolo) is nucleo
+        self.potencia_izquierda = 2 * precedencia
+        self.potencia_derecha = 2 * precedencia - (asociatividad == DERECHA)
+
+    def __repr__(self):
+        return (f"DefinicionOperador({self.simbolo!r}, {self.tipo}, "
+                f"precedencia={self.precedencia}, aridad={self.aridad})")
+
+
+class RegistroOperadores:
+    """
+    Tabla de operadores infijos, operadores prefijos y funciones que usa el
+    analizador Pratt. Cada entrada declara su precedencia, asociatividad,
+    aridad y el núcleo (una función de Python) que la evalúa, así que agregar
+    un operador o una función no requiere tocar el analizador ni el evaluador:
+
+        registro = RegistroOperadores.estandar()
+        registro.funcion('hypot', 2, math.hypot)
+        registro.infijo('%', 2, math.fmod)
+
+    Los operadores son de un solo carácter (el analizador léxico entrega los
+    caracteres que no reconoce como tokens inválidos y el analizador Pratt los
+    acepta si están registrados); las funciones son identificadores y tienen
+    prioridad sobre las variables del mismo nombre.
+    """
+
+    def __init__(self):
+        """
+        Crea un registro vacío; ver `estandar` para el de uso habitual.
+        """
+        self.infijos = {}
+        self.prefijos = {}
+        self.funciones = {}
+
+    @classmethod
+    def estandar(cls):
+        """
+        Crea un registro con + - * / (a la izquierda), ^ (a la derecha y más
+        fuerte que el menos unario, así -2^2 = -4), + y - prefijos, y las
+        funciones sqrt, abs, max y min (estas dos con cualquier número de argumentos).
+
+        Returns:
+            RegistroOperadores: Un registro nuevo, que se puede extender sin
+                                afectar a los demás.
+        """
+        registro = cls()
+        registro.infijo('+', 1, _sumar)
+        registro.infijo('-', 1, _restar)
+        registro.infijo('*', 2, _multiplicar)
+        registro.infijo('/', 2, _dividir)
+        registro.prefijo('-', 3, _negar)
+        registro.prefijo('+', 3, _identidad)
+        registro.infijo('^', 4, _potencia, DERECHA)
+        registro.funcion('sqrt', 1, math.sqrt)
+        registro.funcion('abs', 1, abs)
+        registro.funcion('max', 2, max, variadica=True)
+        registro.funcion('min', 2, min, variadica=True)
+        return registro
+
+    def copiar(self):
+        """
+        Devuelve un registro nuevo con las mismas entradas.
+
+        Returns:
+            RegistroOperadores: La copia.
+        """
+        copia = RegistroOperadores()
+        copia.infijos = dict(self.infijos)
+        copia.prefijos = dict(self.prefijos)
+        copia.funciones = dict(self.funciones)
+        return copia
+
+    def infijo(self, simbolo, precedencia, nucleo, asociatividad=IZQUIERDA):
+        """
+        Registra (o reemplaza) un operador binario infijo.
+
+        Args:
+            simbolo (str): Un carácter que no sea letra, dígito, espacio, paréntesis ni coma.
+            precedencia (int): Mayor que cero; los operadores con más precedencia
+                               se aplican primero.
+            nucleo (func): Función (izq, der) que calcula la operación.
+            asociatividad (str): `IZQUIERDA` o `DERECHA`.
+
+        Returns:
+            DefinicionOperador: La entrada registrada.
+
+        Raises:
+            ValueError: Si el símbolo, la precedencia o la asociatividad no son válidos.
+        """
+        self._validar_simbolo(simbolo)
+        if asociatividad not in (IZQUIERDA, DERECHA):
+            raise ValueError(f"Asociatividad desconocida: {asociatividad}")
+        definicion = DefinicionOperador(simbolo, INFIJO, self._validar_precedencia(precedencia),
+                                        asociatividad, 2, False, nucleo)
+        self.infijos[simbolo] = definicion
+        return definicion
+
+    def prefijo(self, simbolo, precedencia, nucleo):
+        """
+        Registra (o reemplaza) un operador unario prefijo. Su operando se analiza
+        con la precedencia dada: los operadores de mayor precedencia quedan dentro
+        del operando y los demás se aplican al resultado.
+
+        Args:
+            simbolo (str): Un carácter que no sea letra, dígito, espacio, paréntesis ni coma.
+            precedencia (int): Mayor que cero.
+            nucleo (func): Función (valor) que calcula la operación.
+
+        Returns:
+            DefinicionOperador: La entrada registrada.
+
+        Raises:
+            ValueError: Si el símbolo o la precedencia no son válidos.
+        """
+        self._validar_simbolo(simbolo)
+        definicion = DefinicionOperador(simbolo, PREFIJO, self._validar_precedencia(precedencia),
+                                        DERECHA, 1, False, nucleo)
+        self.prefijos[simbolo] = definicion
+        return definicion
+
+    def funcion(self, nombre, aridad, nucleo, variadica=False):
+        """
+        Registra (o reemplaza) una función que se escribe `nombre(a, b, ...)`.
+
+        Args:
+            nombre (str): Un identificador.
+            aridad (int): 1 o 2 argumentos.
+            nucleo (func): Función que recibe los argumentos y calcula el resultado.
+            variadica (bool): Solo con aridad 2: acepta uno o más argumentos y los
+                              combina de izquierda a derecha, f(f(a, b), c), lo
+                              que es correcto para funciones asociativas como max.
+
+        Returns:
+            DefinicionOperador: La entrada registrada.
+
+        Raises:
+            ValueError: Si el nombre o la aridad no son válidos.
+        """
+        if not nombre.isidentifier():
+            raise ValueError(f"Nombre de función inválido: {nombre!r}")
+        if aridad not in (1, 2) or (variadica and aridad != 2):
+            raise ValueError(f"Aridad no soportada para {nombre}: {aridad}")
+        definicion = DefinicionOperador(nombre, FUNCION, 0, IZQUIERDA, aridad, variadica, nucleo)
+        self.funciones[nombre] = definicion
+        return definicion
+
+    def _validar_simbolo(self, simbolo):
+        if (not isinstance(simbolo, str) or len(simbolo) != 1 or simbolo.isspace()
+                or simbolo.isalnum() or simbolo == '_' or simbolo in '(),.'):
+            raise ValueError(f"Símbolo de operador inválido: {simbolo!r}")
+
+    def _validar_precedencia(self, precedencia):
+        if not isinstance(precedencia, int) or precedencia < 1:
+            raise ValueError(f"La precedencia debe ser un entero mayor que cero: {precedencia!r}")
+        return precedencia
+
+    def binario(self, simbolo):
+        """
+        Devuelve la entrada de un nodo con dos hijos: un operador infijo o una
+        función de dos argumentos.
+
+        Raises:
+            ValueError: Si el símbolo no está registrado.
+        """
+        definicion = self.infijos.get(simbolo)
+        if definicion is None:
+            definicion = self.funciones.get(simbolo)
+            if definicion is None or definicion.aridad != 2:
+                raise ValueError(f"Operador desconocido: {simbolo}")
+        return definicion
+
+    def unario(self, simbolo):
+        """
+        Devuelve la entrada de un nodo con un solo hijo (el derecho): un operador
+        prefijo o una función de un argumento.
+
+        Raises:
+            ValueError: Si el símbolo no está registrado.
+        """
+        definicion = self.prefijos.get(simbolo)
+        if definicion is None:
+            definicion = self.funciones.get(simbolo)
+            if definicion is None or definicion.aridad != 1:
+                raise ValueError(f"Operador desconocido: {simbolo}")
+        return definicion
+
+    def aplicar_binario(self, simbolo, izq_valor, der_valor):
+        """
+        Evalúa un nodo con dos hijos con el núcleo registrado.
+
+        Raises:
+            ValueError: Si el símbolo no está registrado.
+        """
+        return self.binario(simbolo).nucleo(izq_valor, der_valor)
+
+    def aplicar_unario(self, simbolo, valor):
+        """
+        Evalúa un nodo con un solo hijo con el núcleo registrado.
+
+        Raises:
+            ValueError: Si el símbolo no está registrado.
+        """
+        return self.unario(simbolo).nucleo(valor)
@@ -0,0 +1,139 @@
+"""
+Optimizador del árbol de expresión
+"""
+from Modelos.nodo import Nodo
+
+
+class ReporteOptimizacion:
+    """
+    Resumen de una pasada de optimización sobre un árbol.
+    """
+
+    __slots__ = ('nodos_antes', 'nodos_despues', 'constantes_plegadas',
+                 'identidades_aplicadas')
+
+    def __init__(self):
+        self.nodos_antes = 0
+        self.nodos_despues = 0
+        self.constantes_plegadas = 0
+        self.identidades_aplicadas = 0
+
+    @property
+    def nodos_eliminados(self):
+        return self.nodos_antes - self.nodos_despues
+
+    def __repr__(self):
+        return (f"ReporteOptimizacion(nodos_antes={self.nodos_antes}, "
+                f"nodos_despues={self.nodos_despues}, "
+                f"constantes_plegadas={self.constantes_plegadas}, "
+                f"identidades_aplicadas={self.identidades_aplicadas})")
+
+
+def _es_constante(nodo):
+    """
+    Indica si el nodo es una hoja numérica (no una variable).
+    """
+    return nodo.izq is None and nodo.der is None and not isinstance(nodo.valor, str)
+
+
+def _identidad(operador, izq, der):
+    """
+    Devuelve el operando que queda al aplicar una identidad segura, o None.
+    Solo se consideran x*1, 1*x, x+0, 0+x, x-0, x/1 y x^1.
+    """
+    if _es_constante(der):
+        if ((operador == '*' or operador == '/' or operador == '^') and der.valor == 1
+                or (operador == '+' or operador == '-') and der.valor == 0):
+            return izq
+    if _es_constante(izq):
+        if (operador == '*' and izq.valor == 1
+                or operador == '+' and izq.valor == 0):
+            return der
+    return None
+
+
+def contar_nodos(raiz):
+    """
+    Cuenta los nodos distintos alcanzables desde la raíz (los compartidos una vez).
+
+    Args:
+        raiz (Nodo): La raíz del árbol.
+
+    Returns:
+        int: El número de nodos.
+    """
+    vistos = set()
+    pila = [raiz] if raiz is not None else []
+    while pila:
+        nodo = pila.pop()
+        if nodo in vistos:
+            continue
+        vistos.add(nodo)
+        if nodo.izq is not None:
+            pila.append(nodo.izq)
+        if nodo.der is not None:
+            pila.append(nodo.der)
+    return len(vistos)
+
+
+def optimizar(raiz, aplicar_operador):
+    """
+    Pliega los subárboles constantes y aplica identidades algebraicas seguras.
+    Nunca pliega una operación que al evaluarse lanzaría un error (por ejemplo una
+    división entre cero) ni una que no produce un número real, de modo que el árbol
+    resultante se evalúa igual que el original. El árbol original no se modifica y
+    los subárboles compartidos siguen compartidos.
+
+    Args:
+        raiz (Nodo): La raíz del árbol a optimizar.
+        aplicar_operador (callable): Función (operador, izq, der) -> valor.
+
+    Returns:
+        tuple: (nueva raíz, ReporteOptimizacion)
+    """
+    reporte = ReporteOptimizacion()
+    if raiz is None:
+        return None, reporte
+    reporte.nodos_antes = contar_nodos(raiz)
+
+    nuevos = {}  # Nodo original -> nodo optimizado
+    pila = [(raiz, False)]
+    while pila:
+        nodo, visitado = pila.pop()
+        if nodo in nuevos:
+            continue
+        if nodo.izq is None and nodo.der is None:
+            nuevos[nodo] = Nodo(nodo.valor)
+            continue
+        if not visitado:
+            pila.append((nodo, True))
+            pila.append((nodo.der, False))
+            pila.append((nodo.izq, False))
+            continue
+
+        izq = nuevos[nodo.izq]
+        der = nuevos[nodo.der]
+        if _es_constante(izq) and _es_constante(der):
+            try:
+                valor = aplicar_operador(nodo.valor, izq.valor, der.valor)
+            except (ArithmeticError, ValueError):
+                valor = None
+            if isinstance(valor, float):
+                nuevos[nodo] = Nodo(valor)
+                reporte.constantes_plegadas += 1
+                continue
+
+        restante = _identidad(nodo.valor, izq, der)
+        if restante is not None:
+            nuevos[nodo] = restante
+            reporte.identidades_aplicadas += 1
+            continue
+
+        nuevo = Nodo(nodo.valor)
+        nuevo.izq = izq
+        nuevo.der = der
+        nuevos[nodo] = nuevo
+
+    nueva_raiz = nuevos[raiz]
+    reporte.nodos_despues = contar_nodos(nueva_raiz)
+    return nueva_raiz, reporte
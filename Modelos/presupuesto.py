@@ -0,0 +1,240 @@
+"""
+Evaluación con presupuesto de recursos
+"""
+import math
+import time
+
+NODOS = 'nodos'
+MAGNITUD = 'magnitud'
+EXPONENTE = 'exponente'
+TIEMPO = 'tiempo'
+
+
+class PresupuestoExcedido(ValueError):
+    """
+    Error lanzado cuando una evaluación supera alguno de los límites de su
+    `PresupuestoEvaluacion`. Además del mensaje, indica qué límite se superó,
+    cuál era y el valor (medido o previsto) que lo superó.
+    """
+
+    def __init__(self, limite, maximo, valor, operador=None, previsto=False):
+        """
+        Args:
+            limite (str): `NODOS`, `MAGNITUD`, `EXPONENTE` o `TIEMPO`.
+            maximo (float): El valor máximo permitido.
+            valor (float): El valor que lo superó; para la magnitud prevista de
+                           una potencia, su logaritmo en base 10.
+            operador (str): El operador que se estaba aplicando, si corresponde.
+            previsto (bool): True si el límite se detectó antes de calcular.
+        """
+        self.limite = limite
+        self.maximo = maximo
+        self.valor = valor
+        self.operador = operador
+        self.previsto = previsto
+        super().__init__(self._mensaje())
+
+    def _mensaje(self):
+        if self.limite == NODOS:
+            if self.previsto:
+                return (f"Presupuesto excedido: el árbol tiene {self.valor} nodos, más que "
+                        f"el máximo de {self.maximo}.")
+            return f"Presupuesto excedido: más de {self.maximo} nodos evaluados."
+        if self.limite == TIEMPO:
+            return f"Presupuesto excedido: la evaluación superó {self.maximo:g} s."
+        if self.limite == EXPONENTE:
+            return (f"Presupuesto excedido: el exponente {_formatear(self.valor)} supera el "
+                    f"máximo de {self.maximo:g}.")
+        if self.previsto:
+            return (f"Presupuesto excedido: '{self.operador}' daría un resultado de "
+                    f"~1e{self.valor:.0f}, mayor que {self.maximo:g}.")
+        return (f"Presupuesto excedido: un resultado intermedio supera la magnitud "
+                f"máxima de {self.maximo:g}.")
+
+    def como_dict(self):
+        """
+        Devuelve los datos del error en un diccionario serializable a JSON.
+
+        Returns:
+            dict: 'limite', 'maximo', 'valor', 'operador' y 'previsto'.
+        """
+        valor = self.valor
+        if isinstance(valor, complex):
+            valor = abs(valor)
+        try:
+            valor = float(valor)
+        except OverflowError:
+            valor = math.inf if valor > 0 else -math.inf
+        return {'limite': self.limite, 'maximo': self.maximo, 'valor': valor,
+                'operador': self.operador, 'previsto': self.previsto}
+
+
+def _formatear(valor):
+    """
+    Formatea un valor para un mensaje, incluso un entero demasiado grande para un float.
+    """
+    try:
+        return f"{valor:g}"
+    except OverflowError:
+        return f"~1e{math.log10(abs(valor)):.0f}"
+
+
+def _log10_potencia(base, exponente):
+    """
+    Estima log10(|base ** exponente|) sin calcular la potencia.
+
+    Returns:
+        float: El logaritmo estimado (puede ser inf o -inf).
+    """
+    magnitud = abs(base)
+    if magnitud == 0 or magnitud == 1:
+        return 0.0
+    if isinstance(exponente, complex):
+        exponente = exponente.real
+    try:
+        return float(exponente) * math.log10(magnitud)
+    except OverflowError:
+        # Un exponente entero demasiado grande para un float
+        return math.copysign(math.inf, exponente) * math.copysign(1.0, magnitud - 1)
+
+
+class PresupuestoEvaluacion:
+    """
+    Límites de recursos para evaluar un árbol. Cualquier límite en None no se
+    aplica. El presupuesto no guarda estado: el plazo se cuenta desde el
+    comienzo de cada evaluación y se puede reutilizar entre hilos y procesos.
+
+    Las potencias se revisan antes de calcularlas: si el logaritmo del resultado
+    ya supera `max_magnitud`, la evaluación se aborta sin intentarlo, que es lo
+    que evita que una potencia de enteros enormes bloquee el proceso. Las demás
+    operaciones se revisan al terminar cada una.
+    """
+
+    __slots__ = ('max_nodos', 'max_magnitud', 'max_exponente', 'limite_segundos',
+                 'intervalo_reloj')
+
+    def __init__(self, max_nodos=None, max_magnitud=None, max_exponente=None,
+                 limite_segundos=None, intervalo_reloj=256):
+        """
+        Args:
+            max_nodos (int): Número máximo de nodos evaluados (contando cada vez
+                             que se reutiliza un subárbol compartido).
+            max_magnitud (float): Valor absoluto máximo de cualquier resultado
+                                  intermedio.
+            max_exponente (float): Valor absoluto máximo del exponente de `^`.
+            limite_segundos (float): Tiempo máximo de la evaluación.
+            intervalo_reloj (int): Cada cuántos nodos se consulta el reloj.
+        """
+        self.max_nodos = max_nodos
+        self.max_magnitud = max_magnitud
+        self.max_exponente = max_exponente
+        self.limite_segundos = limite_segundos
+        self.intervalo_reloj = intervalo_reloj
+
+    def __repr__(self):
+        return (f"PresupuestoEvaluacion(max_nodos={self.max_nodos}, "
+                f"max_magnitud={self.max_magnitud}, max_exponente={self.max_exponente}, "
+                f"limite_segundos={self.limite_segundos})")
+
+    def revisar_potencia(self, base, exponente):
+        """
+        Comprueba, antes de calcularla, que `base ** exponente` cabe en el presupuesto.
+
+        Raises:
+            PresupuestoExcedido: Si el exponente o la magnitud prevista lo superan.
+        """
+        if self.max_exponente is not None and abs(exponente) > self.max_exponente:
+            raise PresupuestoExcedido(EXPONENTE, self.max_exponente, exponente, '^', True)
+        if self.max_magnitud is not None:
+            logaritmo = _log10_potencia(base, exponente)
+            if logaritmo > math.log10(self.max_magnitud):
+                raise PresupuestoExcedido(MAGNITUD, self.max_magnitud, logaritmo, '^', True)
+
+
+def evaluar_con_presupuesto(raiz, presupuesto, aplicar_operador, variables=None,
+                            compartido=False, aplicar_unario=None, nodos=None):
+    """
+    Evalúa un árbol igual que `ArbolDeExpresion.evaluar_arbol`, pero abortando en
+    cuanto se supera algún límite del presupuesto.
+
+    Args:
+        raiz (Nodo): La raíz del árbol o subárbol a evaluar.
+        presupuesto (PresupuestoEvaluacion): Los límites a respetar.
+        aplicar_operador (func): Función (operador, izq, der) que calcula una operación.
+        variables (dict): Valores de las variables por nombre.
+        compartido (bool): Si el árbol comparte subárboles, que se evalúan una vez.
+        aplicar_unario (func): Función (operador, valor) para los nodos con un solo
+                               hijo (operadores unarios y funciones del registro).
+        nodos (int): Tamaño del árbol si ya se conoce (ver `IndiceMetricas`). Si
+                     cabe en `max_nodos` no se cuentan los nodos; si no cabe y
+                     el árbol no comparte subárboles, se rechaza sin evaluarlo.
+
+    Returns:
+        float: El resultado de evaluar la expresión.
+
+    Raises:
+        PresupuestoExcedido: Si se supera algún límite.
+        ZeroDivisionError: Si se intenta realizar una división por cero.
+        ValueError: Si se encuentra un operador desconocido o una variable sin valor.
+    """
+    max_nodos = presupuesto.max_nodos
+    if max_nodos is not None and nodos is not None:
+        # Cada nodo se evalúa a lo sumo una vez por aparición
+        if nodos <= max_nodos:
+            max_nodos = None
+        elif not compartido:
+            raise PresupuestoExcedido(NODOS, max_nodos, nodos, previsto=True)
+    max_magnitud = presupuesto.max_magnitud
+    revisar_potencia = (presupuesto.max_magnitud is not None
+                        or presupuesto.max_exponente is not None)
+    limite_segundos = presupuesto.limite_segundos
+    inicio = time.perf_counter()
+    intervalo = presupuesto.intervalo_reloj
+    evaluados = 0
+
+    valores = []
+    memo = {} if compartido else None
+    pila = [(raiz, False)]
+    while pila:
+        actual, visitado = pila.pop()
+        if actual.izq is None and actual.der is None:
+            valor = actual.valor
+            if isinstance(valor, str):
+                if variables is None or valor not in variables:
+                    raise ValueError(f"Variable sin valor: {valor}")
+                valor = variables[valor]
+                if max_magnitud is not None and abs(valor) > max_magnitud:
+                    raise PresupuestoExcedido(MAGNITUD, max_magnitud, valor)
+        elif visitado:
+            der_valor = valores.pop()
+            if actual.izq is None:
+                if aplicar_unario is None:
+                    raise ValueError(f"Operador desconocido: {actual.valor}")
+                valor = aplicar_unario(actual.valor, der_valor)
+            else:
+                izq_valor = valores.pop()
+                if revisar_potencia and actual.valor == '^':
+                    presupuesto.revisar_potencia(izq_valor, der_valor)
+                valor = aplicar_operador(actual.valor, izq_valor, der_valor)
+            if max_magnitud is not None and abs(valor) > max_magnitud:
+                raise PresupuestoExcedido(MAGNITUD, max_magnitud, valor, actual.valor)
+            if memo is not None:
+                memo[actual] = valor
+        elif memo is not None and actual in memo:
+            valor = memo[actual]
+        else:
+            pila.append((actual, True))
+            pila.append((actual.der, False))
+            if actual.izq is not None:
+                pila.append((actual.izq, False))
+            continue
+
+        valores.append(valor)
+        evaluados += 1
+        if max_nodos is not None and evaluados > max_nodos:
+            raise PresupuestoExcedido(NODOS, max_nodos, evaluados)
+        if limite_segundos is not None and evaluados % intervalo == 0:
+            transcurrido = time.perf_counter() - inicio
+            if transcurrido > limite_segundos:
+                raise PresupuestoExcedido(TIEMPO, limite_segundos, transcurrido)
+    return valores.pop()
@@ -0,0 +1,340 @@
+"""
+Programa postfijo
+"""
+from array import array
+
+# Códigos de operación del programa postfijo
+OP_NUMERO = 0
+OP_SUMA = 1
+OP_RESTA = 2
+OP_MULTIPLICACION = 3
+OP_DIVISION = 4
+OP_POTENCIA = 5
+OP_VARIABLE = 6
+
+CODIGOS_OPERADOR = {'+': OP_SUMA, '-': OP_RESTA, '*': OP_MULTIPLICACION,
+                    '/': OP_DIVISION, '^': OP_POTENCIA}
+SIMBOLOS_OPERADOR = {codigo: simbolo for simbolo,
+                     codigo in CODIGOS_OPERADOR.items()}
+
+# Modos de las instrucciones internas de la máquina de pila
+_APILAR = 0
+_OPERAR_INMEDIATO = 1
+_OPERAR_CONSTANTES = 2
+_OPERAR_PILA = 3
+_CARGAR_VARIABLE = 4
+
+
+class ProgramaPostfijo:
+    """
+    Representación compilada de un árbol de expresión como un programa postfijo plano.
+    Cada instrucción es un código de operación (arreglo `codigos`) con un argumento
+    (arreglo `argumentos`): para los números es la constante a apilar y para las
+    variables es su índice en `nombres_variables`.
+    Se evalúa con una máquina de pila iterativa, sin recorrer los nodos.
+    """
+
+    def __init__(self, codigos=None, argumentos=None, nombres_variables=None):
+        """
+        Inicializa el programa con los arreglos de instrucciones.
+
+        Args:
+            codigos (array): Códigos de operación en orden postfijo.
+            argumentos (array): Argumento de cada instrucción.
+            nombres_variables (list): Nombres de las variables, en orden de aparición.
+        """
+        self.codigos = codigos if codigos is not None else array('B')
+        self.argumentos = argumentos if argumentos is not None else array('d')
+        self.nombres_variables = nombres_variables if nombres_variables is not None else []
+        self._cache_instrucciones = None
+
+    def __len__(self):
+        return len(self.codigos)
+
+    @classmethod
+    def desde_nodo(cls, raiz):
+        """
+        Compila un árbol de nodos en un programa postfijo.
+        El recorrido es iterativo, por lo que no depende de la profundidad del árbol.
+
+        Args:
+            raiz (Nodo): El nodo raíz del árbol a compilar.
+
+        Returns:
+            ProgramaPostfijo: El programa equivalente al árbol.
+
+        Raises:
+            ValueError: Si se encuentra un operador desconocido.
+        """
+        programa = cls()
+        if raiz is None:
+            return programa
+
+        # Preorden (raíz, derecha, izquierda) invertido equivale al postorden
+        orden = []
+        pila = [raiz]
+        while pila:
+            nodo = pila.pop()
+            orden.append(nodo)
+            if nodo.izq is not None:
+                pila.append(nodo.izq)
+            if nodo.der is not None:
+                pila.append(nodo.der)
+
+        codigos = programa.codigos
+        argumentos = programa.argumentos
+        indices_variables = {}
+        for nodo in reversed(orden):
+            if nodo.izq is None and nodo.der is None:
+                if isinstance(nodo.valor, str):
+                    indice = indices_variables.get(nodo.valor)
+                    if indice is None:
+                        indice = indices_variables[nodo.valor] = len(
+                            indices_variables)
+                        programa.nombres_variables.append(nodo.valor)
+                    codigos.append(OP_VARIABLE)
+                    argumentos.append(indice)
+                else:
+                    codigos.append(OP_NUMERO)
+                    argumentos.append(nodo.valor)
+                continue
+            codigo = CODIGOS_OPERADOR.get(nodo.valor)
+            if codigo is None:
+                raise ValueError(f"Operador desconocido: {nodo.valor}")
+            codigos.append(codigo)
+            argumentos.append(0.0)
+        return programa
+
+    def _instrucciones(self):
+        """
+        Traduce los arreglos a la lista de instrucciones que ejecuta la máquina de pila.
+        Los operandos constantes se fusionan con su operador (superinstrucciones),
+        lo que reduce a la mitad el número de despachos en árboles balanceados.
+        Las constantes quedan como objetos `float` ya creados.
+
+        Returns:
+            list: Tuplas (modo, codigo, k1, k2) listas para ejecutar.
+        """
+        if self._cache_instrucciones is not None:
+            return self._cache_instrucciones
+        instrucciones = []
+        for codigo, argumento in zip(self.codigos, self.argumentos):
+            if codigo == OP_NUMERO:
+                instrucciones.append((_APILAR, codigo, argumento, 0.0))
+                continue
+            if codigo == OP_VARIABLE:
+                instrucciones.append(
+                    (_CARGAR_VARIABLE, codigo, int(argumento), 0.0))
+                continue
+            if instrucciones and instrucciones[-1][0] == _APILAR:
+                k2 = instrucciones.pop()[2]
+                if instrucciones and instrucciones[-1][0] == _APILAR:
+                    k1 = instrucciones.pop()[2]
+                    instrucciones.append((_OPERAR_CONSTANTES, codigo, k1, k2))
+                else:
+                    instrucciones.append((_OPERAR_INMEDIATO, codigo, k2, 0.0))
+            else:
+                instrucciones.append((_OPERAR_PILA, codigo, 0.0, 0.0))
+        self._cache_instrucciones = instrucciones
+        return instrucciones
+
+    def _valores_variables(self, variables):
+        """
+        Obtiene el valor de cada variable del programa, en el orden de sus índices.
+
+        Args:
+            variables (dict): Valores de las variables por nombre.
+
+        Returns:
+            list: Los valores en el orden de `nombres_variables`.
+
+        Raises:
+            ValueError: Si falta el valor de alguna variable.
+        """
+        variables = variables or {}
+        valores = []
+        for nombre in self.nombres_variables:
+            if nombre not in variables:
+                raise ValueError(f"Variable sin valor: {nombre}")
+            valores.append(variables[nombre])
+        return valores
+
+    def evaluar(self, variables=None):
+        """
+        Ejecuta el programa sobre una pila y devuelve el resultado.
+        Produce exactamente el mismo valor que `ArbolDeExpresion.evaluar_arbol`.
+
+        Args:
+            variables (dict): Valores de las variables por nombre.
+
+        Returns:
+            float: El resultado de evaluar la expresión.
+
+        Raises:
+            ZeroDivisionError: Si se intenta realizar una división por cero.
+            ValueError: Si falta el valor de alguna variable.
+        """
+        valores = self._valores_variables(variables)
+        pila = []
+        apilar = pila.append
+        desapilar = pila.pop
+        for modo, codigo, k1, k2 in self._instrucciones():
+            if modo == _OPERAR_CONSTANTES:
+                if codigo == OP_SUMA:
+                    apilar(k1 + k2)
+                elif codigo == OP_RESTA:
+                    apilar(k1 - k2)
+                elif codigo == OP_MULTIPLICACION:
+                    apilar(k1 * k2)
+                elif codigo == OP_DIVISION:
+                    if k2 == 0:
+                        raise ZeroDivisionError("Error: División entre cero.")
+                    apilar(k1 / k2)
+                else:
+                    apilar(k1 ** k2)
+                continue
+            if modo == _OPERAR_PILA:
+                k1 = desapilar()
+            elif modo == _APILAR:
+                apilar(k1)
+                continue
+            elif modo == _CARGAR_VARIABLE:
+                apilar(valores[k1])
+                continue
+            # Operar la cima de la pila con el operando derecho k1
+            if codigo == OP_SUMA:
+                pila[-1] += k1
+            elif codigo == OP_RESTA:
+                pila[-1] -= k1
+            elif codigo == OP_MULTIPLICACION:
+                pila[-1] *= k1
+            elif codigo == OP_DIVISION:
+                if k1 == 0:
+                    raise ZeroDivisionError("Error: División entre cero.")
+                pila[-1] /= k1
+            else:
+                pila[-1] **= k1
+        return pila.pop()
+
+    def evaluar_lote(self, variables, tamano_bloque=None, salida=None):
+        """
+        Evalúa el programa una sola vez sobre columnas completas de NumPy.
+        Las divisiones entre cero no interrumpen la evaluación: esos elementos
+        quedan en NaN y se marcan en la máscara devuelta. Como en NumPy, una base
+        negativa con exponente fraccionario produce NaN en lugar de un complejo.
+
+        Args:
+            variables (dict): Arreglos de valores por nombre de variable.
+            tamano_bloque (int): Si se indica, evalúa por bloques de ese número de
+                                 filas para acotar la memoria intermedia.
+            salida (tuple): Arreglos (valores, mascara) donde escribir el resultado,
+                            por ejemplo `numpy.memmap` para entradas mayores que la RAM.
+
+        Returns:
+            tuple: (valores, mascara) con el resultado por fila y la máscara booleana
+                   de las filas con división entre cero.
+
+        Raises:
+            ValueError: Si falta el valor de alguna variable.
+        """
+        import numpy as np
+
+        columnas = [np.asarray(valor, dtype=float)
+                    for valor in self._valores_variables(variables)]
+        forma = np.broadcast_shapes(*(columna.shape for columna in columnas))
+        if tamano_bloque is None and salida is None:
+            return self._evaluar_columnas(columnas, forma)
+        if forma == ():
+            # Sin columnas no hay filas que recorrer por bloques: el resultado es
+            # un escalar, que se copia (difundido) en `salida` si se indicó
+            resultado, mascara_resultado = self._evaluar_columnas(columnas, forma)
+            if salida is None:
+                return resultado, mascara_resultado
+            valores, mascara = salida
+            valores[...] = resultado
+            mascara[...] = mascara_resultado
+            return valores, mascara
+
+        if salida is None:
+            salida = (np.empty(forma), np.zeros(forma, dtype=bool))
+        valores, mascara = salida
+        for inicio, fin, bloque, mascara_bloque in self.evaluar_por_bloques(
+                variables, tamano_bloque or max(1, forma[0])):
+            valores[inicio:fin] = bloque
+            mascara[inicio:fin] = mascara_bloque
+        return valores, mascara
+
+    def evaluar_por_bloques(self, variables, tamano_bloque):
+        """
+        Evalúa el programa sobre bloques consecutivos de filas, de modo que solo un
+        bloque de cada columna (y de los resultados intermedios) está en memoria.
+
+        Args:
+            variables (dict): Arreglos de valores por nombre de variable.
+            tamano_bloque (int): Número de filas por bloque.
+
+        Yields:
+            tuple: (inicio, fin, valores, mascara) de cada bloque.
+
+        Raises:
+            ValueError: Si falta el valor de alguna variable.
+        """
+        import numpy as np
+
+        columnas = [np.asarray(valor, dtype=float)
+                    for valor in self._valores_variables(variables)]
+        forma = np.broadcast_shapes(*(columna.shape for columna in columnas))
+        # Las columnas que se difunden (por ejemplo de forma (1,)) se alinean por
+        # filas antes de cortarlas; `broadcast_to` es una vista y no copia nada
+        columnas = [np.broadcast_to(columna, forma) if columna.ndim else columna
+                    for columna in columnas]
+        filas = forma[0] if forma else 1
+        for inicio in range(0, filas, tamano_bloque):
+            fin = min(inicio + tamano_bloque, filas)
+            bloque = [columna[inicio:fin] if columna.ndim else columna
+                      for columna in columnas]
+            valores, mascara = self._evaluar_columnas(
+                bloque, (fin - inicio,) + tuple(forma[1:]))
+            yield inicio, fin, valores, mascara
+
+    def _evaluar_columnas(self, columnas, forma):
+        """
+        Ejecuta el programa con arreglos de NumPy en la pila.
+
+        Args:
+            columnas (list): Arreglos de cada variable, en el orden de sus índices.
+            forma (tuple): Forma del resultado.
+
+        Returns:
+            tuple: (valores, mascara) del resultado.
+        """
+        import numpy as np
+
+        mascara = np.zeros(forma, dtype=bool)
+        pila = []
+        with np.errstate(all='ignore'):
+            for codigo, argumento in zip(self.codigos, self.argumentos):
+                if codigo == OP_NUMERO:
+                    pila.append(argumento)
+                    continue
+                if codigo == OP_VARIABLE:
+                    pila.append(columnas[int(argumento)])
+                    continue
+                der_valor = pila.pop()
+                izq_valor = pila[-1]
+                if codigo == OP_SUMA:
+                    pila[-1] = np.add(izq_valor, der_valor)
+                elif codigo == OP_RESTA:
+                    pila[-1] = np.subtract(izq_valor, der_valor)
+                elif codigo == OP_MULTIPLICACION:
+                    pila[-1] = np.multiply(izq_valor, der_valor)
+                elif codigo == OP_DIVISION:
+                    ceros = np.equal(der_valor, 0)
+                    mascara |= ceros
+                    pila[-1] = np.where(ceros, np.nan,
+                                        np.divide(izq_valor, der_valor))
+                else:
+                    pila[-1] = np.power(izq_valor, der_valor)
+        valores = np.array(np.broadcast_to(pila.pop(), forma), dtype=float)
+        valores[mascara] = np.nan
+        return valores, mascara
@@ -0,0 +1,639 @@
+"""
+Serialización binaria de árboles de expresión
+"""
+import mmap
+import struct
+import sys
+from array import array
+from operator import length_hint
+
+from Modelos.almacen_nodos import AlmacenNodos
+from Modelos.nodo import Nodo
+from Modelos.programa import (CODIGOS_OPERADOR, OP_DIVISION, OP_MULTIPLICACION,
+                              OP_NUMERO, OP_POTENCIA, OP_RESTA, OP_SUMA, OP_VARIABLE,
+                              SIMBOLOS_OPERADOR, ProgramaPostfijo)
+
+# Códigos propios del formato, además de los del programa postfijo
+OP_GUARDAR = 7  # Copia la cima de la pila en la siguiente entrada de la tabla
+OP_CARGAR = 8   # Apila una entrada de la tabla de subárboles compartidos
+
+VERSION = 1
+MAGICO = b'AEXP'
+MAGICO_INDICE = b'AIDX'
+
+# Cabecera de cada árbol: mágico, versión, banderas (reservadas), número de
+# variables, de códigos, de constantes, de argumentos enteros y de entradas de
+# la tabla de compartidos. Le siguen las constantes ('d'), los argumentos
+# enteros ('I'), los códigos ('B') y los nombres de las variables, con relleno
+# hasta múltiplo de 8 bytes.
+_CABECERA = struct.Struct('<4sBBHIIII')
+# Final de un corpus: posición del índice, número de árboles, mágico y versión
+_PIE = struct.Struct('<QQ4sI')
+_NOMBRE = struct.Struct('<H')
+_POSICION = struct.Struct('<Q')
+
+_INVERTIR_BYTES = sys.byteorder == 'big'  # El formato es little-endian
+
+
+def _a_bytes(arreglo):
+    """
+    Devuelve los bytes little-endian de un arreglo.
+    """
+    if _INVERTIR_BYTES:
+        arreglo = array(arreglo.typecode, arreglo)
+        arreglo.byteswap()
+    return arreglo.tobytes()
+
+
+def _desde_bytes(tipo, datos):
+    """
+    Crea un arreglo del tipo dado a partir de bytes little-endian.
+    """
+    arreglo = array(tipo)
+    arreglo.frombytes(datos)
+    if _INVERTIR_BYTES:
+        arreglo.byteswap()
+    return arreglo
+
+
+def _corrupto(codigos, restantes):
+    """
+    Devuelve el error de un árbol cuya instrucción actual no se puede ejecutar.
+
+    Args:
+        codigos (array): Los códigos del árbol.
+        restantes (iterator): El iterador sobre los bytes de `codigos` (que, a
+                              diferencia del de un arreglo, sabe cuántos le
+                              quedan), detenido justo después de la instrucción
+                              que falló.
+    """
+    instruccion = len(codigos) - length_hint(restantes) - 1
+    return ValueError(f"Árbol serializado corrupto en la instrucción {instruccion}.")
+
+
+def _relleno(longitud):
+    """
+    Bytes de relleno para que `longitud` quede alineada a 8.
+    """
+    return b'\0' * (-longitud % 8)
+
+
+def serializar(raiz, compartir=False):
+    """
+    Convierte un árbol en bytes: sus nodos en postorden como códigos de
+    operación, con las constantes y los índices de variable aparte.
+
+    Los subárboles alcanzables por más de un camino (los de un árbol construido
+    con `compartir=True`) se escriben una sola vez: tras su primera aparición va
+    un `OP_GUARDAR` y las siguientes son un `OP_CARGAR` con su entrada de la
+    tabla. Así un DAG no se expande al guardarlo.
+
+    Args:
+        raiz (Nodo | NodoVista): La raíz del árbol.
+        compartir (bool): Si es True, además se comparten los subárboles
+                          estructuralmente idénticos aunque sean nodos distintos.
+
+    Returns:
+        bytes: El árbol serializado.
+
+    Raises:
+        ValueError: Si el árbol está vacío, tiene un operador desconocido, un
+                    operador unario o una función, o demasiadas variables.
+    """
+    if raiz is None:
+        raise ValueError("El árbol está vacío.")
+
+    # Postorden de los nodos distintos
+    orden = []
+    visitados = set()
+    pila = [(raiz, False)]
+    while pila:
+        nodo, listo = pila.pop()
+        if listo:
+            orden.append(nodo)
+            continue
+        if nodo in visitados:
+            continue
+        visitados.add(nodo)
+        if nodo.izq is None and nodo.der is None:
+            orden.append(nodo)
+            continue
+        # El formato solo tiene operadores binarios básicos: un nodo con un solo
+        # hijo (operador unario o función del registro) no se puede escribir
+        if nodo.izq is None or nodo.der is None or nodo.valor not in CODIGOS_OPERADOR:
+            raise ValueError(f"Operador desconocido: {nodo.valor}")
+        pila.append((nodo, True))
+        pila.append((nodo.der, False))
+        pila.append((nodo.izq, False))
+
+    # Representante de cada nodo: él mismo o el primero estructuralmente igual
+    representantes = {}
+    if compartir:
+        claves = {}
+        for nodo in orden:
+            if nodo.izq is None and nodo.der is None:
+                clave = (type(nodo.valor), nodo.valor)
+            else:
+                clave = (nodo.valor, representantes[nodo.izq], representantes[nodo.der])
+            representantes[nodo] = claves.setdefault(clave, nodo)
+    else:
+        for nodo in orden:
+            representantes[nodo] = nodo
+
+    # Referencias a cada representante desde los demás representantes
+    referencias = dict.fromkeys(set(representantes.values()), 0)
+    for nodo in orden:
+        if representantes[nodo] is nodo and nodo.izq is not None:
+            referencias[representantes[nodo.izq]] += 1
+            referencias[representantes[nodo.der]] += 1
+
+    codigos = array('B')
+    constantes = array('d')
+    enteros = array('I')
+    nombres = []
+    indices_variables = {}
+    tabla = {}
+    pila = [(representantes[raiz], False)]
+    while pila:
+        nodo, listo = pila.pop()
+        if not listo:
+            entrada = tabla.get(nodo)
+            if entrada is not None:
+                codigos.append(OP_CARGAR)
+                enteros.append(entrada)
+                continue
+            if nodo.izq is not None:
+                pila.append((nodo, True))
+                pila.append((representantes[nodo.der], False))
+                pila.append((representantes[nodo.izq], False))
+                continue
+            valor = nodo.valor
+            if isinstance(valor, str):
+                indice = indices_variables.get(valor)
+                if indice is None:
+                    indice = indices_variables[valor] = len(nombres)
+                    nombres.append(valor)
+                codigos.append(OP_VARIABLE)
+                enteros.append(indice)
+            else:
+                codigos.append(OP_NUMERO)
+                constantes.append(valor)
+        else:
+            codigo = CODIGOS_OPERADOR.get(nodo.valor)
+            if codigo is None:
+                raise ValueError(f"Operador desconocido: {nodo.valor}")
+            codigos.append(codigo)
+        if referencias[nodo] > 1:
+            tabla[nodo] = len(tabla)
+            codigos.append(OP_GUARDAR)
+
+    if len(nombres) > 0xFFFF:
+        raise ValueError("Demasiadas variables para serializar el árbol.")
+    partes = [_CABECERA.pack(MAGICO, VERSION, 0, len(nombres), len(codigos),
+                             len(constantes), len(enteros), len(tabla)),
+              _a_bytes(constantes), _a_bytes(enteros), codigos.tobytes()]
+    for nombre in nombres:
+        texto = nombre.encode('utf-8')
+        partes.append(_NOMBRE.pack(len(texto)))
+        partes.append(texto)
+    longitud = sum(len(parte) for parte in partes)
+    partes.append(_relleno(longitud))
+    return b''.join(partes)
+
+
+def leer_registro(datos, inicio=0):
+    """
+    Lee un árbol serializado sin reconstruir sus nodos.
+
+    Args:
+        datos (bytes | mmap): El buffer que contiene el árbol.
+        inicio (int): Posición del árbol dentro del buffer.
+
+    Returns:
+        ArbolSerializado: El árbol leído.
+
+    Raises:
+        ValueError: Si los datos no son un árbol serializado de esta versión.
+    """
+    try:
+        (magico, version, _, num_nombres, num_codigos, num_constantes, num_enteros,
+         num_guardados) = _CABECERA.unpack_from(datos, inicio)
+    except struct.error as e:
+        raise ValueError(f"Árbol serializado incompleto en la posición {inicio}.") from e
+    if magico != MAGICO:
+        raise ValueError("Los datos no son un árbol serializado.")
+    if version != VERSION:
+        raise ValueError(f"Versión de árbol serializado no soportada: {version}")
+
+    posicion = inicio + _CABECERA.size
+    total = len(datos)
+    fin = posicion + 8 * num_constantes + 4 * num_enteros + num_codigos
+    if fin > total:
+        raise ValueError(f"Árbol serializado incompleto en la posición {total}.")
+    fin = posicion + 8 * num_constantes
+    constantes = _desde_bytes('d', datos[posicion:fin])
+    posicion, fin = fin, fin + 4 * num_enteros
+    enteros = _desde_bytes('I', datos[posicion:fin])
+    posicion, fin = fin, fin + num_codigos
+    codigos = array('B', datos[posicion:fin])
+    nombres = []
+    posicion = fin
+    for _ in range(num_nombres):
+        if posicion + _NOMBRE.size > total:
+            raise ValueError(f"Árbol serializado incompleto en la posición {posicion}.")
+        longitud, = _NOMBRE.unpack_from(datos, posicion)
+        posicion += _NOMBRE.size
+        if posicion + longitud > total:
+            raise ValueError(f"Árbol serializado incompleto en la posición {posicion}.")
+        try:
+            nombres.append(bytes(datos[posicion:posicion + longitud]).decode('utf-8'))
+        except UnicodeDecodeError as e:
+            raise ValueError(f"Nombre de variable inválido en la posición {posicion}.") from e
+        posicion += longitud
+    return ArbolSerializado(codigos, constantes, enteros, nombres, num_guardados)
+
+
+def deserializar(datos, compacto=False):
+    """
+    Reconstruye un `ArbolDeExpresion` a partir de sus bytes.
+
+    Args:
+        datos (bytes): El árbol serializado con `serializar`.
+        compacto (bool): Si es True, los nodos se guardan en un `AlmacenNodos`.
+
+    Returns:
+        ArbolDeExpresion: El árbol reconstruido.
+
+    Raises:
+        ValueError: Si los datos no son un árbol serializado válido.
+    """
+    return leer_registro(datos).a_arbol(compacto)
+
+
+class ArbolSerializado:
+    """
+    Un árbol leído de su forma binaria, todavía sin nodos: los arreglos de
+    códigos, constantes y argumentos enteros en postorden. Se puede evaluar
+    directamente o convertir en un `ArbolDeExpresion`.
+    """
+
+    __slots__ = ('codigos', 'constantes', 'enteros', 'nombres_variables',
+                 'num_guardados', '_programa')
+
+    def __init__(self, codigos, constantes, enteros, nombres_variables, num_guardados):
+        """
+        Args:
+            codigos (array): Códigos de operación en postorden.
+            constantes (array): Constantes de las instrucciones `OP_NUMERO`, en orden.
+            enteros (array): Argumentos de `OP_VARIABLE` y `OP_CARGAR`, en orden.
+            nombres_variables (list): Nombres de las variables por índice.
+            num_guardados (int): Entradas de la tabla de subárboles compartidos.
+        """
+        self.codigos = codigos
+        self.constantes = constantes
+        self.enteros = enteros
+        self.nombres_variables = nombres_variables
+        self.num_guardados = num_guardados
+        self._programa = None
+
+    def __len__(self):
+        return len(self.codigos)
+
+    def a_arbol(self, compacto=False):
+        """
+        Reconstruye los nodos. Los subárboles compartidos en el archivo vuelven a
+        ser un mismo nodo, como en un árbol construido con `compartir=True`.
+
+        Args:
+            compacto (bool): Si es True, los nodos se guardan en un `AlmacenNodos`.
+
+        Returns:
+            ArbolDeExpresion: El árbol reconstruido.
+
+        Raises:
+            ValueError: Si los datos no forman un árbol válido.
+        """
+        from Modelos.arbol import ArbolDeExpresion
+
+        almacen = AlmacenNodos() if compacto else None
+        nombres = self.nombres_variables
+        constantes = iter(self.constantes)
+        enteros = iter(self.enteros)
+        tabla = []
+        pila = []
+        tamanos = []  # Nodos del árbol expandido bajo cada elemento de la pila
+        creados = 0
+        restantes = iter(self.codigos.tobytes())
+        try:
+            for codigo in restantes:
+                if codigo == OP_NUMERO or codigo == OP_VARIABLE:
+                    valor = next(constantes) if codigo == OP_NUMERO else nombres[next(enteros)]
+                    pila.append(almacen.hoja(valor) if almacen is not None else Nodo(valor))
+                    tamanos.append(1)
+                    creados += 1
+                elif codigo == OP_GUARDAR:
+                    tabla.append((pila[-1], tamanos[-1]))
+                elif codigo == OP_CARGAR:
+                    nodo, tamano = tabla[next(enteros)]
+                    pila.append(nodo)
+                    tamanos.append(tamano)
+                else:
+                    der = pila.pop()
+                    izq = pila.pop()
+                    simbolo = SIMBOLOS_OPERADOR[codigo]
+                    if almacen is not None:
+                        nodo = almacen.operador(simbolo, izq, der)
+                    else:
+                        nodo = Nodo(simbolo)
+                        nodo.izq = izq
+                        nodo.der = der
+                    pila.append(nodo)
+                    tamano = tamanos.pop()
+                    tamanos[-1] += tamano + 1
+                    creados += 1
+        except (IndexError, KeyError, StopIteration) as e:
+            raise _corrupto(self.codigos, restantes) from e
+        if len(pila) != 1:
+            raise ValueError(f"Árbol serializado corrupto: termina con {len(pila)} valores.")
+
+        arbol = ArbolDeExpresion()
+        arbol.raiz = almacen.vista(pila[0]) if almacen is not None else pila[0]
+        arbol.almacen = almacen
+        if self.num_guardados:
+            arbol.compartido = True
+            arbol.nodos_expandidos = tamanos[0]
+            arbol.nodos_unicos = creados
+        return arbol
+
+    def _a_programa(self):
+        """
+        Convierte un árbol sin subárboles compartidos en un programa postfijo (el
+        formato ya está en postorden) y lo conserva para las siguientes
+        evaluaciones. Como el programa no revisa sus instrucciones, aquí se
+        comprueban los códigos, los índices de variable y la altura de la pila.
+
+        Raises:
+            ValueError: Si los datos no forman un árbol válido.
+        """
+        if self._programa is None:
+            argumentos = array('d')
+            constantes = iter(self.constantes)
+            enteros = iter(self.enteros)
+            num_nombres = len(self.nombres_variables)
+            altura = 0
+            restantes = iter(self.codigos.tobytes())
+            try:
+                for codigo in restantes:
+                    if codigo == OP_NUMERO:
+                        argumentos.append(next(constantes))
+                        altura += 1
+                    elif codigo == OP_VARIABLE:
+                        indice = next(enteros)
+                        if indice >= num_nombres:
+                            raise IndexError(indice)
+                        argumentos.append(indice)
+                        altura += 1
+                    elif OP_SUMA <= codigo <= OP_POTENCIA and altura >= 2:
+                        argumentos.append(0.0)
+                        altura -= 1
+                    else:
+                        raise IndexError(codigo)
+            except (IndexError, StopIteration) as e:
+                raise _corrupto(self.codigos, restantes) from e
+            if altura != 1:
+                raise ValueError(f"Árbol serializado corrupto: termina con {altura} valores.")
+            self._programa = ProgramaPostfijo(self.codigos, argumentos,
+                                              self.nombres_variables)
+        return self._programa
+
+    def evaluar(self, variables=None):
+        """
+        Evalúa el árbol sin reconstruir sus nodos. Devuelve el mismo valor que
+        `ArbolDeExpresion.evaluar_arbol` sobre el árbol original; cada subárbol
+        compartido se evalúa una sola vez.
+
+        Args:
+            variables (dict): Valores de las variables por nombre.
+
+        Returns:
+            float: El resultado de evaluar la expresión.
+
+        Raises:
+            ZeroDivisionError: Si se intenta realizar una división por cero.
+            ValueError: Si falta el valor de alguna variable o los datos no forman
+                        un árbol válido.
+        """
+        if not self.num_guardados:
+            return self._a_programa().evaluar(variables)
+
+        variables = variables or {}
+        valores = []
+        for nombre in self.nombres_variables:
+            if nombre not in variables:
+                raise ValueError(f"Variable sin valor: {nombre}")
+            valores.append(variables[nombre])
+        constantes = iter(self.constantes)
+        enteros = iter(self.enteros)
+        tabla = []
+        pila = []
+        apilar = pila.append
+        desapilar = pila.pop
+        restantes = iter(self.codigos.tobytes())
+        try:
+            for codigo in restantes:
+                if codigo == OP_NUMERO:
+                    apilar(next(constantes))
+                elif codigo == OP_VARIABLE:
+                    apilar(valores[next(enteros)])
+                elif codigo == OP_GUARDAR:
+                    tabla.append(pila[-1])
+                elif codigo == OP_CARGAR:
+                    apilar(tabla[next(enteros)])
+                else:
+                    der = desapilar()
+                    if codigo == OP_SUMA:
+                        pila[-1] += der
+                    elif codigo == OP_RESTA:
+                        pila[-1] -= der
+                    elif codigo == OP_MULTIPLICACION:
+                        pila[-1] *= der
+                    elif codigo == OP_DIVISION:
+                        if der == 0:
+                            raise ZeroDivisionError("Error: División entre cero.")
+                        pila[-1] /= der
+                    elif codigo == OP_POTENCIA:
+                        pila[-1] **= der
+                    else:
+                        raise IndexError(codigo)
+        except (IndexError, StopIteration) as e:
+            raise _corrupto(self.codigos, restantes) from e
+        if len(pila) != 1:
+            raise ValueError(f"Árbol serializado corrupto: termina con {len(pila)} valores.")
+        return pila[0]
+
+
+class EscritorCorpus:
+    """
+    Escribe muchos árboles en un solo archivo, uno detrás de otro, seguidos de
+    un índice con la posición de cada uno. El archivo se escribe a medida que
+    se agregan los árboles; solo el índice (8 bytes por árbol) se guarda en
+    memoria hasta `cerrar()`.
+    """
+
+    def __init__(self, ruta, compartir=False):
+        """
+        Args:
+            ruta (str): Ruta del archivo a crear.
+            compartir (bool): Se pasa a `serializar` para cada árbol.
+        """
+        self.compartir = compartir
+        self._archivo = open(ruta, 'wb')
+        self._posiciones = array('Q')
+        self._posicion = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        self.cerrar()
+        return False
+
+    def __len__(self):
+        return len(self._posiciones)
+
+    def agregar(self, raiz):
+        """
+        Agrega un árbol al final del archivo.
+
+        Args:
+            raiz (Nodo | NodoVista): La raíz del árbol.
+
+        Returns:
+            int: El índice del árbol dentro del corpus.
+        """
+        datos = serializar(raiz, self.compartir)
+        self._archivo.write(datos)
+        self._posiciones.append(self._posicion)
+        self._posicion += len(datos)
+        return len(self._posiciones) - 1
+
+    def cerrar(self):
+        """
+        Escribe el índice y el pie, y cierra el archivo.
+        """
+        if self._archivo.closed:
+            return
+        self._archivo.write(_a_bytes(self._posiciones))
+        self._archivo.write(_PIE.pack(self._posicion, len(self._posiciones),
+                                      MAGICO_INDICE, VERSION))
+        self._archivo.close()
+
+
+def guardar_corpus(ruta, raices, compartir=False):
+    """
+    Escribe una secuencia de árboles en un archivo de corpus.
+
+    Args:
+        ruta (str): Ruta del archivo a crear.
+        raices (iterable): Raíces de los árboles, en orden.
+        compartir (bool): Se pasa a `serializar` para cada árbol.
+
+    Returns:
+        int: El número de árboles escritos.
+    """
+    with EscritorCorpus(ruta, compartir) as escritor:
+        for raiz in raices:
+            escritor.agregar(raiz)
+        return len(escritor)
+
+
+class CorpusArboles:
+    """
+    Lectura perezosa de un archivo de corpus mediante `mmap`: abrirlo solo lee
+    el pie, y cada árbol se decodifica (copiando únicamente sus bytes) cuando
+    se pide. El sistema operativo carga las páginas a medida que se usan, así
+    que el archivo puede ser mucho más grande que la memoria.
+    """
+
+    def __init__(self, ruta):
+        """
+        Abre el corpus.
+
+        Args:
+            ruta (str): Ruta del archivo escrito con `EscritorCorpus`.
+
+        Raises:
+            ValueError: Si el archivo no es un corpus de esta versión.
+        """
+        self._archivo = open(ruta, 'rb')
+        try:
+            self._mapa = mmap.mmap(self._archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._archivo.close()
+            raise ValueError("El corpus está vacío.") from None
+        if len(self._mapa) < _PIE.size:
+            self.cerrar()
+            raise ValueError("El archivo no es un corpus de árboles.")
+        self._indice, self._cantidad, magico, version = _PIE.unpack_from(
+            self._mapa, len(self._mapa) - _PIE.size)
+        if magico != MAGICO_INDICE or version != VERSION:
+            self.cerrar()
+            raise ValueError("El archivo no es un corpus de árboles de esta versión.")
+        if self._indice + self._cantidad * _POSICION.size != len(self._mapa) - _PIE.size:
+            self.cerrar()
+            raise ValueError(f"Índice del corpus corrupto en la posición {self._indice}.")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        self.cerrar()
+        return False
+
+    def __len__(self):
+        return self._cantidad
+
+    def __getitem__(self, indice):
+        """
+        Decodifica el árbol en la posición indicada.
+
+        Args:
+            indice (int): Posición del árbol (se admiten negativos).
+
+        Returns:
+            ArbolSerializado: El árbol, listo para evaluar o reconstruir.
+
+        Raises:
+            IndexError: Si el índice está fuera del corpus.
+        """
+        if indice < 0:
+            indice += self._cantidad
+        if not 0 <= indice < self._cantidad:
+            raise IndexError("Índice de árbol fuera del corpus.")
+        inicio, = _POSICION.unpack_from(self._mapa, self._indice + indice * _POSICION.size)
+        return leer_registro(self._mapa, inicio)
+
+    def __iter__(self):
+        for indice in range(self._cantidad):
+            yield self[indice]
+
+    def evaluar(self, indice, variables=None):
+        """
+        Evalúa un árbol del corpus sin reconstruir sus nodos.
+
+        Args:
+            indice (int): Posición del árbol.
+            variables (dict): Valores de las variables por nombre.
+
+        Returns:
+            float: El resultado de evaluar la expresión.
+        """
+        return self[indice].evaluar(variables)
+
+    def cerrar(self):
+        """
+        Libera el mapeo y cierra el archivo.
+        """
+        if not self._mapa.closed:
+            self._mapa.close()
+        self._archivo.close()
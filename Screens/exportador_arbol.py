@@ -0,0 +1,120 @@
+"""
+Exportador de imágenes del árbol (sin pantalla)
+
+Usa la API orientada a objetos de matplotlib con el backend Agg, sin pasar por
+pyplot: no hay estado global, no se abre ninguna ventana y la misma figura se
+reutiliza en todas las exportaciones, por lo que la memoria no crece.
+"""
+import os
+
+from Modelos.arbol import ArbolDeExpresion
+from Screens.layout_arbol import SIN_PADRE, calcular_layout
+
+# Exportador de cada proceso trabajador en `exportar_lote`
+_exportador = None
+
+
+class ExportadorArbol:
+    """
+    Renderiza árboles de expresión a archivos PNG o SVG reutilizando una sola
+    figura y un solo canvas Agg.
+    """
+
+    MAX_ETIQUETAS = 2000  # Con más nodos se dibujan solo los puntos
+
+    def __init__(self, tamano=(12, 6), dpi=100):
+        """
+        Crea la figura y el canvas que se reutilizarán en cada exportación.
+
+        Args:
+            tamano (tuple): Ancho y alto de la imagen en pulgadas.
+            dpi (int): Resolución de las imágenes PNG.
+        """
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        self.figura = Figure(figsize=tamano, dpi=dpi, facecolor='black')
+        self.canvas = FigureCanvasAgg(self.figura)
+        self.ejes = self.figura.add_axes((0, 0, 1, 1))
+
+    def exportar(self, raiz, ruta):
+        """
+        Dibuja el árbol y lo guarda en `ruta`; el formato sale de la extensión
+        (por ejemplo `.png` o `.svg`).
+
+        Args:
+            raiz (Nodo): La raíz del árbol a dibujar.
+            ruta (str): Ruta del archivo de salida.
+        """
+        from matplotlib.collections import LineCollection
+
+        layout = calcular_layout(raiz)
+        ejes = self.ejes
+        ejes.clear()
+        ejes.set_axis_off()
+        ejes.set_facecolor('black')
+
+        ys = [-profundidad for profundidad in layout.profundidades]
+        segmentos = [((layout.xs[padre], ys[padre]), (layout.xs[indice], ys[indice]))
+                     for indice, padre in enumerate(layout.padres) if padre != SIN_PADRE]
+        ejes.add_collection(LineCollection(
+            segmentos, colors='lightgreen', linewidths=2, zorder=1))
+
+        etiquetar = len(layout) <= self.MAX_ETIQUETAS
+        ejes.scatter(layout.xs, ys, s=900 if etiquetar else 4,
+                     c='skyblue', zorder=2)
+        if etiquetar:
+            for x, y, etiqueta in zip(layout.xs, ys, layout.etiquetas):
+                ejes.text(x, y, etiqueta, ha='center', va='center',
+                          fontsize=10, fontweight='bold', color='black', zorder=3)
+
+        ejes.set_xlim(-1, layout.ancho + 1)
+        ejes.set_ylim(-layout.altura - 1, 1)
+        self.figura.savefig(ruta, facecolor=self.figura.get_facecolor())
+
+
+def _exportar_expresion(tarea):
+    """
+    Construye el árbol de una expresión y lo exporta con el exportador del proceso.
+
+    Args:
+        tarea (tuple): (expresion, ruta)
+
+    Returns:
+        str: La ruta del archivo generado.
+    """
+    global _exportador
+    if _exportador is None:
+        _exportador = ExportadorArbol()
+    expresion, ruta = tarea
+    arbol = ArbolDeExpresion()
+    arbol.construir_arbol(expresion)
+    _exportador.exportar(arbol.raiz, ruta)
+    return ruta
+
+
+def exportar_lote(expresiones, directorio, formato='png', trabajadores=1):
+    """
+    Exporta una imagen por expresión a `directorio`, opcionalmente en un pool de
+    procesos. Se envían las expresiones (texto) y no los árboles, para que cada
+    trabajador construya el suyo sin serializar estructuras profundas.
+
+    Args:
+        expresiones (iterable): Expresiones aritméticas a exportar.
+        directorio (str): Carpeta de salida (se crea si no existe).
+        formato (str): Extensión de las imágenes, 'png' o 'svg'.
+        trabajadores (int): Número de procesos trabajadores.
+
+    Returns:
+        list: Las rutas generadas, en el orden de las expresiones.
+    """
+    os.makedirs(directorio, exist_ok=True)
+    tareas = ((expresion, os.path.join(directorio, f"arbol_{numero:06d}.{formato}"))
+              for numero, expresion in enumerate(expresiones))
+    if trabajadores <= 1:
+        return [_exportar_expresion(tarea) for tarea in tareas]
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=trabajadores) as pool:
+        return list(pool.map(_exportar_expresion, tareas, chunksize=16))
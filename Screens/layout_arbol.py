@@ -0,0 +1,151 @@
+"""
+Layout ordenado del árbol (Reingold-Tilford)
+"""
+from array import array
+
+SIN_PADRE = -1
+
+
+class LayoutArbol:
+    """
+    Posiciones calculadas para cada nodo del árbol. Los nodos se identifican por su
+    número en preorden, de modo que dos nodos nunca se confunden aunque compartan
+    coordenadas o sean el mismo subárbol compartido en dos lugares.
+    """
+
+    def __init__(self):
+        self.xs = array('d')            # Coordenada horizontal de cada nodo
+        self.profundidades = array('i')  # Nivel de cada nodo (0 en la raíz)
+        self.padres = array('i')        # Índice del padre o SIN_PADRE
+        self.etiquetas = []             # Texto a mostrar en cada nodo
+        self.ancho = 0.0
+        self.altura = 0
+
+    def __len__(self):
+        return len(self.xs)
+
+    def niveles(self):
+        """
+        Agrupa los nodos por nivel. Como los nodos están en preorden, dentro de
+        cada nivel quedan ordenados de izquierda a derecha.
+
+        Returns:
+            list: Para cada nivel, la lista de índices de sus nodos ordenados por x.
+        """
+        niveles = [[] for _ in range(self.altura + 1)] if len(self) else []
+        for indice, profundidad in enumerate(self.profundidades):
+            niveles[profundidad].append(indice)
+        return niveles
+
+
+def calcular_layout(raiz, separacion=1.0):
+    """
+    Calcula un layout ordenado del árbol en tiempo O(n), al estilo de
+    Reingold-Tilford: cada subárbol se dibuja igual donde aparezca, los padres
+    quedan centrados sobre sus hijos y los subárboles vecinos se acercan hasta
+    quedar a `separacion` en el nivel donde más se aproximan.
+
+    Los contornos de cada subárbol (x mínima y máxima por nivel) se guardan en
+    listas del nivel más profundo al más alto, con un desplazamiento común, de
+    modo que unir dos subárboles solo recorre los niveles del más bajo de ellos.
+    Todo el cálculo es iterativo.
+
+    Args:
+        raiz (Nodo): La raíz del árbol.
+        separacion (float): Distancia mínima entre nodos vecinos del mismo nivel.
+
+    Returns:
+        LayoutArbol: Las posiciones de los nodos.
+    """
+    layout = LayoutArbol()
+    if raiz is None:
+        return layout
+
+    # 1. Numerar los nodos en preorden
+    izquierdos = []
+    derechos = []
+    pila = [(raiz, SIN_PADRE, 0, 0)]
+    while pila:
+        nodo, padre, profundidad, lado = pila.pop()
+        indice = len(layout.etiquetas)
+        layout.etiquetas.append(str(nodo.valor))
+        layout.padres.append(padre)
+        layout.profundidades.append(profundidad)
+        izquierdos.append(SIN_PADRE)
+        derechos.append(SIN_PADRE)
+        if padre != SIN_PADRE:
+            if lado < 0:
+                izquierdos[padre] = indice
+            else:
+                derechos[padre] = indice
+        if profundidad > layout.altura:
+            layout.altura = profundidad
+        if nodo.der is not None:
+            pila.append((nodo.der, indice, profundidad + 1, 1))
+        if nodo.izq is not None:
+            pila.append((nodo.izq, indice, profundidad + 1, -1))
+
+    # 2. De abajo hacia arriba (preorden inverso): distancia de cada nodo a sus hijos
+    total = len(layout.etiquetas)
+    distancias = [0.0] * total
+    contornos = [None] * total  # (izquierdo, derecho, desplazamiento)
+    for indice in range(total - 1, -1, -1):
+        izq = izquierdos[indice]
+        der = derechos[indice]
+        if izq == SIN_PADRE and der == SIN_PADRE:
+            contornos[indice] = ([0.0], [0.0], 0.0)
+            continue
+        if izq == SIN_PADRE or der == SIN_PADRE:
+            # Un solo hijo: queda justo debajo del padre
+            hijo = izq if der == SIN_PADRE else der
+            contorno_izq, contorno_der, desplazamiento = contornos[hijo]
+            contornos[hijo] = None
+            contorno_izq.append(-desplazamiento)
+            contorno_der.append(-desplazamiento)
+            contornos[indice] = (contorno_izq, contorno_der, desplazamiento)
+            continue
+
+        izq_i, izq_d, desp_i = contornos[izq]
+        der_i, der_d, desp_d = contornos[der]
+        contornos[izq] = contornos[der] = None
+        comunes = min(len(izq_i), len(der_i))
+
+        # Distancia mínima para que los contornos enfrentados no se acerquen
+        # a menos de `separacion` en ningún nivel común
+        distancia = separacion / 2
+        for nivel in range(1, comunes + 1):
+            necesaria = (separacion + (izq_d[-nivel] + desp_i) -
+                         (der_i[-nivel] + desp_d)) / 2
+            if necesaria > distancia:
+                distancia = necesaria
+        distancias[indice] = distancia
+
+        # Reutilizar las listas del subárbol más alto y combinar los niveles comunes
+        if len(izq_i) >= len(der_i):
+            nuevo_i, nuevo_d = izq_i, izq_d
+            desplazamiento = desp_i - distancia
+            for nivel in range(1, comunes + 1):
+                nuevo_d[-nivel] = der_d[-nivel] + desp_d + distancia - desplazamiento
+        else:
+            nuevo_i, nuevo_d = der_i, der_d
+            desplazamiento = desp_d + distancia
+            for nivel in range(1, comunes + 1):
+                nuevo_i[-nivel] = izq_i[-nivel] + desp_i - distancia - desplazamiento
+        nuevo_i.append(-desplazamiento)
+        nuevo_d.append(-desplazamiento)
+        contornos[indice] = (nuevo_i, nuevo_d, desplazamiento)
+
+    # 3. De arriba hacia abajo (preorden): posiciones absolutas
+    xs = [0.0] * total
+    for indice in range(total):
+        x = xs[indice]
+        distancia = distancias[indice]
+        if izquierdos[indice] != SIN_PADRE:
+            xs[izquierdos[indice]] = x - distancia if derechos[indice] != SIN_PADRE else x
+        if derechos[indice] != SIN_PADRE:
+            xs[derechos[indice]] = x + distancia if izquierdos[indice] != SIN_PADRE else x
+
+    minimo = min(xs)
+    layout.xs = array('d', (x - minimo for x in xs))
+    layout.ancho = max(layout.xs)
+    return layout
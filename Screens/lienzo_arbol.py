@@ -0,0 +1,191 @@
+"""
+Lienzo de Tk para dibujar árboles grandes
+"""
+import math
+import tkinter as tk
+from bisect import bisect_left, bisect_right
+
+from Screens.layout_arbol import SIN_PADRE
+
+
+class LienzoArbol:
+    """
+    Dibuja un `LayoutArbol` directamente en un `tk.Canvas` con desplazamiento
+    (arrastrar con el botón izquierdo) y zoom (rueda del ratón). Solo se dibujan
+    los nodos visibles, y con poco zoom se omiten las etiquetas y los contornos,
+    de modo que árboles de decenas de miles de nodos siguen siendo interactivos.
+    """
+
+    ALTO_NIVEL = 1.5            # Distancia vertical entre niveles, en unidades del layout
+    ESCALA_MINIMA = 0.01        # Píxeles por unidad
+    ESCALA_MAXIMA = 200.0
+    MAX_NODOS_DIBUJADOS = 4000  # Por encima se dibuja una muestra uniforme
+
+    def __init__(self, master):
+        """
+        Crea el canvas y asocia los eventos de desplazamiento y zoom.
+
+        Args:
+            master (Widget): El contenedor donde se crea el canvas.
+        """
+        self.canvas = tk.Canvas(master, bg="#2E2E2E", highlightthickness=0)
+        self.layout = None
+        self._niveles = []
+        self._xs_niveles = []
+        self._hijos = {}
+        self.escala = 50.0
+        self.origen_x = 0.0
+        self.origen_y = 0.0
+        self._arrastre = None
+        self._redibujo_pendiente = None
+
+        self.canvas.bind("<ButtonPress-1>", self._iniciar_arrastre)
+        self.canvas.bind("<B1-Motion>", self._arrastrar)
+        self.canvas.bind("<MouseWheel>", self._rueda)
+        self.canvas.bind("<Button-4>", lambda evento: self._zoom(evento, 1.2))
+        self.canvas.bind("<Button-5>", lambda evento: self._zoom(evento, 1 / 1.2))
+        self.canvas.bind("<Configure>", lambda evento: self._programar_redibujo())
+
+    def pack(self, **opciones):
+        """
+        Ubica el canvas en su contenedor con `pack`.
+        """
+        self.canvas.pack(**opciones)
+
+    def mostrar(self, layout):
+        """
+        Muestra un nuevo layout ajustado al tamaño del canvas.
+
+        Args:
+            layout (LayoutArbol): Las posiciones de los nodos a dibujar.
+        """
+        self.layout = layout
+        self._niveles = layout.niveles()
+        self._xs_niveles = [[layout.xs[i] for i in nivel] for nivel in self._niveles]
+        self._hijos = {}
+        for indice, padre in enumerate(layout.padres):
+            if padre != SIN_PADRE:
+                self._hijos.setdefault(padre, []).append(indice)
+        self.ajustar_vista()
+
+    def ajustar_vista(self):
+        """
+        Ajusta el zoom y la posición para que el árbol completo quepa en el canvas.
+        """
+        if self.layout is None:
+            return
+        ancho = max(self.canvas.winfo_width(), 1)
+        alto = max(self.canvas.winfo_height(), 1)
+        escala = min(ancho / (self.layout.ancho + 2),
+                     alto / ((self.layout.altura + 2) * self.ALTO_NIVEL))
+        self.escala = min(max(escala, self.ESCALA_MINIMA), self.ESCALA_MAXIMA)
+        self.origen_x = self.layout.ancho / 2 - ancho / (2 * self.escala)
+        self.origen_y = -self.ALTO_NIVEL
+        self._programar_redibujo()
+
+    def _iniciar_arrastre(self, evento):
+        self._arrastre = (evento.x, evento.y)
+
+    def _arrastrar(self, evento):
+        x_anterior, y_anterior = self._arrastre
+        self.origen_x -= (evento.x - x_anterior) / self.escala
+        self.origen_y -= (evento.y - y_anterior) / self.escala
+        self._arrastre = (evento.x, evento.y)
+        self._programar_redibujo()
+
+    def _rueda(self, evento):
+        self._zoom(evento, 1.2 if evento.delta > 0 else 1 / 1.2)
+
+    def _zoom(self, evento, factor):
+        """
+        Cambia el zoom manteniendo fijo el punto bajo el cursor.
+        """
+        escala = min(max(self.escala * factor, self.ESCALA_MINIMA), self.ESCALA_MAXIMA)
+        x_mundo = self.origen_x + evento.x / self.escala
+        y_mundo = self.origen_y + evento.y / self.escala
+        self.escala = escala
+        self.origen_x = x_mundo - evento.x / escala
+        self.origen_y = y_mundo - evento.y / escala
+        self._programar_redibujo()
+
+    def _programar_redibujo(self):
+        """
+        Agrupa varios eventos seguidos en un solo redibujo.
+        """
+        if self._redibujo_pendiente is None:
+            self._redibujo_pendiente = self.canvas.after_idle(self._redibujar)
+
+    def _nodos_visibles(self, ancho, alto):
+        """
+        Busca los nodos dentro del área visible, nivel por nivel, con búsqueda binaria.
+
+        Returns:
+            list: Índices de los nodos visibles (o una muestra uniforme si son muchos).
+        """
+        margen = 1.0
+        x_min = self.origen_x - margen
+        x_max = self.origen_x + ancho / self.escala + margen
+        nivel_min = max(0, math.floor(self.origen_y / self.ALTO_NIVEL))
+        nivel_max = min(len(self._niveles) - 1,
+                        math.ceil((self.origen_y + alto / self.escala) / self.ALTO_NIVEL))
+        rangos = []
+        total = 0
+        for nivel in range(nivel_min, nivel_max + 1):
+            xs = self._xs_niveles[nivel]
+            inicio = bisect_left(xs, x_min)
+            fin = bisect_right(xs, x_max)
+            if fin > inicio:
+                rangos.append((nivel, inicio, fin))
+                total += fin - inicio
+        paso = max(1, math.ceil(total / self.MAX_NODOS_DIBUJADOS))
+        visibles = []
+        for nivel, inicio, fin in rangos:
+            visibles.extend(self._niveles[nivel][inicio:fin:paso])
+        return visibles
+
+    def _redibujar(self):
+        """
+        Dibuja las aristas y los nodos visibles con el nivel de detalle del zoom actual.
+        """
+        self._redibujo_pendiente = None
+        self.canvas.delete("all")
+        if self.layout is None or not len(self.layout):
+            return
+        ancho = self.canvas.winfo_width()
+        alto = self.canvas.winfo_height()
+        visibles = self._nodos_visibles(ancho, alto)
+        conjunto_visibles = set(visibles)
+
+        xs = self.layout.xs
+        profundidades = self.layout.profundidades
+        escala = self.escala
+        origen_x = self.origen_x
+        origen_y = self.origen_y
+        alto_nivel = self.ALTO_NIVEL
+
+        def pantalla(indice):
+            return ((xs[indice] - origen_x) * escala,
+                    (profundidades[indice] * alto_nivel - origen_y) * escala)
+
+        # Aristas: hacia los hijos de cada nodo visible y hacia el padre si no es visible
+        for indice in visibles:
+            x, y = pantalla(indice)
+            for hijo in self._hijos.get(indice, ()):
+                self.canvas.create_line(x, y, *pantalla(hijo), fill="lightgreen")
+            padre = self.layout.padres[indice]
+            if padre != SIN_PADRE and padre not in conjunto_visibles:
+                self.canvas.create_line(x, y, *pantalla(padre), fill="lightgreen")
+
+        # Nodos: círculos con etiqueta, círculos sin etiqueta o puntos según el zoom
+        radio = 0.3 * escala
+        tamano_fuente = int(radio * 0.7)
+        for indice in visibles:
+            x, y = pantalla(indice)
+            if radio >= 2:
+                self.canvas.create_oval(x - radio, y - radio, x + radio, y + radio,
+                                        fill="skyblue", outline="")
+                if tamano_fuente >= 6:
+                    self.canvas.create_text(x, y, text=self.layout.etiquetas[indice],
+                                            font=("Arial", tamano_fuente, "bold"))
+            else:
+                self.canvas.create_rectangle(x, y, x + 1, y + 1, outline="skyblue")
@@ -0,0 +1,111 @@
+"""
+Panel de diagnóstico: tiempos, memoria y nodos de cada etapa
+"""
+import tkinter as tk
+from tkinter import filedialog
+
+
+class PanelDiagnostico:
+    """
+    Ventana secundaria que muestra las estadísticas de la instrumentación por
+    etapa y permite activarla, limpiarla y guardar la traza en JSON.
+    """
+
+    def __init__(self, root, estadisticas, activar, limpiar, guardar_traza, activa=False):
+        """
+        Crea la ventana y muestra las estadísticas actuales.
+
+        Args:
+            root (Tk): La ventana principal de Tkinter.
+            estadisticas (func): Devuelve el resumen por etapa de `Instrumentacion.estadisticas()`.
+            activar (func): Recibe True o False para activar o desactivar la medición.
+            limpiar (func): Descarta las mediciones.
+            guardar_traza (func): Recibe la ruta donde escribir la traza JSON.
+            activa (bool): Si la instrumentación está activa al abrir el panel.
+        """
+        self._estadisticas = estadisticas
+        self._activar = activar
+        self._limpiar = limpiar
+        self._guardar_traza = guardar_traza
+
+        self.ventana = tk.Toplevel(root)
+        self.ventana.title("Diagnóstico")
+        self.ventana.configure(bg='#2E2E2E')
+        self.activa = tk.BooleanVar(value=activa)
+        tk.Checkbutton(
+            self.ventana, text="Instrumentación activa", variable=self.activa,
+            command=self._cambiar_activa, font=("Arial", 11), fg="white",
+            bg="#2E2E2E", selectcolor="#333", activebackground="#2E2E2E",
+            activeforeground="white").pack(pady=5)
+        self.tabla = tk.Text(self.ventana, height=14, width=86, font=("Courier", 10),
+                             bg="#333", fg="white", state=tk.DISABLED)
+        self.tabla.pack(padx=10, pady=5)
+
+        fila = tk.Frame(self.ventana, bg="#2E2E2E")
+        fila.pack(pady=5)
+        for texto, comando in (("Actualizar", self.actualizar),
+                               ("Limpiar", self._limpiar_mediciones),
+                               ("Guardar traza JSON", self._guardar)):
+            tk.Button(fila, text=texto, command=comando, bg="#2196F3", fg="white",
+                      font=("Arial", 11, "bold")).pack(side=tk.LEFT, padx=5)
+        self.actualizar()
+
+    def existe(self):
+        """
+        Indica si la ventana sigue abierta.
+
+        Returns:
+            bool: True si el usuario no la ha cerrado.
+        """
+        return bool(self.ventana.winfo_exists())
+
+    def mostrar(self):
+        """
+        Trae la ventana al frente y refresca las estadísticas.
+        """
+        self.ventana.deiconify()
+        self.ventana.lift()
+        self.actualizar()
+
+    def actualizar(self):
+        """
+        Vuelve a leer las estadísticas y las escribe como tabla.
+        """
+        lineas = [f"{'etapa':<20} {'veces':>6} {'media ms':>10} {'máx ms':>10} "
+                  f"{'última ms':>10} {'pico KiB':>10} {'nodos':>10}"]
+        for nombre, datos in self._estadisticas().items():
+            pico = "-" if datos['pico'] is None else f"{datos['pico'] / 1024:.1f}"
+            nodos = "-" if datos['nodos'] is None else str(datos['nodos'])
+            lineas.append(
+                f"{nombre:<20} {datos['veces']:>6} {datos['media'] * 1000:>10.3f} "
+                f"{datos['maximo'] * 1000:>10.3f} {datos['ultima'] * 1000:>10.3f} "
+                f"{pico:>10} {nodos:>10}")
+        if len(lineas) == 1:
+            lineas.append("Sin mediciones. Active la instrumentación y genere un árbol.")
+        self.tabla.config(state=tk.NORMAL)
+        self.tabla.delete(1.0, tk.END)
+        self.tabla.insert(tk.END, "\n".join(lineas))
+        self.tabla.config(state=tk.DISABLED)
+
+    def _cambiar_activa(self):
+        """
+        Activa o desactiva la medición según la casilla.
+        """
+        self._activar(self.activa.get())
+
+    def _limpiar_mediciones(self):
+        """
+        Descarta las mediciones y vacía la tabla.
+        """
+        self._limpiar()
+        self.actualizar()
+
+    def _guardar(self):
+        """
+        Pide una ruta y guarda ahí la traza JSON.
+        """
+        ruta = filedialog.asksaveasfilename(
+            parent=self.ventana, defaultextension=".json",
+            filetypes=[("Traza JSON", "*.json")], title="Guardar traza")
+        if ruta:
+            self._guardar_traza(ruta)
@@ -0,0 +1,174 @@
+"""
+Panel de resultado paginado para recorridos de cualquier tamaño
+"""
+import tkinter as tk
+
+
+class PanelResultado:
+    """
+    Área de texto de solo lectura para un resultado que puede tener megabytes
+    (el recorrido de un árbol grande es una sola línea enorme). Para que la
+    ventana no se congele:
+
+    - El texto se obtiene de forma perezosa: `mostrar` acepta un texto o un
+      iterable de fragmentos (por ejemplo `ArbolDeExpresion.recorrer_inorden`),
+      del que solo se consume lo necesario para llenar la página visible y la
+      siguiente.
+    - El texto se divide en páginas de `TAMANO_PAGINA` caracteres; los botones ◀ y
+      ▶ cambian de página y las ya obtenidas se guardan para volver atrás.
+    - Cada página se inserta en bloques de `TAMANO_BLOQUE` caracteres, uno por
+      callback de `after`, así que la interfaz sigue atendiendo eventos mientras
+      se llena.
+    - Las líneas se cortan por carácter (`wrap=char`), con barra de desplazamiento.
+    """
+
+    TAMANO_PAGINA = 1 << 16   # Caracteres por página
+    TAMANO_BLOQUE = 1 << 13   # Caracteres insertados por callback
+
+    def __init__(self, master, titulo, separador="  "):
+        """
+        Crea el encabezado (título y navegación) y el área de texto.
+
+        Args:
+            master (Widget): El contenedor donde se crea el panel.
+            titulo (str): El texto que describe el resultado.
+            separador (str): El texto entre dos fragmentos de un iterable.
+        """
+        self.separador = separador
+        self.marco = tk.Frame(master, bg="#2E2E2E")
+        encabezado = tk.Frame(self.marco, bg="#2E2E2E")
+        encabezado.pack(fill=tk.X)
+        tk.Label(encabezado, text=titulo, font=("Arial", 12), fg="white",
+                 bg="#2E2E2E").pack(side=tk.LEFT, padx=5)
+        self.boton_siguiente = tk.Button(encabezado, text="▶", width=2, state=tk.DISABLED,
+                                         command=lambda: self.ir_a_pagina(self._actual + 1))
+        self.boton_siguiente.pack(side=tk.RIGHT)
+        self.etiqueta_pagina = tk.Label(encabezado, text="", font=("Arial", 10),
+                                        fg="white", bg="#2E2E2E")
+        self.etiqueta_pagina.pack(side=tk.RIGHT, padx=5)
+        self.boton_anterior = tk.Button(encabezado, text="◀", width=2, state=tk.DISABLED,
+                                        command=lambda: self.ir_a_pagina(self._actual - 1))
+        self.boton_anterior.pack(side=tk.RIGHT)
+
+        cuerpo = tk.Frame(self.marco, bg="#2E2E2E")
+        cuerpo.pack(fill=tk.X)
+        self.texto = tk.Text(cuerpo, height=2, width=50, font=("Arial", 12), bg="#333",
+                             fg="white", wrap=tk.CHAR, state=tk.DISABLED)
+        barra = tk.Scrollbar(cuerpo, command=self.texto.yview)
+        self.texto.config(yscrollcommand=barra.set)
+        self.texto.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        barra.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self._fuente = iter(())
+        self._agotada = True
+        self._primero = True
+        self._resto = ""
+        self._paginas = []
+        self._actual = 0
+        self._pagina = ""
+        self._insertados = 0
+        self._pendiente = None
+
+    def pack(self, **opciones):
+        """
+        Ubica el panel en su contenedor con `pack`.
+        """
+        self.marco.pack(**opciones)
+
+    def mostrar(self, contenido):
+        """
+        Reemplaza el contenido del panel y muestra su primera página.
+
+        Args:
+            contenido (str | iterable): El texto, o fragmentos de texto que se
+                                        unen con `separador` a medida que se leen.
+        """
+        if isinstance(contenido, str):
+            contenido = (contenido,)
+        self._fuente = iter(contenido)
+        self._agotada = False
+        self._primero = True
+        self._resto = ""
+        self._paginas = []
+        self._cargar_pagina()
+        self.ir_a_pagina(0)
+
+    def _cargar_pagina(self):
+        """
+        Lee de la fuente los fragmentos necesarios para una página más.
+
+        Returns:
+            bool: True si se agregó una página.
+        """
+        partes = [self._resto]
+        largo = len(self._resto)
+        while largo < self.TAMANO_PAGINA and not self._agotada:
+            fragmento = next(self._fuente, None)
+            if fragmento is None:
+                self._agotada = True
+                break
+            if not self._primero:
+                partes.append(self.separador)
+                largo += len(self.separador)
+            self._primero = False
+            partes.append(fragmento)
+            largo += len(fragmento)
+        texto = "".join(partes)
+        self._resto = texto[self.TAMANO_PAGINA:]
+        texto = texto[:self.TAMANO_PAGINA]
+        if not texto and self._paginas:
+            return False
+        self._paginas.append(texto)
+        return True
+
+    def ir_a_pagina(self, numero):
+        """
+        Muestra una página, leyendo de la fuente la siguiente para saber si existe.
+
+        Args:
+            numero (int): Número de página, desde 0.
+        """
+        if not 0 <= numero < len(self._paginas):
+            return
+        if self._pendiente is not None:
+            self.texto.after_cancel(self._pendiente)
+            self._pendiente = None
+        if numero + 1 == len(self._paginas):
+            self._cargar_pagina()
+        self._actual = numero
+        self._pagina = self._paginas[numero]
+        self._insertados = 0
+        self.texto.config(state=tk.NORMAL)
+        self.texto.delete(1.0, tk.END)
+        self.texto.config(state=tk.DISABLED)
+        self._insertar_bloque()
+        self._actualizar_navegacion()
+
+    def _insertar_bloque(self):
+        """
+        Inserta el siguiente bloque de la página actual y programa el resto.
+        """
+        self._pendiente = None
+        inicio = self._insertados
+        fin = inicio + self.TAMANO_BLOQUE
+        self.texto.config(state=tk.NORMAL)
+        self.texto.insert(tk.END, self._pagina[inicio:fin])
+        self.texto.config(state=tk.DISABLED)
+        self._insertados = fin
+        if fin < len(self._pagina):
+            self._pendiente = self.texto.after(1, self._insertar_bloque)
+
+    def _actualizar_navegacion(self):
+        """
+        Habilita los botones según las páginas disponibles y muestra la página actual.
+        """
+        total = len(self._paginas)
+        hay_mas = not (self._agotada and not self._resto)
+        self.boton_anterior.config(state=tk.NORMAL if self._actual > 0 else tk.DISABLED)
+        self.boton_siguiente.config(
+            state=tk.NORMAL if self._actual + 1 < total else tk.DISABLED)
+        if total > 1:
+            self.etiqueta_pagina.config(
+                text=f"{self._actual + 1}/{total}{'+' if hay_mas else ''}")
+        else:
+            self.etiqueta_pagina.config(text="")
@@ -2,7 +2,11 @@
     Views de la interfaz gráfica de la aplicación de Árbol de Expresión Aritmética.
 """
 import tkinter as tk
-from tkinter import messagebox
+from tkinter import messagebox, ttk
+
+from Screens.lienzo_arbol import LienzoArbol
+from Screens.panel_diagnostico import PanelDiagnostico
+from Screens.panel_resultado import PanelResultado
 
 
 class Vista:
@@ -18,6 +22,7 @@ class Vista:
             root (Tk): La ventana principal de Tkinter.
         """
         self.root = root
+        self.panel_diagnostico = None
         self._configurar_ventana()
         self._crear_widgets()
 
@@ -26,7 +31,7 @@ class Vista:
         Configura la ventana principal de la aplicación con título, tamaño y color de fondo.
         """
         self.root.title("Generador de Árbol de Expresión Aritmética")
-        self.root.geometry("600x600")
+        self.root.geometry("900x900")
         self.root.configure(bg='#2E2E2E')
 
     def _crear_widgets(self):
@@ -34,7 +39,18 @@ class Vista:
         Crea los widgets de la interfaz gráfica como etiquetas, campos de texto y botones.
         """
         self._crear_label("Ingrese la expresión aritmética:")
+        self.expresion = tk.StringVar()
         self.entry = self._crear_entry()
+        self.modo_vivo = tk.BooleanVar(value=False)
+        self.check_vivo = tk.Checkbutton(
+            self.root, text="Evaluar mientras escribe", variable=self.modo_vivo,
+            font=("Arial", 11), fg="white", bg="#2E2E2E", selectcolor="#333",
+            activebackground="#2E2E2E", activeforeground="white")
+        self.check_vivo.pack()
+        self.estado = tk.Label(self.root, text="", font=("Arial", 11),
+                               fg="#FF8A80", bg="#2E2E2E")
+        self.estado.pack()
+        self._crear_progreso()
         self.generate_button = self._crear_boton("Generar Árbol", "#4CAF50")
         self.result_text_inorden = self._crear_resultado("Resultado Inorden:")
         self.result_text_preorden = self._crear_resultado(
@@ -44,6 +60,9 @@ class Vista:
         self.result_text_evaluacion = self._crear_resultado(
             "Resultado Evaluación:")
         self.graph_button = self._crear_boton("Graficar Árbol", "#2196F3")
+        self.diagnostico_button = self._crear_boton("Diagnóstico", "#607D8B")
+        self.lienzo = LienzoArbol(self.root)
+        self.lienzo.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
 
     def _crear_label(self, texto):
         """
@@ -64,10 +83,27 @@ class Vista:
             Entry: El widget de entrada de texto.
         """
         entry = tk.Entry(self.root, width=50, font=(
-            "Arial", 12), bg="#333", fg="white")
+            "Arial", 12), bg="#333", fg="white", textvariable=self.expresion)
         entry.pack(pady=10)
         return entry
 
+    def _crear_progreso(self):
+        """
+        Crea la fila de progreso: la etapa en curso, una barra y el botón para
+        cancelar la tarea. La fila siempre ocupa su lugar para que la ventana no
+        salte al mostrarla.
+        """
+        fila = tk.Frame(self.root, bg="#2E2E2E")
+        fila.pack(pady=5)
+        self.etapa = tk.Label(fila, text="", width=24, anchor="e", font=(
+            "Arial", 11), fg="white", bg="#2E2E2E")
+        self.etapa.pack(side=tk.LEFT, padx=5)
+        self.barra_progreso = ttk.Progressbar(fila, length=250, maximum=1.0)
+        self.barra_progreso.pack(side=tk.LEFT, padx=5)
+        self.cancel_button = tk.Button(fila, text="Cancelar", bg="#F44336", fg="white",
+                                       font=("Arial", 11, "bold"), state=tk.DISABLED)
+        self.cancel_button.pack(side=tk.LEFT, padx=5)
+
     def _crear_boton(self, texto, color_fondo):
         """
         Crea un botón con el texto y color de fondo especificado.
@@ -86,30 +122,74 @@ class Vista:
 
     def _crear_resultado(self, texto):
         """
-        Crea un área de texto para mostrar resultados de los recorridos del árbol.
+        Crea un panel paginado para mostrar resultados de los recorridos del árbol.
 
         Args:
             texto (str): El texto que describe el tipo de recorrido (inorden, preorden, etc.).
 
         Returns:
-            Text: El widget de área de texto para mostrar el resultado.
+            PanelResultado: El panel donde se muestra el resultado.
         """
-        self._crear_label(texto)
-        result_text = tk.Text(self.root, height=2, width=50, font=(
-            "Arial", 12), bg="#333", fg="white", state=tk.DISABLED)
-        result_text.pack(pady=5)
-        return result_text
+        panel = PanelResultado(self.root, texto)
+        panel.pack(pady=5)
+        return panel
 
-    def configurar_comandos(self, generar_arbol_callback, graficar_arbol_callback):
+    def configurar_comandos(self, generar_arbol_callback, graficar_arbol_callback,
+                            expresion_modificada_callback=None, cancelar_callback=None,
+                            diagnostico_callback=None):
         """
         Asigna las funciones callback a los botones de la interfaz.
 
         Args:
             generar_arbol_callback (func): Función que se llama al generar el árbol.
             graficar_arbol_callback (func): Función que se llama al graficar el árbol.
+            expresion_modificada_callback (func): Función que se llama cada vez que
+                                                  cambia el texto de la expresión o
+                                                  se activa el modo en vivo.
+            cancelar_callback (func): Función que se llama al cancelar la tarea en curso.
+            diagnostico_callback (func): Función que se llama al abrir el diagnóstico.
         """
         self.generate_button.config(command=generar_arbol_callback)
         self.graph_button.config(command=graficar_arbol_callback)
+        if expresion_modificada_callback is not None:
+            self.expresion.trace_add(
+                "write", lambda *_: expresion_modificada_callback())
+            self.check_vivo.config(command=expresion_modificada_callback)
+        if cancelar_callback is not None:
+            self.cancel_button.config(command=cancelar_callback)
+        if diagnostico_callback is not None:
+            self.diagnostico_button.config(command=diagnostico_callback)
+
+    def modo_vivo_activo(self):
+        """
+        Indica si la expresión se debe evaluar mientras se escribe.
+
+        Returns:
+            bool: True si la casilla del modo en vivo está marcada.
+        """
+        return self.modo_vivo.get()
+
+    def programar(self, retardo_ms, funcion):
+        """
+        Programa una función para ejecutarse en el hilo de la interfaz.
+
+        Args:
+            retardo_ms (int): Milisegundos de espera.
+            funcion (func): La función a ejecutar.
+
+        Returns:
+            str: Identificador para cancelar la ejecución con `cancelar`.
+        """
+        return self.root.after(retardo_ms, funcion)
+
+    def cancelar(self, identificador):
+        """
+        Cancela una función programada con `programar` que aún no se ejecutó.
+
+        Args:
+            identificador (str): El identificador devuelto por `programar`.
+        """
+        self.root.after_cancel(identificador)
 
     def obtener_expresion(self):
         """
@@ -123,12 +203,13 @@ class Vista:
     def mostrar_resultados(self, inorden, preorden, postorden, evaluacion):
         """
         Actualiza los campos de resultados con los recorridos del árbol y 
-        el resultado de la evaluación.
+        el resultado de la evaluación. Los recorridos pueden ser generadores
+        (`ArbolDeExpresion.recorrer_*`): cada panel solo consume lo que muestra.
 
         Args:
-            inorden (str): Recorrido inorden del árbol.
-            preorden (str): Recorrido preorden del árbol.
-            postorden (str): Recorrido postorden del árbol.
+            inorden (str | iterable): Recorrido inorden del árbol.
+            preorden (str | iterable): Recorrido preorden del árbol.
+            postorden (str | iterable): Recorrido postorden del árbol.
             evaluacion (str): Resultado de la evaluación del árbol.
         """
         self._actualizar_campo(self.result_text_inorden, inorden)
@@ -136,18 +217,81 @@ class Vista:
         self._actualizar_campo(self.result_text_postorden, postorden)
         self._actualizar_campo(self.result_text_evaluacion, evaluacion)
 
-    def _actualizar_campo(self, campo_texto, texto):
+    def mostrar_evaluacion(self, evaluacion):
+        """
+        Actualiza solo el campo de la evaluación, sin tocar los recorridos.
+
+        Args:
+            evaluacion (str): Resultado de la evaluación del árbol.
+        """
+        self._actualizar_campo(self.result_text_evaluacion, evaluacion)
+
+    def mostrar_estado(self, mensaje):
+        """
+        Muestra un mensaje breve bajo la entrada (por ejemplo, el error de la
+        expresión mientras se escribe) sin abrir un cuadro de diálogo.
+
+        Args:
+            mensaje (str): El mensaje a mostrar; vacío para ocultarlo.
+        """
+        self.estado.config(text=mensaje)
+
+    def mostrar_progreso(self, etapa, fraccion):
+        """
+        Muestra la etapa y el avance de la tarea en curso y habilita el botón
+        para cancelarla.
+
+        Args:
+            etapa (str): Descripción de lo que se está haciendo.
+            fraccion (float): Avance entre 0 y 1.
+        """
+        self.etapa.config(text=etapa)
+        self.barra_progreso.config(value=fraccion)
+        self.cancel_button.config(state=tk.NORMAL)
+
+    def ocultar_progreso(self):
+        """
+        Limpia la fila de progreso y deshabilita el botón de cancelar.
+        """
+        self.etapa.config(text="")
+        self.barra_progreso.config(value=0.0)
+        self.cancel_button.config(state=tk.DISABLED)
+
+    def _actualizar_campo(self, panel, texto):
+        """
+        Actualiza un panel de resultado con el contenido proporcionado.
+
+        Args:
+            panel (PanelResultado): El panel a actualizar.
+            texto (str | iterable): El texto, o sus fragmentos, a mostrar.
+        """
+        panel.mostrar(texto)
+
+    def mostrar_arbol(self, layout):
+        """
+        Dibuja el árbol en el lienzo de la ventana.
+
+        Args:
+            layout (LayoutArbol): Las posiciones calculadas de los nodos.
+        """
+        self.lienzo.mostrar(layout)
+
+    def abrir_diagnostico(self, estadisticas, activar, limpiar, guardar_traza, activa):
         """
-        Actualiza un campo de texto con el contenido proporcionado.
+        Abre el panel de diagnóstico, o lo trae al frente si ya está abierto.
 
         Args:
-            campo_texto (Text): El widget de área de texto a actualizar.
-            texto (str): El texto que se mostrará en el área de texto.
+            estadisticas (func): Devuelve el resumen de las mediciones por etapa.
+            activar (func): Recibe True o False para activar o desactivar la medición.
+            limpiar (func): Descarta las mediciones.
+            guardar_traza (func): Recibe la ruta donde escribir la traza JSON.
+            activa (bool): Si la instrumentación está activa.
         """
-        campo_texto.config(state=tk.NORMAL)
-        campo_texto.delete(1.0, tk.END)
-        campo_texto.insert(tk.END, texto)
-        campo_texto.config(state=tk.DISABLED)
+        if self.panel_diagnostico is not None and self.panel_diagnostico.existe():
+            self.panel_diagnostico.mostrar()
+            return
+        self.panel_diagnostico = PanelDiagnostico(
+            self.root, estadisticas, activar, limpiar, guardar_traza, activa)
 
     def mostrar_error(self, titulo, mensaje):
         """
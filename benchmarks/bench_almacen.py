@@ -0,0 +1,72 @@
+"""
+Benchmark: bytes por nodo y tiempo de construcción de los nodos `Nodo`
+contra el almacén compacto de arreglos paralelos.
+
+Uso:
+    python -m benchmarks.bench_almacen
+"""
+import random
+import time
+import tracemalloc
+
+from Modelos.arbol import ArbolDeExpresion
+
+TAMANOS = (10 ** 4, 10 ** 5, 10 ** 6)
+
+
+def generar_expresion(num_operandos, semilla=0):
+    """
+    Genera una expresión plana con `num_operandos` números y operadores aleatorios.
+
+    Args:
+        num_operandos (int): Cantidad de números de la expresión.
+        semilla (int): Semilla del generador aleatorio.
+
+    Returns:
+        str: La expresión generada.
+    """
+    aleatorio = random.Random(semilla)
+    partes = [str(aleatorio.randint(1, 99))]
+    for _ in range(num_operandos - 1):
+        partes.append(aleatorio.choice('+-*/'))
+        partes.append(str(aleatorio.randint(1, 99)))
+    return ''.join(partes)
+
+
+def medir(expresion, compacto):
+    """
+    Construye el árbol y mide la memoria retenida y el tiempo de construcción.
+
+    Returns:
+        tuple: (nodos, bytes por nodo, segundos de construcción)
+    """
+    arbol = ArbolDeExpresion()
+    inicio = time.perf_counter()
+    arbol.construir_arbol(expresion, compacto=compacto)
+    segundos = time.perf_counter() - inicio
+
+    arbol = ArbolDeExpresion()
+    tracemalloc.start()
+    arbol.construir_arbol(expresion, compacto=compacto)
+    retenido, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    nodos = len(arbol.compilar())
+    return nodos, retenido / nodos, segundos
+
+
+def main():
+    """
+    Ejecuta el benchmark e imprime una tabla con los resultados.
+    """
+    print(f"{'nodos':>10} {'Nodo B/nodo':>12} {'Nodo s':>9} "
+          f"{'compacto B/nodo':>16} {'compacto s':>11}")
+    for tamano in TAMANOS:
+        expresion = generar_expresion((tamano + 1) // 2)
+        nodos, bytes_nodo, segundos = medir(expresion, compacto=False)
+        _, bytes_compacto, segundos_compacto = medir(expresion, compacto=True)
+        print(f"{nodos:>10} {bytes_nodo:>12.1f} {segundos:>9.3f} "
+              f"{bytes_compacto:>16.1f} {segundos_compacto:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
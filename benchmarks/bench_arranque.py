@@ -0,0 +1,71 @@
+"""
+Benchmark: tiempo de importación al arrancar, medido con `python -X importtime`,
+para la ruta de la interfaz gráfica y para la ruta sin interfaz (modelo y lotes).
+
+Uso:
+    python -m benchmarks.bench_arranque
+"""
+import os
+import subprocess
+import sys
+import time
+
+RUTAS = {
+    'gui': "import tkinter; import Controllers.controller_arbol; import Screens.view",
+    'sin interfaz': "import Modelos.arbol; import Controllers.controller_batch",
+}
+MODULOS_PESADOS = ('matplotlib', 'numpy')
+REPETICIONES = 5
+
+
+def medir(codigo):
+    """
+    Importa `codigo` en un intérprete nuevo con `-X importtime`.
+
+    Args:
+        codigo (str): Sentencias de importación a ejecutar.
+
+    Returns:
+        tuple: (segundos de pared, microsegundos acumulados por módulo de primer nivel,
+                módulos pesados cargados, los 5 módulos más costosos)
+    """
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    inicio = time.perf_counter()
+    proceso = subprocess.run([sys.executable, '-X', 'importtime', '-c', codigo],
+                             cwd=raiz, capture_output=True, text=True, check=True)
+    segundos = time.perf_counter() - inicio
+
+    total = 0
+    modulos = []
+    for linea in proceso.stderr.splitlines():
+        if not linea.startswith('import time:') or 'cumulative' in linea:
+            continue
+        _, acumulado, nombre = linea[len('import time:'):].split('|')
+        modulos.append((int(acumulado), nombre.strip()))
+        # Los módulos de primer nivel llevan un solo espacio de sangría
+        if not nombre[1:].startswith(' '):
+            total += int(acumulado)
+    cargados = sorted({nombre.split('.')[0] for _, nombre in modulos}
+                      & set(MODULOS_PESADOS))
+    mas_costosos = sorted(modulos, reverse=True)[:5]
+    return segundos, total, cargados, mas_costosos
+
+
+def main():
+    """
+    Ejecuta el benchmark e imprime los resultados de cada ruta.
+    """
+    for ruta, codigo in RUTAS.items():
+        mediciones = [medir(codigo) for _ in range(REPETICIONES)]
+        segundos = min(m[0] for m in mediciones)
+        importacion = min(m[1] for m in mediciones)
+        _, _, cargados, mas_costosos = mediciones[-1]
+        print(f"[{ruta}] arranque {segundos * 1000:.1f} ms, "
+              f"importaciones {importacion / 1000:.1f} ms, "
+              f"módulos pesados: {', '.join(cargados) or 'ninguno'}")
+        for acumulado, nombre in mas_costosos:
+            print(f"    {acumulado / 1000:8.1f} ms  {nombre}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark: exportación de miles de árboles a PNG con `ExportadorArbol`. Imprime
+el tiempo por imagen y la memoria residente cada `INTERVALO` exportaciones, que
+debe mantenerse plana porque la figura y el canvas Agg se reutilizan.
+
+Uso:
+    python -m benchmarks.bench_exportacion [numero_de_imagenes]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from Modelos.arbol import ArbolDeExpresion
+from Screens.exportador_arbol import ExportadorArbol, exportar_lote
+from benchmarks.bench_almacen import generar_expresion
+
+INTERVALO = 1000
+
+
+def memoria_residente():
+    """
+    Memoria residente del proceso en MB, leída de /proc (solo Linux).
+
+    Returns:
+        float: Los MB residentes, o NaN si no se pueden leer.
+    """
+    try:
+        with open('/proc/self/statm') as statm:
+            paginas = int(statm.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return float('nan')
+    return paginas * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+
+
+def main():
+    """
+    Ejecuta el benchmark e imprime los resultados.
+    """
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    exportador = ExportadorArbol(dpi=50)
+    arboles = []
+    for semilla in range(16):
+        arbol = ArbolDeExpresion()
+        arbol.construir_arbol(generar_expresion(8 + semilla, semilla))
+        arboles.append(arbol.raiz)
+
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, 'arbol.png')
+        inicio = time.perf_counter()
+        for numero in range(1, total + 1):
+            exportador.exportar(arboles[numero % len(arboles)], ruta)
+            if numero % INTERVALO == 0:
+                segundos = time.perf_counter() - inicio
+                print(f"{numero:>7} imágenes  {segundos / numero * 1000:6.2f} ms/imagen  "
+                      f"RSS {memoria_residente():7.1f} MB")
+
+        expresiones = [generar_expresion(8 + n % 16, n) for n in range(200)]
+        for trabajadores in (1, os.cpu_count() or 1):
+            inicio = time.perf_counter()
+            exportar_lote(expresiones, directorio, trabajadores=trabajadores)
+            segundos = time.perf_counter() - inicio
+            print(f"exportar_lote: {len(expresiones)} imágenes con {trabajadores} "
+                  f"proceso(s) en {segundos:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
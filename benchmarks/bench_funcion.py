@@ -0,0 +1,89 @@
+"""
+Benchmark: llamadas por segundo de una fórmula con variables escalares, con el
+árbol interpretado, el programa postfijo y la función nativa compilada.
+
+Uso:
+    python -m benchmarks.bench_funcion
+"""
+import random
+import sys
+import time
+
+from Modelos.arbol import ArbolDeExpresion
+
+TAMANOS = (7, 31, 255, 2047)
+VARIABLES = ('x', 'y', 'z')
+LLAMADAS = 20_000
+
+
+def generar_formula(num_nodos, semilla=0):
+    """
+    Genera una fórmula balanceada con `num_nodos` nodos cuyas hojas son números
+    y las variables de `VARIABLES`.
+
+    Args:
+        num_nodos (int): Número de nodos del árbol.
+        semilla (int): Semilla del generador aleatorio.
+
+    Returns:
+        str: La fórmula generada.
+    """
+    aleatorio = random.Random(semilla)
+    nivel = [aleatorio.choice(VARIABLES) if aleatorio.random() < 0.5
+             else f"{aleatorio.uniform(1.0, 2.0):.3f}"
+             for _ in range((num_nodos + 1) // 2)]
+    while len(nivel) > 1:
+        siguiente = [f"({nivel[i]} {aleatorio.choice('+-*')} {nivel[i + 1]})"
+                     for i in range(0, len(nivel) - 1, 2)]
+        if len(nivel) % 2:
+            siguiente.append(nivel[-1])
+        nivel = siguiente
+    return nivel[0]
+
+
+def llamadas_por_segundo(funcion, entradas):
+    """
+    Llama a `funcion` con cada entrada y devuelve las llamadas por segundo del
+    mejor de tres intentos.
+    """
+    mejor = float('inf')
+    for _ in range(3):
+        inicio = time.perf_counter()
+        for entrada in entradas:
+            funcion(entrada)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return len(entradas) / mejor
+
+
+def main():
+    """
+    Ejecuta el benchmark e imprime una tabla con los resultados.
+    """
+    aleatorio = random.Random(1)
+    entradas = [{nombre: aleatorio.uniform(0.5, 1.5) for nombre in VARIABLES}
+                for _ in range(LLAMADAS)]
+    print(f"{'nodos':>7} {'árbol llam/s':>14} {'postfijo llam/s':>16} "
+          f"{'función llam/s':>15} {'vs árbol':>9} {'compilar ms':>12}")
+    for tamano in TAMANOS:
+        arbol = ArbolDeExpresion()
+        arbol.construir_arbol(generar_formula(tamano))
+        inicio = time.perf_counter()
+        funcion = arbol.compilar_funcion()
+        compilar = (time.perf_counter() - inicio) * 1000
+        nombres = funcion.nombres_variables
+        argumentos = [tuple(entrada[nombre] for nombre in nombres) for entrada in entradas]
+        for entrada, tupla in zip(entradas[:100], argumentos):
+            assert funcion(*tupla) == arbol.evaluar_arbol(arbol.raiz, entrada)
+
+        cantidad = max(200, LLAMADAS * 7 // tamano)
+        interpretado = llamadas_por_segundo(
+            lambda entrada: arbol.evaluar_arbol(arbol.raiz, entrada), entradas[:cantidad])
+        postfijo = llamadas_por_segundo(arbol.evaluar_compilado, entradas[:cantidad])
+        nativo = llamadas_por_segundo(lambda tupla: funcion(*tupla), argumentos)
+        print(f"{tamano:>7} {interpretado:>14.0f} {postfijo:>16.0f} {nativo:>15.0f} "
+              f"{nativo / interpretado:>8.1f}x {compilar:>12.2f}")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
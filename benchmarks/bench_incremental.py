@@ -0,0 +1,93 @@
+"""
+Benchmark: análisis y evaluación en vivo con `AnalizadorIncremental` contra
+reconstruir y evaluar el árbol completo en cada edición, sobre una expresión de
+unos 100k caracteres. Se mide escribir al final, editar en medio y editar al
+principio; el objetivo es quedar por debajo de un cuadro (16.7 ms).
+
+Uso:
+    python -m benchmarks.bench_incremental
+"""
+import time
+
+from Modelos.analizador_incremental import AnalizadorIncremental
+from Modelos.arbol import ArbolDeExpresion
+from Modelos.lexer import ErrorLexico
+from benchmarks.bench_lexer import generar_expresion
+
+TAMANO = 100_000
+EDICIONES = 200
+
+
+def ediciones(expresion, posicion):
+    """
+    Genera versiones sucesivas de la expresión como si se escribiera y borrara
+    un dígito dentro del número que empieza en `posicion`.
+
+    Yields:
+        str: La expresión tras cada pulsación.
+    """
+    for numero in range(EDICIONES):
+        digito = str(numero % 9 + 1)
+        yield expresion[:posicion] + digito + expresion[posicion:]
+        yield expresion
+
+
+def medir(nombre, versiones, analizador):
+    """
+    Aplica cada versión con el analizador incremental y con una reconstrucción
+    completa, e imprime el tiempo medio y el peor por edición.
+    """
+    versiones = list(versiones)
+    tiempos = []
+    for texto in versiones:
+        inicio = time.perf_counter()
+        try:
+            analizador.actualizar(texto)
+            analizador.evaluar()
+        except ErrorLexico:
+            pass  # Estados intermedios al escribir: el error también se mide
+        tiempos.append(time.perf_counter() - inicio)
+
+    completos = []
+    for texto in versiones[:20]:
+        inicio = time.perf_counter()
+        arbol = ArbolDeExpresion()
+        try:
+            arbol.construir_arbol(texto)
+            arbol.evaluar_arbol(arbol.raiz)
+        except ErrorLexico:
+            pass
+        completos.append(time.perf_counter() - inicio)
+
+    promedio = sum(tiempos) / len(tiempos) * 1000
+    peor = max(tiempos) * 1000
+    completo = sum(completos) / len(completos) * 1000
+    print(f"{nombre:<18} incremental {promedio:7.2f} ms (peor {peor:6.2f} ms)   "
+          f"completo {completo:7.2f} ms   x{completo / promedio:6.1f}")
+
+
+def main():
+    """
+    Ejecuta el benchmark e imprime los resultados.
+    """
+    expresion = generar_expresion(TAMANO)
+    print(f"Expresión de {len(expresion)} caracteres")
+
+    analizador = AnalizadorIncremental()
+    inicio = time.perf_counter()
+    analizador.actualizar(expresion)
+    analizador.evaluar()
+    print(f"Primer análisis: {(time.perf_counter() - inicio) * 1000:.1f} ms")
+
+    # Escribir al final: se añade un término y se borra, carácter a carácter
+    termino = " + (12 * 3.5)"
+    escritura = [expresion + termino[:largo] for largo in range(len(termino) + 1)]
+    medir("escribir al final", (escritura * (EDICIONES // len(escritura) + 1))[:EDICIONES],
+          analizador)
+    medir("editar en medio", ediciones(expresion, expresion.index("(", len(expresion) // 2) + 1),
+          analizador)
+    medir("editar al inicio", ediciones(expresion, 1), analizador)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Benchmark: analizador léxico de una sola pasada contra la cadena anterior
+(validar_expresion, balancear_parentesis, eliminar_espacios, tokenizar_expresion
+y es_numero con su segunda conversión a float).
+
+Uso:
+    python -m benchmarks.bench_lexer
+"""
+import random
+import re
+import time
+
+from Modelos.lexer import tokenizar
+
+TAMANOS_MB = (1, 4, 16)
+
+
+# Versión anterior de la validación, antes de `Modelos.lexer`; se conserva aquí
+# solo como referencia de este benchmark
+
+
+def validar_expresion(expresion):
+    """
+    Valida que la expresión solo contenga números, operadores y paréntesis.
+    """
+    return bool(re.match(r'^[\d+\-*/^(). ]+$', expresion))
+
+
+def eliminar_espacios(expresion):
+    """
+    Elimina todos los espacios en blanco de la expresión.
+    """
+    return expresion.replace(" ", "")
+
+
+def balancear_parentesis(expresion):
+    """
+    Verifica si los paréntesis de la expresión están balanceados.
+    """
+    abiertos = 0
+    for caracter in expresion:
+        if caracter == '(':
+            abiertos += 1
+        elif caracter == ')':
+            if not abiertos:
+                return False
+            abiertos -= 1
+    return abiertos == 0
+
+
+def tokenizar_expresion(expresion):
+    """
+    Convierte la expresión en una lista de tokens (números, operadores y paréntesis).
+    """
+    return re.findall(r'\d+\.?\d*|[+*/^()-]', expresion)
+
+
+def es_numero(token):
+    """
+    Verifica si un token es un número.
+    """
+    try:
+        float(token)
+        return True
+    except ValueError:
+        return False
+
+
+def generar_expresion(num_bytes, semilla=0):
+    """
+    Genera una expresión válida con espacios y paréntesis de al menos `num_bytes`.
+
+    Args:
+        num_bytes (int): Tamaño mínimo de la expresión en bytes.
+        semilla (int): Semilla del generador aleatorio.
+
+    Returns:
+        str: La expresión generada.
+    """
+    aleatorio = random.Random(semilla)
+    partes = []
+    tamano = 0
+    while tamano < num_bytes:
+        grupo = (f"({aleatorio.randint(1, 999)} {aleatorio.choice('+-*/^')} "
+                 f"{aleatorio.uniform(1, 99):.2f})")
+        partes.append(grupo)
+        tamano += len(grupo) + 3
+    return f" {aleatorio.choice('+-*/')} ".join(partes)
+
+
+def pipeline_anterior(expresion):
+    """
+    Reproduce las pasadas que hacía el controlador antes de construir el árbol.
+
+    Returns:
+        list: Los valores de los tokens, con los números convertidos a float.
+    """
+    if not validar_expresion(expresion) or not balancear_parentesis(expresion):
+        raise ValueError("Expresión inválida")
+    tokens = tokenizar_expresion(eliminar_espacios(expresion))
+    return [float(token) if es_numero(token) else token for token in tokens]
+
+
+def pipeline_lexer(expresion):
+    """
+    Analiza la expresión con el analizador léxico de una sola pasada.
+
+    Returns:
+        list: Los valores de los tokens, con los números convertidos a float.
+    """
+    return [valor for _, _, valor, _ in tokenizar(expresion)]
+
+
+def cronometrar(funcion, expresion, repeticiones=3):
+    """
+    Devuelve el mejor tiempo de `repeticiones` ejecuciones y el resultado.
+    """
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion(expresion)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor, resultado
+
+
+def main():
+    """
+    Ejecuta el benchmark e imprime una tabla con los resultados.
+    """
+    print(f"{'MB':>4} {'tokens':>10} {'anterior s':>11} {'lexer s':>9} {'MB/s lexer':>11}")
+    for megabytes in TAMANOS_MB:
+        expresion = generar_expresion(megabytes * 1024 * 1024)
+        anterior, esperado = cronometrar(pipeline_anterior, expresion)
+        lexer, resultado = cronometrar(pipeline_lexer, expresion)
+        assert resultado == esperado
+        print(f"{megabytes:>4} {len(resultado):>10} {anterior:>11.3f} {lexer:>9.3f} "
+              f"{len(expresion) / lexer / 1e6:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark: tiempo de construir el árbol con el algoritmo de pilas actual
+(`construir_arbol`) contra el analizador Pratt (`construir_arbol(registro=...)`),
+incluido el análisis léxico, sobre expresiones grandes. Las expresiones
+parentizadas de `bench_suite` producen el mismo árbol con ambos; la expresión
+"plana" no tiene paréntesis y ejercita la precedencia (sin `^`, cuya
+asociatividad difiere).
+
+Uso:
+    python -m benchmarks.bench_pratt
+"""
+import random
+import sys
+import time
+
+from Modelos.arbol import ArbolDeExpresion
+from Modelos.operadores import RegistroOperadores
+from benchmarks.bench_suite import generar_expresion
+
+TAMANOS = (10 ** 4, 10 ** 5, 10 ** 6)
+PERFILES = ('balanceado', 'izquierda', 'derecha', 'plana')
+REPETICIONES = 3
+
+
+def expresion_plana(num_nodos, semilla=0):
+    """
+    Genera `a op b op c ...` sin paréntesis, con + - * / al azar.
+    """
+    aleatorio = random.Random(semilla)
+    partes = [f"{aleatorio.uniform(1.0, 2.0):.3f}"]
+    for _ in range(max(0, (num_nodos - 1) // 2)):
+        partes.append(aleatorio.choice('+-*/'))
+        partes.append(f"{aleatorio.uniform(1.0, 2.0):.3f}")
+    return " ".join(partes)
+
+
+def medir(construir):
+    """
+    Devuelve el mejor tiempo de `REPETICIONES` ejecuciones.
+    """
+    mejor = float('inf')
+    for _ in range(REPETICIONES):
+        inicio = time.perf_counter()
+        construir()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def main():
+    """
+    Ejecuta el benchmark e imprime una tabla con los resultados.
+    """
+    registro = RegistroOperadores.estandar()
+    print(f"{'nodos':>9} {'perfil':>11} {'pilas':>12} {'Pratt':>12} {'Pratt/pilas':>12}")
+    for tamano in TAMANOS:
+        for perfil in PERFILES:
+            if perfil == 'plana':
+                expresion = expresion_plana(tamano + 1)
+            else:
+                expresion = generar_expresion(tamano + 1, perfil, 'mixta')
+            arbol = ArbolDeExpresion()
+            pilas = medir(lambda: arbol.construir_arbol(expresion))
+            pratt = medir(lambda: arbol.construir_arbol(expresion, registro=registro))
+            print(f"{tamano:>9} {perfil:>11} {pilas * 1000:9.1f} ms {pratt * 1000:9.1f} ms "
+                  f"{pratt / pilas:11.2f}x")
+            sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
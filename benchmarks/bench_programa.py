@@ -0,0 +1,84 @@
+"""
+Benchmark: evaluaciones por segundo del árbol recursivo contra el programa postfijo.
+
+Uso:
+    python -m benchmarks.bench_programa
+"""
+import random
+import sys
+import time
+
+from Modelos.arbol import ArbolDeExpresion
+from Modelos.nodo import Nodo
+
+TAMANOS = (10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6)
+OPERADORES = '+-*/'
+
+
+def arbol_balanceado(num_nodos, semilla=0):
+    """
+    Construye un árbol balanceado con aproximadamente `num_nodos` nodos,
+    combinando hojas aleatorias nivel por nivel.
+
+    Args:
+        num_nodos (int): Número aproximado de nodos del árbol.
+        semilla (int): Semilla del generador aleatorio.
+
+    Returns:
+        ArbolDeExpresion: El árbol construido.
+    """
+    aleatorio = random.Random(semilla)
+    nivel = [Nodo(aleatorio.uniform(1.0, 2.0))
+             for _ in range((num_nodos + 1) // 2)]
+    while len(nivel) > 1:
+        siguiente = []
+        for i in range(0, len(nivel) - 1, 2):
+            nodo = Nodo(aleatorio.choice(OPERADORES))
+            nodo.izq = nivel[i]
+            nodo.der = nivel[i + 1]
+            siguiente.append(nodo)
+        if len(nivel) % 2:
+            siguiente.append(nivel[-1])
+        nivel = siguiente
+    arbol = ArbolDeExpresion()
+    arbol.raiz = nivel[0]
+    return arbol
+
+
+def evaluaciones_por_segundo(funcion, tiempo_minimo=1.0):
+    """
+    Ejecuta `funcion` repetidamente durante al menos `tiempo_minimo` segundos.
+
+    Returns:
+        float: Evaluaciones por segundo.
+    """
+    repeticiones = 0
+    inicio = time.perf_counter()
+    transcurrido = 0.0
+    while transcurrido < tiempo_minimo:
+        funcion()
+        repeticiones += 1
+        transcurrido = time.perf_counter() - inicio
+    return repeticiones / transcurrido
+
+
+def main():
+    """
+    Ejecuta el benchmark e imprime una tabla con los resultados.
+    """
+    print(f"{'nodos':>10} {'recursivo ev/s':>16} {'postfijo ev/s':>16} {'aceleración':>12}")
+    for tamano in TAMANOS:
+        arbol = arbol_balanceado(tamano)
+        arbol.compilar()
+        esperado = arbol.evaluar_arbol(arbol.raiz)
+        assert arbol.evaluar_compilado() == esperado
+        recursivo = evaluaciones_por_segundo(
+            lambda: arbol.evaluar_arbol(arbol.raiz))
+        postfijo = evaluaciones_por_segundo(arbol.evaluar_compilado)
+        print(f"{len(arbol.programa):>10} {recursivo:>16.2f} {postfijo:>16.2f} "
+              f"{postfijo / recursivo:>11.2f}x")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Benchmark: memoria máxima y tiempo de escribir un recorrido en un archivo
+construyendo el texto completo (`imprimir_*`) contra escribirlo por bloques
+desde el generador (`escribir_recorrido`).
+
+Uso:
+    python -m benchmarks.bench_recorridos
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+from Modelos.arbol import ArbolDeExpresion
+from benchmarks.bench_suite import generar_expresion
+
+TAMANOS = (10 ** 4, 10 ** 5, 10 ** 6)
+ORDENES = ('inorden', 'preorden', 'postorden')
+
+
+def medir(funcion):
+    """
+    Ejecuta `funcion` y devuelve su tiempo y el pico de memoria reservada durante ella.
+
+    Returns:
+        tuple: (segundos, bytes del pico)
+    """
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    funcion()
+    segundos = time.perf_counter() - inicio
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return segundos, pico
+
+
+def main():
+    """
+    Ejecuta el benchmark e imprime una tabla con los resultados.
+    """
+    print(f"{'nodos':>9} {'orden':>10} {'texto completo':>24} {'por bloques':>24}")
+    with open(os.devnull, 'w', encoding='utf-8') as salida:
+        for tamano in TAMANOS:
+            arbol = ArbolDeExpresion()
+            arbol.construir_arbol(generar_expresion(tamano + 1, 'balanceado', 'mixta'))
+            for orden in ORDENES:
+                imprimir = getattr(arbol, f"imprimir_{orden}")
+                completo = medir(lambda: salida.write(imprimir(arbol.raiz).strip()))
+                bloques = medir(lambda: arbol.escribir_recorrido(arbol.raiz, orden, salida))
+                print(f"{tamano:>9} {orden:>10} "
+                      f"{completo[0] * 1000:9.1f} ms {completo[1] / 2 ** 20:8.2f} MiB "
+                      f"{bloques[0] * 1000:9.1f} ms {bloques[1] / 2 ** 20:8.2f} MiB")
+                sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
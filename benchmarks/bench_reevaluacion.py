@@ -0,0 +1,49 @@
+"""
+Benchmark: barrido de una variable ("¿qué pasaría si...?") con el evaluador
+incremental, que solo recalcula los ancestros de la variable, contra evaluar el
+árbol completo para cada valor.
+
+Uso:
+    python -m benchmarks.bench_reevaluacion
+"""
+import sys
+import time
+
+from Modelos.arbol import ArbolDeExpresion
+from benchmarks.bench_suite import generar_expresion
+
+TAMANOS = (10 ** 3, 10 ** 4, 10 ** 5)
+VALORES = [numero * 0.01 for numero in range(1000)]
+
+
+def main():
+    """
+    Ejecuta el benchmark e imprime una tabla con los resultados.
+    """
+    print(f"{'perfil':>11} {'nodos':>8} {'completo ms':>12} {'incremental ms':>15} "
+          f"{'recalculados':>13} {'aceleración':>12}")
+    for perfil in ('balanceado', 'izquierda'):
+        for tamano in TAMANOS:
+            # La primera hoja pasa a depender de x: la más profunda en la cadena izquierda
+            expresion = generar_expresion(tamano + 1, perfil, 'aditiva').replace('1.', 'x+1.', 1)
+            arbol = ArbolDeExpresion()
+            arbol.construir_arbol(expresion)
+            repeticiones = max(3, 10 ** 5 // tamano)
+            inicio = time.perf_counter()
+            for valor in VALORES[:repeticiones]:
+                arbol.evaluar_arbol(arbol.raiz, {'x': valor})
+            completo = (time.perf_counter() - inicio) / repeticiones
+
+            evaluador = arbol.preparar_incremental({'x': 0.0})
+            inicio = time.perf_counter()
+            for _ in evaluador.barrer('x', VALORES):
+                pass
+            incremental = (time.perf_counter() - inicio) / len(VALORES)
+            assert evaluador.resultado() == arbol.evaluar_arbol(arbol.raiz, {'x': VALORES[-1]})
+            print(f"{perfil:>11} {tamano:>8} {completo * 1000:>12.3f} {incremental * 1000:>15.4f} "
+                  f"{evaluador.nodos_recalculados:>13} {completo / incremental:>11.0f}x")
+            sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark: cargar árboles desde un corpus binario con `mmap` contra volver a
+analizar el texto de las expresiones. Se mide reconstruir los nodos y evaluar
+directamente desde el formato binario, sin nodos.
+
+Uso:
+    python -m benchmarks.bench_serializacion [num_arboles] [num_nodos]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from Modelos.arbol import ArbolDeExpresion
+from Modelos.serializacion import CorpusArboles, guardar_corpus
+from benchmarks.bench_suite import PERFILES, generar_expresion
+
+
+def cronometrar(nombre, funcion, referencia=None):
+    """
+    Ejecuta `funcion` una vez e imprime su tiempo (y la aceleración respecto a
+    `referencia`, si se indica).
+
+    Returns:
+        float: Segundos transcurridos.
+    """
+    inicio = time.perf_counter()
+    funcion()
+    segundos = time.perf_counter() - inicio
+    extra = f"   x{referencia / segundos:5.1f}" if referencia else ""
+    print(f"{nombre:<34} {segundos * 1000:10.1f} ms{extra}")
+    return segundos
+
+
+def main(argv=None):
+    """
+    Ejecuta el benchmark e imprime los resultados.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    num_arboles = int(argv[0]) if argv else 2000
+    num_nodos = int(argv[1]) if len(argv) > 1 else 1001
+    expresiones = [generar_expresion(num_nodos, PERFILES[semilla % len(PERFILES)],
+                                     'mixta', semilla)
+                   for semilla in range(num_arboles)]
+
+    def analizar():
+        for expresion in expresiones:
+            ArbolDeExpresion().construir_arbol(expresion)
+
+    def raices():
+        for expresion in expresiones:
+            arbol = ArbolDeExpresion()
+            arbol.construir_arbol(expresion)
+            yield arbol.raiz
+
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "corpus.bin")
+        guardar_corpus(ruta, raices())
+        texto = sum(len(expresion) for expresion in expresiones)
+        print(f"{num_arboles} árboles de {num_nodos} nodos: texto {texto / 1e6:.1f} MB, "
+              f"corpus {os.path.getsize(ruta) / 1e6:.1f} MB")
+
+        referencia = cronometrar("analizar el texto", analizar)
+        with CorpusArboles(ruta) as corpus:
+            cronometrar("cargar del corpus (nodos)",
+                        lambda: [registro.a_arbol() for registro in corpus], referencia)
+            cronometrar("cargar del corpus (compacto)",
+                        lambda: [registro.a_arbol(compacto=True) for registro in corpus],
+                        referencia)
+
+            def evaluar():
+                for registro in corpus:
+                    try:
+                        registro.evaluar()
+                    except (ArithmeticError, ValueError):
+                        pass
+
+            cronometrar("evaluar desde el corpus", evaluar, referencia)
+            inicio = time.perf_counter()
+            corpus.evaluar(num_arboles // 2)
+            print(f"{'evaluar un solo árbol':<34} {(time.perf_counter() - inicio) * 1000:10.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""
+Generador de carga para el servidor de evaluación (`main.py servidor`): abre
+varias conexiones, envía solicitudes con un número acotado en vuelo por
+conexión y mide el rendimiento y la latencia vistos por el cliente. Al final
+pide al servidor sus propias estadísticas (tamaño medio de lote, etc.).
+
+Como referencia, también mide cuánto tarda un proceso nuevo de
+`main.py batch` en evaluar una sola expresión, que es lo que cuesta cada
+trabajo sin un servidor compartido.
+
+Uso:
+    python -m benchmarks.bench_servidor                      # inicia su propio servidor
+    python -m benchmarks.bench_servidor --workers 4 --conexiones 1 8 32
+    python -m benchmarks.bench_servidor --puerto 8765 --sin-iniciar
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+
+from benchmarks.bench_suite import generar_expresion
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def generar_solicitudes(cantidad, distintas, nodos, semilla=0):
+    """
+    Genera solicitudes sobre `distintas` expresiones, de modo que las repetidas
+    ejercitan la caché del servidor; una de cada cuatro lleva variables.
+
+    Returns:
+        list: Las solicitudes ya serializadas como líneas JSON (bytes).
+    """
+    aleatorio = random.Random(semilla)
+    expresiones = [generar_expresion(nodos, 'balanceado', 'mixta', semilla=i)
+                   for i in range(distintas)]
+    solicitudes = []
+    for numero in range(cantidad):
+        if numero % 4 == 3:
+            solicitud = {'id': numero, 'expresion': "x * (y + 2) ^ 2 - x / y",
+                         'variables': {'x': aleatorio.uniform(1, 2), 'y': aleatorio.uniform(1, 2)}}
+        else:
+            solicitud = {'id': numero, 'expresion': aleatorio.choice(expresiones)}
+        solicitudes.append(json.dumps(solicitud).encode('utf-8') + b"\n")
+    return solicitudes
+
+
+async def abrir(host, puerto, ruta_socket):
+    """
+    Abre una conexión con el servidor.
+    """
+    if ruta_socket is not None:
+        return await asyncio.open_unix_connection(ruta_socket, limit=1 << 24)
+    return await asyncio.open_connection(host, puerto, limit=1 << 24)
+
+
+async def cliente(host, puerto, ruta_socket, solicitudes, ventana, latencias):
+    """
+    Envía las solicitudes por una conexión con como mucho `ventana` en vuelo y
+    agrega la latencia de cada una a `latencias`. Las respuestas llegan en el
+    orden de las solicitudes.
+
+    Returns:
+        int: Número de respuestas con error.
+    """
+    lector, escritor = await abrir(host, puerto, ruta_socket)
+    lugares = asyncio.Semaphore(ventana)
+    envios = []
+    errores = 0
+
+    async def enviar():
+        for linea in solicitudes:
+            await lugares.acquire()
+            envios.append(time.perf_counter())
+            escritor.write(linea)
+            await escritor.drain()
+
+    envio = asyncio.create_task(enviar())
+    for indice in range(len(solicitudes)):
+        respuesta = json.loads(await lector.readline())
+        latencias.append(time.perf_counter() - envios[indice])
+        lugares.release()
+        if respuesta.get('error') is not None:
+            errores += 1
+    await envio
+    escritor.close()
+    await escritor.wait_closed()
+    return errores
+
+
+async def pedir_estadisticas(host, puerto, ruta_socket):
+    """
+    Devuelve las estadísticas del servidor.
+    """
+    lector, escritor = await abrir(host, puerto, ruta_socket)
+    escritor.write(b'{"op": "estadisticas"}\n')
+    await escritor.drain()
+    respuesta = json.loads(await lector.readline())
+    escritor.close()
+    await escritor.wait_closed()
+    return respuesta['estadisticas']
+
+
+async def medir_carga(host, puerto, ruta_socket, conexiones, por_conexion, ventana, nodos):
+    """
+    Ejecuta una carga con `conexiones` clientes simultáneos.
+
+    Returns:
+        tuple: (solicitudes por segundo, latencias ordenadas en segundos, errores)
+    """
+    latencias = []
+    cargas = [generar_solicitudes(por_conexion, 50, nodos, semilla=numero)
+              for numero in range(conexiones)]
+    inicio = time.perf_counter()
+    errores = await asyncio.gather(*(
+        cliente(host, puerto, ruta_socket, carga, ventana, latencias) for carga in cargas))
+    segundos = time.perf_counter() - inicio
+    latencias.sort()
+    return conexiones * por_conexion / segundos, latencias, sum(errores)
+
+
+def medir_proceso_por_trabajo(repeticiones=3):
+    """
+    Mide el tiempo de evaluar una expresión lanzando un proceso nuevo de
+    `main.py batch` cada vez.
+
+    Returns:
+        float: Segundos por trabajo (el mejor de las repeticiones).
+    """
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        subprocess.run([sys.executable, 'main.py', 'batch'], input="1 + 2 * 3\n", text=True,
+                       capture_output=True, check=True, cwd=RAIZ)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def iniciar_servidor(args):
+    """
+    Lanza `main.py servidor` en un puerto libre y espera a que acepte conexiones.
+
+    Returns:
+        tuple: (proceso, puerto)
+    """
+    with socket.socket() as libre:
+        libre.bind(('127.0.0.1', 0))
+        puerto = libre.getsockname()[1]
+    proceso = subprocess.Popen(
+        [sys.executable, 'main.py', 'servidor', '--puerto', str(puerto),
+         '--workers', str(args.workers), '--lote', str(args.lote)],
+        cwd=RAIZ, stderr=subprocess.DEVNULL)
+    limite = time.perf_counter() + 30
+    while time.perf_counter() < limite:
+        try:
+            socket.create_connection(('127.0.0.1', puerto), timeout=0.2).close()
+            return proceso, puerto
+        except OSError:
+            time.sleep(0.05)
+    proceso.kill()
+    raise RuntimeError("El servidor no empezó a escuchar a tiempo.")
+
+
+def main():
+    """
+    Ejecuta el generador de carga e imprime una tabla con los resultados.
+    """
+    parser = argparse.ArgumentParser(description="Generador de carga del servidor de evaluación.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--puerto', type=int, default=8765)
+    parser.add_argument('--socket', help="socket Unix del servidor")
+    parser.add_argument('--sin-iniciar', action='store_true',
+                        help="usar un servidor ya en ejecución en lugar de lanzar uno")
+    parser.add_argument('--workers', type=int, default=0,
+                        help="trabajadores del servidor que se lanza")
+    parser.add_argument('--lote', type=int, default=64, help="tamaño de lote del servidor")
+    parser.add_argument('--conexiones', type=int, nargs='+', default=[1, 4, 16])
+    parser.add_argument('--solicitudes', type=int, default=2000,
+                        help="solicitudes por conexión")
+    parser.add_argument('--ventana', type=int, default=32,
+                        help="solicitudes en vuelo por conexión")
+    parser.add_argument('--nodos', type=int, default=101,
+                        help="nodos de cada expresión generada")
+    args = parser.parse_args()
+
+    proceso = None
+    puerto = args.puerto
+    if not args.sin_iniciar and args.socket is None:
+        proceso, puerto = iniciar_servidor(args)
+    try:
+        print(f"Un proceso por trabajo (main.py batch): "
+              f"{medir_proceso_por_trabajo() * 1000:.1f} ms por expresión")
+        print(f"{'conexiones':>10} {'solicitudes/s':>14} {'p50 ms':>9} {'p95 ms':>9} "
+              f"{'p99 ms':>9} {'errores':>8}")
+        for conexiones in args.conexiones:
+            por_segundo, latencias, errores = asyncio.run(medir_carga(
+                args.host, puerto, args.socket, conexiones, args.solicitudes,
+                args.ventana, args.nodos))
+
+            def percentil(fraccion):
+                return latencias[round(fraccion * (len(latencias) - 1))] * 1000
+
+            print(f"{conexiones:>10} {por_segundo:>14.0f} {percentil(0.5):>9.2f} "
+                  f"{percentil(0.95):>9.2f} {percentil(0.99):>9.2f} {errores:>8}")
+            sys.stdout.flush()
+        estadisticas = asyncio.run(pedir_estadisticas(args.host, puerto, args.socket))
+        print("Servidor:", json.dumps(estadisticas, indent=2, ensure_ascii=False))
+    finally:
+        if proceso is not None:
+            proceso.terminate()
+            proceso.wait()
+
+
+if __name__ == "__main__":
+    main()
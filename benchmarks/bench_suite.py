@@ -0,0 +1,288 @@
+"""
+Suite de benchmarks reproducible: mide por separado cada etapa del programa
+(tokenizar, construir, evaluar, los tres recorridos, el layout del visualizador y
+el índice de métricas)
+sobre expresiones generadas con semilla, y guarda los resultados en JSON para
+compararlos entre commits.
+
+Uso:
+    python -m benchmarks.bench_suite --salida base.json
+    python -m benchmarks.bench_suite --salida nuevo.json --comparar base.json --umbral 0.15
+    python -m benchmarks.bench_suite --nodos 1001 100001 --perfiles derecha --mezclas potencias
+
+Con `--comparar`, cada etapa más lenta que la base en más de `--umbral` (fracción)
+se marca como regresión y el proceso termina con código 1. Los tiempos se
+normalizan con una carga de calibración medida en cada ejecución, para que una
+máquina más cargada no se confunda con una regresión.
+"""
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+
+from Modelos.arbol import ArbolDeExpresion
+from Modelos.metricas import IndiceMetricas
+from Screens.layout_arbol import calcular_layout
+
+NODOS = (1001, 10001, 100001)
+PERFILES = ('balanceado', 'izquierda', 'derecha')
+# Operadores de cada mezcla; la repetición de un símbolo aumenta su peso
+MEZCLAS = {
+    'aditiva': '+-',
+    'multiplicativa': '*/',
+    'mixta': '+-*/',
+    'potencias': '++--**//^',
+}
+ETAPAS = ('tokenizar', 'construir', 'evaluar', 'inorden', 'preorden', 'postorden',
+          'layout', 'metricas')
+
+
+def generar_expresion(num_nodos, perfil='balanceado', mezcla='mixta', semilla=0):
+    """
+    Genera una expresión completamente parentizada cuyo árbol tiene exactamente
+    `num_nodos` nodos (o el impar inmediatamente inferior) y la forma pedida.
+
+    Args:
+        num_nodos (int): Número de nodos del árbol resultante.
+        perfil (str): 'balanceado', 'izquierda' (cadena que crece por la izquierda,
+                      ((a+b)+c)+d) o 'derecha' (a+(b+(c+d))).
+        mezcla (str): Nombre de la mezcla de operadores en `MEZCLAS`.
+        semilla (int): Semilla del generador aleatorio.
+
+    Returns:
+        str: La expresión generada.
+
+    Raises:
+        ValueError: Si el perfil o la mezcla no existen.
+    """
+    if perfil not in PERFILES:
+        raise ValueError(f"Perfil desconocido: {perfil}")
+    if mezcla not in MEZCLAS:
+        raise ValueError(f"Mezcla desconocida: {mezcla}")
+    aleatorio = random.Random(semilla)
+    operadores = MEZCLAS[mezcla]
+    hojas = max(1, (num_nodos + 1) // 2)
+
+    def hoja():
+        return f"{aleatorio.uniform(1.0, 2.0):.3f}"
+
+    if perfil == 'izquierda':
+        partes = ['(' * (hojas - 1), hoja()]
+        for _ in range(hojas - 1):
+            partes.append(f" {aleatorio.choice(operadores)} {hoja()})")
+        return ''.join(partes)
+    if perfil == 'derecha':
+        partes = [f"{hoja()} {aleatorio.choice(operadores)} (" for _ in range(hojas - 1)]
+        partes.append(hoja())
+        partes.append(')' * (hojas - 1))
+        return ''.join(partes)
+
+    nivel = [hoja() for _ in range(hojas)]
+    while len(nivel) > 1:
+        siguiente = [f"({nivel[i]} {aleatorio.choice(operadores)} {nivel[i + 1]})"
+                     for i in range(0, len(nivel) - 1, 2)]
+        if len(nivel) % 2:
+            siguiente.append(nivel[-1])
+        nivel = siguiente
+    return nivel[0]
+
+
+def cronometrar(funcion, repeticiones):
+    """
+    Ejecuta `funcion` varias veces y devuelve el menor tiempo, que es el menos
+    afectado por el ruido del sistema.
+
+    Returns:
+        tuple: (segundos del mejor intento, valor devuelto por la última ejecución)
+    """
+    mejor = float('inf')
+    valor = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        valor = funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor, valor
+
+
+def calibrar(repeticiones=5):
+    """
+    Mide una carga fija de Python puro (crear objetos, recorrer listas y
+    diccionarios). Al comparar dos ejecuciones, los tiempos se dividen por esta
+    medida para descontar que la máquina esté más lenta o más rápida en general.
+
+    Returns:
+        float: Segundos del mejor intento.
+    """
+    def carga():
+        pila = []
+        tabla = {}
+        for numero in range(200_000):
+            pila.append((numero, numero * 0.5))
+            if len(pila) > 64:
+                clave, valor = pila.pop()
+                tabla[clave & 1023] = valor
+        return len(tabla)
+
+    return cronometrar(carga, repeticiones)[0]
+
+
+def medir_caso(num_nodos, perfil, mezcla, semilla, repeticiones):
+    """
+    Mide cada etapa sobre una expresión generada.
+
+    Returns:
+        dict: Parámetros del caso, segundos por etapa y el error de evaluación, si lo hubo.
+    """
+    expresion = generar_expresion(num_nodos, perfil, mezcla, semilla)
+    arbol = ArbolDeExpresion()
+    caso = {'nodos': num_nodos, 'perfil': perfil, 'mezcla': mezcla, 'semilla': semilla,
+            'caracteres': len(expresion), 'etapas': {}, 'error': None}
+    etapas = caso['etapas']
+
+    etapas['tokenizar'], _ = cronometrar(
+        lambda: arbol.tokenizar_expresion(expresion), repeticiones)
+    etapas['construir'], _ = cronometrar(
+        lambda: arbol.construir_arbol(expresion), repeticiones)
+
+    def evaluar():
+        try:
+            return arbol.evaluar_arbol(arbol.raiz)
+        except (ArithmeticError, ValueError) as e:
+            # La semilla fija hace que el error sea el mismo en cada ejecución
+            caso['error'] = str(e)
+
+    etapas['evaluar'], _ = cronometrar(evaluar, repeticiones)
+    etapas['inorden'], _ = cronometrar(
+        lambda: arbol.imprimir_inorden(arbol.raiz), repeticiones)
+    etapas['preorden'], _ = cronometrar(
+        lambda: arbol.imprimir_preorden(arbol.raiz), repeticiones)
+    etapas['postorden'], _ = cronometrar(
+        lambda: arbol.imprimir_postorden(arbol.raiz), repeticiones)
+    etapas['layout'], _ = cronometrar(lambda: calcular_layout(arbol.raiz), repeticiones)
+    # El layout no usa el índice: numera cada aparición en preorden y obtiene la
+    # profundidad y la altura en esa misma pasada, que cuesta menos que el índice
+    etapas['metricas'], _ = cronometrar(lambda: IndiceMetricas(arbol.raiz), repeticiones)
+    return caso
+
+
+def _commit_actual():
+    """
+    Devuelve el hash del commit actual, o None si no se puede obtener.
+    """
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _clave(caso):
+    return (caso['nodos'], caso['perfil'], caso['mezcla'], caso['semilla'])
+
+
+def comparar(resultados, base, umbral):
+    """
+    Compara dos ejecuciones caso por caso y etapa por etapa. Los tiempos se
+    normalizan con la calibración de cada ejecución.
+
+    Args:
+        resultados (dict): Resultados de la ejecución actual.
+        base (dict): Resultados de referencia.
+        umbral (float): Aumento relativo tolerado (0.15 es un 15 %).
+
+    Returns:
+        list: Descripciones de las regresiones encontradas.
+    """
+    casos_base = {_clave(caso): caso for caso in base['casos']}
+    factor = resultados['calibracion'] / base['calibracion']
+    print(f"Calibración: {base['calibracion'] * 1000:.1f} ms -> "
+          f"{resultados['calibracion'] * 1000:.1f} ms (factor {factor:.2f})")
+    regresiones = []
+    for caso in resultados['casos']:
+        anterior = casos_base.get(_clave(caso))
+        if anterior is None:
+            continue
+        for etapa, segundos in caso['etapas'].items():
+            referencia = anterior['etapas'].get(etapa)
+            if not referencia:
+                continue
+            razon = segundos / referencia / factor
+            marca = ""
+            if razon > 1 + umbral:
+                marca = "  << REGRESIÓN"
+                regresiones.append(f"{caso['perfil']}/{caso['mezcla']}/{caso['nodos']} "
+                                   f"{etapa}: x{razon:.2f}")
+            print(f"{caso['perfil']:>10} {caso['mezcla']:>14} {caso['nodos']:>8} "
+                  f"{etapa:>10} {referencia * 1000:10.3f} ms -> {segundos * 1000:10.3f} ms "
+                  f"x{razon:5.2f}{marca}")
+    return regresiones
+
+
+def main(argv=None):
+    """
+    Ejecuta la suite, guarda el JSON y, si se pide, lo compara con una base.
+
+    Args:
+        argv (list): Argumentos de la línea de comandos.
+
+    Returns:
+        int: 0 si no hay regresiones, 1 si las hay.
+    """
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_suite",
+                                     description="Benchmarks por etapa del árbol de expresión.")
+    parser.add_argument('--nodos', type=int, nargs='+', default=list(NODOS))
+    parser.add_argument('--perfiles', nargs='+', choices=PERFILES, default=list(PERFILES))
+    parser.add_argument('--mezclas', nargs='+', choices=sorted(MEZCLAS), default=['mixta'])
+    parser.add_argument('--semilla', type=int, default=0)
+    parser.add_argument('--repeticiones', type=int, default=5)
+    parser.add_argument('--salida', help="archivo JSON donde guardar los resultados")
+    parser.add_argument('--comparar', help="archivo JSON de referencia")
+    parser.add_argument('--umbral', type=float, default=0.15,
+                        help="aumento relativo tolerado antes de marcar una regresión")
+    args = parser.parse_args(argv)
+
+    resultados = {
+        'commit': _commit_actual(),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'repeticiones': args.repeticiones,
+        'calibracion': calibrar(),
+        'casos': [],
+    }
+    print(f"{'perfil':>10} {'mezcla':>14} {'nodos':>8} " +
+          " ".join(f"{etapa:>10}" for etapa in ETAPAS) + "   (ms)")
+    for mezcla in args.mezclas:
+        for perfil in args.perfiles:
+            for num_nodos in args.nodos:
+                caso = medir_caso(num_nodos, perfil, mezcla, args.semilla, args.repeticiones)
+                resultados['casos'].append(caso)
+                print(f"{perfil:>10} {mezcla:>14} {num_nodos:>8} " +
+                      " ".join(f"{caso['etapas'][etapa] * 1000:10.3f}" for etapa in ETAPAS))
+                sys.stdout.flush()
+    # Se vuelve a calibrar al final y se conserva el mejor valor, por si la
+    # carga de la máquina cambió durante la ejecución
+    resultados['calibracion'] = min(resultados['calibracion'], calibrar())
+
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as archivo:
+            json.dump(resultados, archivo, indent=2, ensure_ascii=False)
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as archivo:
+            base = json.load(archivo)
+        print()
+        regresiones = comparar(resultados, base, args.umbral)
+        if regresiones:
+            print(f"\n{len(regresiones)} regresión(es) por encima del {args.umbral:.0%}:")
+            for regresion in regresiones:
+                print(f"  {regresion}")
+            return 1
+        print(f"\nSin regresiones por encima del {args.umbral:.0%}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,16 +4,35 @@
 @Author: Eryon Velasco
 
 Ejecucion del programa principal
+
+Uso:
+    python main.py                         # interfaz gráfica
+    python main.py batch [archivo] [--workers N]
+    python main.py servidor [--puerto P | --socket RUTA] [--workers N]
 """
-import tkinter as tk
-from Controllers.controller_arbol import Controlador
-from Screens.view import Vista
+import sys
 
 
-def main():
+def main(argv=None):
     """
-    Ejecuta la vista con el controlador
+    Ejecuta la vista con el controlador, el modo por lotes si el primer
+    argumento es `batch` o el servidor de evaluación si es `servidor`.
     """
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == 'batch':
+        from Controllers.controller_batch import main as main_batch
+        main_batch(argv[1:])
+        return
+    if argv and argv[0] == 'servidor':
+        from Controllers.controller_servidor import main as main_servidor
+        main_servidor(argv[1:])
+        return
+
+    # La interfaz gráfica solo se importa cuando se va a usar
+    import tkinter as tk
+    from Controllers.controller_arbol import Controlador
+    from Screens.view import Vista
+
     root = tk.Tk()
     vista = Vista(root)
     controlador = Controlador(vista)
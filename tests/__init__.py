@@ -0,0 +1,3 @@
+"""
+Pruebas automáticas del proyecto (`python -m pytest` o `python -m unittest` desde la raíz)
+"""
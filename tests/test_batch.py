@@ -0,0 +1,40 @@
+"""
+Pruebas del modo por lotes
+"""
+import io
+import json
+import unittest
+
+from Controllers import controller_batch
+from Modelos.presupuesto import PresupuestoEvaluacion
+
+
+class TestEjecutarBatch(unittest.TestCase):
+
+    def ejecutar(self, texto, **opciones):
+        salida = io.StringIO()
+        controller_batch.ejecutar_batch(io.StringIO(texto), salida, **opciones)
+        return [json.loads(linea) for linea in salida.getvalue().splitlines()]
+
+    def test_registros_en_orden(self):
+        registros = self.ejecutar("1 + 2\n\n3 *\n1 / 0\n1 + 2\n", tamano_lote=2)
+        self.assertEqual([registro['linea'] for registro in registros], [1, 3, 4, 5])
+        self.assertEqual(registros[0]['valor'], 3)
+        self.assertEqual(registros[0]['postorden'], "1.0  2.0  +")
+        self.assertIn("Expresión incompleta", registros[1]['error'])
+        self.assertIsNotNone(registros[2]['error'])
+        self.assertEqual(registros[3], dict(registros[0], linea=5))
+
+    def test_no_conserva_arboles_entre_lineas(self):
+        self.ejecutar("".join(f"{n} + {n}\n" for n in range(50)))
+        self.assertEqual(len(controller_batch._procesador), 0)
+
+    def test_presupuesto(self):
+        self.addCleanup(controller_batch.configurar_presupuesto, None)
+        registros = self.ejecutar("2 ^ 30\n",
+                                  presupuesto=PresupuestoEvaluacion(max_exponente=10))
+        self.assertEqual(registros[0]['limite']['limite'], 'exponente')
+
+
+if __name__ == "__main__":
+    unittest.main()
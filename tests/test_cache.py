@@ -0,0 +1,48 @@
+"""
+Pruebas de la caché de expresiones
+"""
+import unittest
+
+from Modelos.cache_expresiones import CacheExpresiones
+
+
+class TestCacheExpresiones(unittest.TestCase):
+
+    def test_lru_por_capacidad(self):
+        cache = CacheExpresiones(capacidad=2)
+        primero = cache.obtener("1 + 2")
+        cache.obtener("3 * 4")
+        self.assertIs(cache.obtener("1+2"), primero)  # Misma clave normalizada
+        cache.obtener("5 - 6")  # Desaloja "3 * 4", el menos reciente
+        self.assertEqual(cache.estadisticas()['desalojos'], 1)
+        self.assertIs(cache.obtener(" 1 +  2 "), primero)
+        self.assertEqual((cache.aciertos, cache.fallos), (2, 3))
+
+    def test_acotada_por_caracteres(self):
+        cache = CacheExpresiones(capacidad=100, max_caracteres=12)
+        for expresion in ("1+2", "3+4", "5+6", "7+8"):  # 3 caracteres cada una
+            cache.obtener(expresion)
+        self.assertEqual((len(cache), cache.estadisticas()['caracteres']), (4, 12))
+        cache.obtener("10+20")
+        self.assertEqual((len(cache), cache.estadisticas()['caracteres']), (3, 11))
+        self.assertEqual(cache.desalojos, 2)
+
+    def test_expresion_mas_larga_que_el_limite_no_se_guarda(self):
+        cache = CacheExpresiones(max_caracteres=8)
+        cache.obtener("1+2")
+        resultado = cache.obtener("1 + 2 + 3 + 4 + 5")
+        self.assertEqual(resultado.evaluacion, 15)
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.omitidas, 1)
+        self.assertIsNot(cache.obtener("1 + 2 + 3 + 4 + 5"), resultado)
+        cache.limpiar()
+        self.assertEqual(cache.estadisticas()['caracteres'], 0)
+
+    def test_sin_recorridos(self):
+        resultado = CacheExpresiones(recorridos=False).obtener("1 + 2")
+        self.assertIsNone(resultado.inorden)
+        self.assertEqual(resultado.evaluacion, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,240 @@
+"""
+Equivalencia de todas las formas de evaluar un árbol
+"""
+import math
+import os
+import random
+import unittest
+
+import numpy as np
+
+from Modelos.analizador_incremental import AnalizadorIncremental
+from Modelos.arbol import ArbolDeExpresion
+from Modelos.lexer import tokenizar
+from Modelos.operadores import RegistroOperadores
+from Modelos.serializacion import leer_registro, serializar
+from benchmarks.bench_suite import generar_expresion
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+VARIABLES = {'x': 1.75, 'y': -0.5, 'z': 3.0}
+
+
+def expresiones_de_ejemplo():
+    """
+    Devuelve las líneas de examples.txt que son expresiones válidas.
+    """
+    expresiones = []
+    with open(os.path.join(RAIZ, 'examples.txt'), encoding='utf-8') as archivo:
+        for linea in archivo:
+            linea = linea.strip()
+            try:
+                if linea:
+                    list(tokenizar(linea))
+                    expresiones.append(linea)
+            except ValueError:
+                continue  # Encabezado en texto libre
+    return expresiones
+
+
+def expresion_con_variables(aleatorio, profundidad):
+    """
+    Genera una expresión con variables, números, + - * / y paréntesis redundantes.
+    """
+    if profundidad == 0 or aleatorio.random() < 0.2:
+        if aleatorio.random() < 0.5:
+            return aleatorio.choice(sorted(VARIABLES))
+        return str(aleatorio.choice([0, 1, 2, 0.5, 3.25, 7]))
+    izq = expresion_con_variables(aleatorio, profundidad - 1)
+    der = expresion_con_variables(aleatorio, profundidad - 1)
+    texto = f"{izq} {aleatorio.choice('+-*/')} {der}"
+    return f"({texto})" if aleatorio.random() < 0.6 else texto
+
+
+def resultado(funcion, *argumentos):
+    """
+    Devuelve ('valor', v) o ('error', None), para comparar también qué falla.
+    """
+    try:
+        return 'valor', funcion(*argumentos)
+    except (ArithmeticError, ValueError):
+        return 'error', None
+
+
+class TestEquivalenciaEvaluacion(unittest.TestCase):
+    """
+    Cada expresión se evalúa con `evaluar_arbol` como referencia y con todas las
+    demás rutas, que deben dar exactamente el mismo valor o fallar también.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        aleatorio = random.Random(1234)
+        cls.constantes = expresiones_de_ejemplo() + [
+            generar_expresion(nodos, perfil, mezcla, semilla=semilla)
+            for semilla, (nodos, perfil, mezcla) in enumerate(
+                (nodos, perfil, mezcla)
+                for nodos in (1, 3, 15, 101)
+                for perfil in ('balanceado', 'izquierda', 'derecha')
+                for mezcla in ('aditiva', 'multiplicativa', 'mixta'))]
+        cls.con_variables = [expresion_con_variables(aleatorio, 4) for _ in range(150)]
+
+    def assertMismoResultado(self, esperado, obtenido, ruta):
+        self.assertEqual(esperado[0], obtenido[0], f"{ruta}: {obtenido}")
+        if esperado[0] == 'valor':
+            if isinstance(esperado[1], float) and math.isnan(esperado[1]):
+                self.assertTrue(math.isnan(obtenido[1]), ruta)
+            else:
+                self.assertEqual(esperado[1], obtenido[1], ruta)
+
+    def _comprobar(self, expresion, variables):
+        arbol = ArbolDeExpresion()
+        arbol.construir_arbol(expresion)
+        esperado = resultado(arbol.evaluar_arbol, arbol.raiz, variables)
+
+        rutas = {
+            'evaluar_compilado': lambda: arbol.evaluar_compilado(variables),
+            'ProgramaPostfijo.evaluar': lambda: arbol.compilar().evaluar(variables),
+            'compilar_funcion': lambda: arbol.compilar_funcion()(
+                *(variables[nombre] for nombre in arbol.compilar_funcion().nombres_variables)),
+            'ArbolSerializado.evaluar':
+                lambda: leer_registro(serializar(arbol.raiz)).evaluar(variables),
+            'ArbolSerializado.evaluar compartido':
+                lambda: leer_registro(serializar(arbol.raiz, True)).evaluar(variables),
+            'EvaluadorIncremental':
+                lambda: arbol.preparar_incremental(variables).resultado(),
+        }
+        for modo in ({'compacto': True}, {'compartir': True}):
+            otro = ArbolDeExpresion()
+            otro.construir_arbol(expresion, **modo)
+            rutas[f"evaluar_arbol {modo}"] = (
+                lambda otro=otro: otro.evaluar_arbol(otro.raiz, variables))
+            rutas[f"evaluar_compilado {modo}"] = (
+                lambda otro=otro: otro.evaluar_compilado(variables))
+        for ruta, funcion in rutas.items():
+            with self.subTest(expresion=expresion, ruta=ruta):
+                self.assertMismoResultado(esperado, resultado(funcion), ruta)
+        return arbol, esperado
+
+    def test_rutas_escalares_sin_variables(self):
+        for expresion in self.constantes:
+            self._comprobar(expresion, {})
+
+    def test_rutas_escalares_con_variables(self):
+        for expresion in self.con_variables:
+            self._comprobar(expresion, VARIABLES)
+
+    def test_evaluar_lote_completo_y_por_bloques(self):
+        filas = 9
+        columnas = {nombre: np.linspace(-2.0, 2.0, filas) + valor
+                    for nombre, valor in VARIABLES.items()}
+        for expresion in self.constantes + self.con_variables:
+            arbol = ArbolDeExpresion()
+            arbol.construir_arbol(expresion)
+            completo, mascara = arbol.evaluar_lote(columnas)
+            for tamano_bloque in (1, 4):
+                with self.subTest(expresion=expresion, tamano_bloque=tamano_bloque):
+                    por_bloques, mascara_bloques = arbol.evaluar_lote(columnas, tamano_bloque)
+                    np.testing.assert_array_equal(np.broadcast_to(por_bloques, completo.shape),
+                                                  completo)
+                    np.testing.assert_array_equal(mascara_bloques, mascara)
+            # Cada fila sin división entre cero coincide con la evaluación escalar
+            completo = np.broadcast_to(completo, (filas,))
+            mascara = np.broadcast_to(mascara, (filas,))
+            for fila in range(filas):
+                if mascara[fila]:
+                    continue
+                valores = {nombre: float(columna[fila]) for nombre, columna in columnas.items()}
+                tipo, esperado = resultado(arbol.evaluar_arbol, arbol.raiz, valores)
+                if tipo == 'valor' and isinstance(esperado, float):
+                    with self.subTest(expresion=expresion, fila=fila):
+                        self.assertTrue(math.isclose(completo[fila], esperado, rel_tol=1e-12)
+                                        or math.isnan(completo[fila]) and math.isnan(esperado))
+
+    def test_optimizar_conserva_el_valor(self):
+        for expresion in self.constantes + self.con_variables:
+            variables = VARIABLES if expresion in self.con_variables else {}
+            arbol = ArbolDeExpresion()
+            arbol.construir_arbol(expresion)
+            esperado = resultado(arbol.evaluar_arbol, arbol.raiz, variables)
+            arbol.optimizar()
+            with self.subTest(expresion=expresion):
+                obtenido = resultado(arbol.evaluar_arbol, arbol.raiz, variables)
+                self.assertEqual(esperado[0], obtenido[0])
+                if esperado[0] == 'valor':
+                    self.assertTrue(math.isclose(esperado[1], obtenido[1], rel_tol=1e-12))
+
+    def test_actualizar_variable_igual_que_evaluar_de_nuevo(self):
+        for expresion in self.con_variables[:40]:
+            arbol = ArbolDeExpresion()
+            arbol.construir_arbol(expresion)
+            if 'x' not in arbol.obtener_variables():
+                continue
+            arbol.preparar_incremental(VARIABLES)
+            for nuevo in (0.0, 2.5, -1.0):
+                variables = dict(VARIABLES, x=nuevo)
+                esperado = resultado(arbol.evaluar_arbol, arbol.raiz, variables)
+                with self.subTest(expresion=expresion, x=nuevo):
+                    self.assertMismoResultado(
+                        esperado, resultado(arbol.actualizar_variable, 'x', nuevo),
+                        'actualizar_variable')
+
+    def test_analizador_incremental_sigue_las_ediciones(self):
+        analizador = AnalizadorIncremental()
+        texto = ""
+        for expresion in self.constantes:
+            for parte in (expresion[:len(expresion) // 2], expresion):
+                texto = parte
+                try:
+                    analizador.actualizar(texto)
+                except ValueError:
+                    continue  # Edición intermedia inválida
+                arbol = ArbolDeExpresion()
+                arbol.construir_arbol(texto)
+                with self.subTest(texto=texto):
+                    self.assertMismoResultado(resultado(arbol.evaluar_arbol, arbol.raiz),
+                                              resultado(analizador.evaluar),
+                                              'AnalizadorIncremental')
+
+    def test_pratt_igual_que_el_algoritmo_de_pilas(self):
+        registro = RegistroOperadores.estandar()
+        for expresion in self.constantes + self.con_variables:
+            if '^' in expresion:
+                continue  # '^' es asociativo a la derecha solo en el registro
+            variables = VARIABLES if expresion in self.con_variables else {}
+            pilas = ArbolDeExpresion()
+            pilas.construir_arbol(expresion)
+            pratt = ArbolDeExpresion()
+            pratt.construir_arbol(expresion, registro=registro)
+            with self.subTest(expresion=expresion):
+                self.assertEqual(list(pratt.recorrer_postorden(pratt.raiz)),
+                                 list(pilas.recorrer_postorden(pilas.raiz)))
+                self.assertMismoResultado(resultado(pilas.evaluar_arbol, pilas.raiz, variables),
+                                          resultado(pratt.evaluar_arbol, pratt.raiz, variables),
+                                          'Pratt')
+
+
+class TestOperadoresDelRegistro(unittest.TestCase):
+
+    def _evaluar(self, expresion, variables=None):
+        arbol = ArbolDeExpresion()
+        arbol.construir_arbol(expresion, registro=RegistroOperadores.estandar())
+        compilada = arbol.compilar_funcion()
+        argumentos = [(variables or {})[nombre] for nombre in compilada.nombres_variables]
+        valor = arbol.evaluar_arbol(arbol.raiz, variables)
+        self.assertEqual(compilada(*argumentos), valor)
+        return valor
+
+    def test_precedencia_y_asociatividad(self):
+        self.assertEqual(self._evaluar("2 ^ 3 ^ 2"), 512)
+        self.assertEqual(self._evaluar("-2 ^ 2"), -4)
+        self.assertEqual(self._evaluar("2 * -3 + 1"), -5)
+        self.assertEqual(self._evaluar("8 - 3 - 2"), 3)
+
+    def test_funciones(self):
+        self.assertEqual(self._evaluar("sqrt(16) + abs(-x)", {'x': 2.5}), 6.5)
+        self.assertEqual(self._evaluar("max(1, 7, 3) - min(4, 2)"), 5)
+        self.assertEqual(self._evaluar("-x + 2 * 3", {'x': 1}), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+"""
+Pruebas de la instrumentación por etapas
+"""
+import unittest
+
+from utils.instrumentacion import Instrumentacion
+
+
+class TestPicoDeMemoria(unittest.TestCase):
+
+    def setUp(self):
+        self.instrumentacion = Instrumentacion()
+        self.instrumentacion.activar()
+        self.addCleanup(self.instrumentacion.desactivar)
+
+    def test_etapas_seguidas_miden_su_propio_pico(self):
+        etapa = self.instrumentacion.etapa
+        with etapa("grande"):
+            datos = bytearray(4 << 20)
+            del datos
+        with etapa("pequena"):
+            datos = bytearray(1 << 10)
+            del datos
+        grande, pequena = self.instrumentacion.mediciones
+        self.assertGreaterEqual(grande.pico, 4 << 20)
+        self.assertIsNotNone(pequena.pico)
+        self.assertLess(pequena.pico, 1 << 20)
+
+    def test_una_etapa_anidada_no_reinicia_el_pico_de_la_externa(self):
+        etapa = self.instrumentacion.etapa
+        with etapa("externa"):
+            datos = bytearray(4 << 20)
+            del datos
+            with etapa("interna"):
+                pass
+        interna, externa = self.instrumentacion.mediciones
+        self.assertIsNone(interna.pico)
+        self.assertGreaterEqual(externa.pico, 4 << 20)
+
+    def test_sin_etapas_abiertas_la_siguiente_vuelve_a_medir_el_pico(self):
+        etapa = self.instrumentacion.etapa
+        with etapa("externa"):
+            with etapa("interna"):
+                pass
+        with etapa("siguiente"):
+            pass
+        self.assertIsNotNone(self.instrumentacion.mediciones[-1].pico)
+
+
+if __name__ == "__main__":
+    unittest.main()
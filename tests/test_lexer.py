@@ -0,0 +1,93 @@
+"""
+Pruebas de los errores del analizador léxico
+"""
+import unittest
+
+from Modelos.arbol import ArbolDeExpresion
+from Modelos.lexer import ErrorLexico, tokenizar
+from Modelos.operadores import RegistroOperadores
+
+
+class TestErrorLexico(unittest.TestCase):
+
+    def assertError(self, expresion, posicion, mensaje):
+        with self.assertRaises(ErrorLexico) as contexto:
+            list(tokenizar(expresion))
+        self.assertEqual(contexto.exception.posicion, posicion)
+        self.assertEqual(str(contexto.exception), f"{mensaje} (columna {posicion + 1})")
+
+    def test_posiciones(self):
+        casos = [
+            ("3 4", 2, "Se esperaba un operador antes de '4'"),
+            ("2 x", 2, "Se esperaba un operador antes de 'x'"),
+            ("2 (3)", 2, "Se esperaba un operador antes de '('"),
+            ("* 3", 0, "Se esperaba un número o '(' antes de '*'"),
+            ("3 + * 4", 4, "Se esperaba un número o '(' antes de '*'"),
+            ("(3 + )", 5, "Se esperaba un número o '(' antes de ')'"),
+            ("3 + 4)", 5, "Paréntesis de cierre sin apertura"),
+            ("3 # 4", 2, "Carácter inválido '#'"),
+            ("max(1, 2)", 3, "Se esperaba un operador antes de '('"),
+            ("(1, 2)", 2, "Carácter inválido ','"),
+            ("(1 + (2 * 3)", 0, "Paréntesis sin cerrar"),
+            ("1 + ((2) * (3", 4, "Paréntesis sin cerrar"),
+            ("3 +  ", 5, "Expresión incompleta"),
+            ("", 0, "Expresión incompleta"),
+        ]
+        for expresion, posicion, mensaje in casos:
+            with self.subTest(expresion=expresion):
+                self.assertError(expresion, posicion, mensaje)
+
+    def test_tokens_validos_con_posiciones(self):
+        tokens = list(tokenizar(" 12.5*(x -3)"))
+        self.assertEqual([(texto, posicion) for _, texto, _, posicion in tokens],
+                         [('12.5', 1), ('*', 5), ('(', 6), ('x', 7), ('-', 9),
+                          ('3', 10), (')', 11)])
+        self.assertEqual(tokens[0][2], 12.5)
+
+    def test_construir_arbol_propaga_el_error(self):
+        arbol = ArbolDeExpresion()
+        with self.assertRaises(ErrorLexico) as contexto:
+            arbol.construir_arbol("1 + 2 )")
+        self.assertEqual(contexto.exception.posicion, 6)
+        self.assertIsInstance(contexto.exception, ValueError)
+
+
+class TestErrorConservaElArbol(unittest.TestCase):
+    """
+    Un error léxico a mitad de `construir_arbol` no debe tocar el árbol anterior.
+    """
+
+    def assertConserva(self, arbol, expresion, esperado, **opciones):
+        raiz = arbol.raiz
+        with self.assertRaises(ErrorLexico):
+            arbol.construir_arbol(expresion, **opciones)
+        self.assertIs(arbol.raiz, raiz)
+        self.assertEqual(arbol.evaluar_arbol(arbol.raiz), esperado)
+
+    def test_arbol_del_registro_tras_un_error_de_pilas(self):
+        arbol = ArbolDeExpresion()
+        arbol.construir_arbol("sqrt(16)+1", registro=RegistroOperadores.estandar())
+        self.assertConserva(arbol, "1 + * 2", 5)
+        self.assertEqual(arbol.compilar_funcion()(), 5)
+
+    def test_arbol_compacto_y_compartido_tras_un_error(self):
+        for modo in ({'compacto': True}, {'compartir': True}):
+            arbol = ArbolDeExpresion()
+            arbol.construir_arbol("(1 + 2) * (1 + 2)", **modo)
+            expandidos = arbol.nodos_expandidos
+            with self.subTest(modo=modo):
+                self.assertConserva(arbol, "(1 + 2) * (1 +", 9)
+                self.assertConserva(arbol, "(1 + 2) * (1 + 2", 9, compartir=True)
+                self.assertEqual(arbol.nodos_expandidos, expandidos)
+                self.assertEqual(arbol.evaluar_compilado(), 9)
+
+    def test_arbol_de_pilas_tras_un_error_del_registro(self):
+        arbol = ArbolDeExpresion()
+        arbol.construir_arbol("2 * 3")
+        self.assertConserva(arbol, "sqrt(4) + ) ", 6, registro=RegistroOperadores.estandar())
+        self.assertIsNone(arbol.registro)
+        self.assertEqual(arbol.evaluar_compilado(), 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
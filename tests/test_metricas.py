@@ -0,0 +1,40 @@
+"""
+Pruebas del índice de métricas
+"""
+import unittest
+
+from Modelos.arbol import ArbolDeExpresion
+
+
+class TestIndiceMetricas(unittest.TestCase):
+
+    def test_metricas_del_arbol(self):
+        arbol = ArbolDeExpresion()
+        arbol.construir_arbol("(1 + 2) * 3 - 4")
+        metricas = arbol.metricas()
+        self.assertEqual(metricas.como_dict(), {'nodos': 7, 'nodos_unicos': 7, 'altura': 3,
+                                                'hojas': 4,
+                                                'histograma': {'*': 1, '+': 1, '-': 1}})
+        self.assertEqual(metricas.tamano(arbol.raiz.izq), 5)
+        self.assertEqual(metricas.profundidad(arbol.raiz.izq.izq.der), 3)
+        self.assertEqual(metricas.resumen(), "7 nodos · altura 3 · 4 hojas · *: 1, +: 1, -: 1")
+
+    def test_arbol_compartido_cuenta_cada_aparicion(self):
+        arbol = ArbolDeExpresion()
+        arbol.construir_arbol("(1 + 2) * (1 + 2)", compartir=True)
+        datos = arbol.metricas().como_dict()
+        self.assertEqual((datos['nodos'], datos['nodos_unicos'], datos['hojas']), (7, 4, 4))
+        self.assertEqual(datos['histograma'], {'*': 1, '+': 2})
+
+    def test_sin_calcular(self):
+        arbol = ArbolDeExpresion()
+        arbol.construir_arbol("1 + 2")
+        self.assertIsNone(arbol.metricas(calcular=False))
+        metricas = arbol.metricas()
+        self.assertIs(arbol.metricas(calcular=False), metricas)
+        arbol.construir_arbol("3 * 4")
+        self.assertIsNone(arbol.metricas(calcular=False))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+Pruebas de la evaluación con presupuesto de recursos
+"""
+import json
+import unittest
+
+from Modelos.arbol import ArbolDeExpresion
+from Modelos.presupuesto import (EXPONENTE, MAGNITUD, NODOS, TIEMPO, PresupuestoEvaluacion,
+                                 PresupuestoExcedido)
+
+
+def construir(expresion, **opciones):
+    arbol = ArbolDeExpresion()
+    arbol.construir_arbol(expresion, **opciones)
+    return arbol
+
+
+class TestPresupuestoExcedido(unittest.TestCase):
+
+    def evaluar(self, arbol, variables=None, **limites):
+        with self.assertRaises(PresupuestoExcedido) as contexto:
+            arbol.evaluar_arbol(arbol.raiz, variables, PresupuestoEvaluacion(**limites))
+        return contexto.exception
+
+    def test_dentro_del_presupuesto_da_el_mismo_valor(self):
+        arbol = construir("(2 + 3) * 4 ^ 2 - x")
+        presupuesto = PresupuestoEvaluacion(max_nodos=9, max_magnitud=1e6,
+                                            max_exponente=10, limite_segundos=60)
+        self.assertEqual(arbol.evaluar_arbol(arbol.raiz, {'x': 1}, presupuesto),
+                         arbol.evaluar_arbol(arbol.raiz, {'x': 1}))
+
+    def test_nodos_contados_al_evaluar(self):
+        error = self.evaluar(construir("1 + 2 * 3 - 4"), max_nodos=5)
+        self.assertEqual((error.limite, error.maximo, error.valor), (NODOS, 5, 6))
+        self.assertFalse(error.previsto)
+        self.assertEqual(str(error), "Presupuesto excedido: más de 5 nodos evaluados.")
+
+    def test_nodos_previstos_con_metricas(self):
+        arbol = construir("1 + 2 * 3 - 4")
+        arbol.metricas()
+        error = self.evaluar(arbol, max_nodos=5)
+        self.assertEqual((error.limite, error.valor), (NODOS, 7))
+        self.assertTrue(error.previsto)
+        self.assertEqual(str(error), "Presupuesto excedido: el árbol tiene 7 nodos, "
+                                     "más que el máximo de 5.")
+
+    def test_nodos_de_un_arbol_compartido(self):
+        # 15 nodos expandidos pero solo 5 distintos: con memo caben en 10
+        arbol = construir("(1 + 2) * (1 + 2) + (1 + 2) * (1 + 2)", compartir=True)
+        arbol.metricas()
+        presupuesto = PresupuestoEvaluacion(max_nodos=10)
+        self.assertEqual(arbol.evaluar_arbol(arbol.raiz, None, presupuesto), 18)
+
+    def test_magnitud_prevista_en_potencia(self):
+        error = self.evaluar(construir("10 ^ 400"), max_magnitud=1e100)
+        self.assertEqual((error.limite, error.operador), (MAGNITUD, '^'))
+        self.assertTrue(error.previsto)
+        self.assertAlmostEqual(error.valor, 400)
+        self.assertIn("'^' daría un resultado de ~1e400", str(error))
+
+    def test_magnitud_de_resultado_intermedio_y_variable(self):
+        error = self.evaluar(construir("1000 * 1000 + 1"), max_magnitud=1e5)
+        self.assertEqual((error.limite, error.valor, error.operador), (MAGNITUD, 1e6, '*'))
+        self.assertFalse(error.previsto)
+        error = self.evaluar(construir("x + 1"), {'x': -1e9}, max_magnitud=1e5)
+        self.assertEqual((error.limite, error.valor, error.operador), (MAGNITUD, -1e9, None))
+
+    def test_exponente(self):
+        error = self.evaluar(construir("2 ^ (3 * 100)"), max_exponente=100)
+        self.assertEqual((error.limite, error.valor, error.operador), (EXPONENTE, 300, '^'))
+        self.assertEqual(str(error), "Presupuesto excedido: el exponente 300 supera el "
+                                     "máximo de 100.")
+
+    def test_tiempo(self):
+        error = self.evaluar(construir("1 + 2 + 3 + 4"), limite_segundos=0, intervalo_reloj=1)
+        self.assertEqual((error.limite, error.maximo), (TIEMPO, 0))
+        self.assertGreater(error.valor, 0)
+
+    def test_como_dict_es_json(self):
+        error = PresupuestoExcedido(MAGNITUD, 1e10, 10 ** 400, '*')
+        datos = error.como_dict()
+        self.assertEqual(datos, {'limite': MAGNITUD, 'maximo': 1e10, 'valor': float('inf'),
+                                 'operador': '*', 'previsto': False})
+        json.dumps(datos)
+        self.assertEqual(PresupuestoExcedido(EXPONENTE, 5, 2 + 3j).como_dict()['valor'],
+                         abs(2 + 3j))
+
+    def test_es_un_value_error(self):
+        self.assertIsInstance(PresupuestoExcedido(NODOS, 1, 2), ValueError)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+"""
+Pruebas del programa postfijo
+"""
+import unittest
+
+import numpy as np
+
+from Modelos.arbol import ArbolDeExpresion
+
+
+class TestEvaluarLote(unittest.TestCase):
+
+    def _comparar(self, expresion, variables):
+        arbol = ArbolDeExpresion()
+        arbol.construir_arbol(expresion)
+        valores, mascara = arbol.evaluar_lote(variables)
+        for tamano_bloque in (1, 2, 7):
+            with self.subTest(expresion=expresion, tamano_bloque=tamano_bloque):
+                por_bloques, mascara_bloques = arbol.evaluar_lote(variables, tamano_bloque)
+                np.testing.assert_array_equal(por_bloques, valores)
+                np.testing.assert_array_equal(mascara_bloques, mascara)
+
+    def test_por_bloques_igual_que_completo_sin_variables(self):
+        self._comparar("2 + 3 * 4", {})
+        self._comparar("1 / (2 - 2)", {})
+
+    def test_por_bloques_igual_que_completo_con_variables(self):
+        x = np.linspace(-2.0, 2.0, 11)
+        self._comparar("x * (y + 2) ^ 2 - x / y", {'x': x, 'y': x[::-1]})
+        self._comparar("1 / (x - 1) + y", {'x': np.arange(5.0), 'y': 2.0})
+
+    def test_por_bloques_con_columnas_difundidas(self):
+        self._comparar("x * y - x", {'x': np.array([2.0]), 'y': np.arange(5.0)})
+        self._comparar("x / y", {'x': np.arange(6.0).reshape(3, 2), 'y': np.array([1.0, 0.0])})
+        self._comparar("x + y", {'x': np.arange(3.0).reshape(3, 1), 'y': np.arange(4.0)})
+
+    def test_cero_filas(self):
+        arbol = ArbolDeExpresion()
+        arbol.construir_arbol("x * 2")
+        vacio = {'x': np.empty(0)}
+        salida = (np.empty(0), np.empty(0, dtype=bool))
+        for tamano_bloque in (None, 3):
+            with self.subTest(tamano_bloque=tamano_bloque):
+                valores, mascara = arbol.evaluar_lote(vacio, tamano_bloque, salida)
+                self.assertIs(valores, salida[0])
+                self.assertEqual(valores.shape, (0,))
+                self.assertEqual(arbol.evaluar_lote(vacio, tamano_bloque)[0].shape, (0,))
+
+    def test_salida_sin_variables_se_llena_con_el_escalar(self):
+        arbol = ArbolDeExpresion()
+        arbol.construir_arbol("2 + 3 * 4")
+        salida = (np.zeros(3), np.ones(3, dtype=bool))
+        valores, mascara = arbol.evaluar_lote({}, salida=salida)
+        self.assertIs(valores, salida[0])
+        np.testing.assert_array_equal(valores, [14.0, 14.0, 14.0])
+        self.assertFalse(mascara.any())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+"""
+Pruebas del formato binario
+"""
+import os
+import random
+import struct
+import tempfile
+import unittest
+
+from Modelos.arbol import ArbolDeExpresion
+from Modelos.nodo import Nodo
+from Modelos.operadores import RegistroOperadores
+from Modelos.serializacion import (OP_CARGAR, CorpusArboles, deserializar, guardar_corpus,
+                                   leer_registro, serializar)
+
+
+class TestSerializacion(unittest.TestCase):
+
+    def test_ida_y_vuelta_conserva_el_valor(self):
+        arbol = ArbolDeExpresion()
+        arbol.construir_arbol("x * (y + 2) ^ 2 - x / y")
+        cargado = deserializar(serializar(arbol.raiz))
+        variables = {'x': 1.5, 'y': 2.0}
+        self.assertEqual(cargado.evaluar_arbol(cargado.raiz, variables),
+                         arbol.evaluar_arbol(arbol.raiz, variables))
+
+    def test_ida_y_vuelta_de_un_arbol_compartido(self):
+        arbol = ArbolDeExpresion()
+        arbol.construir_arbol("(1 + 2) * (1 + 2) + (1 + 2) * (1 + 2)", compartir=True)
+        cargado = deserializar(serializar(arbol.raiz))
+        self.assertEqual(cargado.evaluar_arbol(cargado.raiz), 18)
+        self.assertEqual(cargado.nodos_expandidos, 15)
+        self.assertEqual(cargado.nodos_unicos, 5)
+
+    def test_un_operador_unario_se_rechaza(self):
+        arbol = ArbolDeExpresion()
+        arbol.construir_arbol("-x + 2 * 3", registro=RegistroOperadores.estandar())
+        with self.assertRaisesRegex(ValueError, "Operador desconocido"):
+            serializar(arbol.raiz)
+
+    def test_una_funcion_de_dos_argumentos_se_rechaza(self):
+        arbol = ArbolDeExpresion()
+        arbol.construir_arbol("max(1, 2) + 3", registro=RegistroOperadores.estandar())
+        with self.assertRaisesRegex(ValueError, "Operador desconocido: max"):
+            serializar(arbol.raiz)
+
+    def test_un_nodo_con_solo_el_hijo_izquierdo_se_rechaza(self):
+        raiz = Nodo('+')
+        raiz.izq = Nodo(1)
+        with self.assertRaisesRegex(ValueError, "Operador desconocido"):
+            serializar(raiz)
+
+
+class TestDatosCorruptos(unittest.TestCase):
+    """
+    Cualquier dato truncado o alterado debe terminar en ValueError (o en un error
+    aritmético de los valores leídos), nunca en struct.error ni IndexError.
+    """
+
+    def _arbol(self, expresion, compartir=False):
+        arbol = ArbolDeExpresion()
+        arbol.construir_arbol(expresion, compartir=compartir)
+        return serializar(arbol.raiz)
+
+    def _usar(self, datos):
+        registro = leer_registro(datos)
+        variables = dict.fromkeys(registro.nombres_variables, 1.5)
+        registro.evaluar(variables)
+        registro.a_arbol()
+
+    def test_truncado_y_alterado(self):
+        aleatorio = random.Random(7)
+        for datos in (self._arbol("x * (y + 2) ^ 2 - x / y"),
+                      self._arbol("(x + 2) * (x + 2) + (x + 2) * (x + 2)", compartir=True)):
+            casos = [datos[:corte] for corte in range(len(datos))]
+            for _ in range(500):
+                alterado = bytearray(datos)
+                for _ in range(aleatorio.randint(1, 3)):
+                    alterado[aleatorio.randrange(len(alterado))] = aleatorio.randrange(256)
+                casos.append(bytes(alterado))
+            for caso in casos:
+                try:
+                    self._usar(caso)
+                except (ValueError, ArithmeticError):
+                    pass
+
+    def test_errores_con_posicion(self):
+        datos = self._arbol("x + y")  # Cabecera de 24 bytes, 2 enteros y 3 códigos
+        with self.assertRaisesRegex(ValueError, r"incompleto en la posición 0\."):
+            leer_registro(datos[:10])
+        with self.assertRaisesRegex(ValueError, r"incompleto en la posición 30\."):
+            leer_registro(datos[:30])
+        with self.assertRaisesRegex(ValueError, r"incompleto en la posición 35\."):
+            leer_registro(datos[:36])  # Falta la longitud del primer nombre
+        with self.assertRaisesRegex(ValueError, r"incompleto en la posición 37\."):
+            leer_registro(datos[:37])  # Falta el primer nombre
+        with self.assertRaisesRegex(ValueError, r"inválido en la posición 37\."):
+            leer_registro(datos[:37] + b"\xff" + datos[38:])
+
+    def test_indice_de_tabla_invalido(self):
+        datos = bytearray(self._arbol("(1 + 2) * (1 + 2)", compartir=True))
+        registro = leer_registro(bytes(datos))
+        # El único argumento entero es el de OP_CARGAR: apuntarlo fuera de la tabla
+        self.assertEqual(list(registro.codigos).count(OP_CARGAR), 1)
+        struct.pack_into('<I', datos, 24 + 8 * len(registro.constantes), 5)
+        registro = leer_registro(bytes(datos))
+        instruccion = list(registro.codigos).index(OP_CARGAR)
+        for operacion in (registro.evaluar, registro.a_arbol):
+            with self.subTest(operacion=operacion.__name__):
+                with self.assertRaisesRegex(ValueError, f"instrucción {instruccion}"):
+                    operacion()
+
+    def test_indice_de_corpus_corrupto(self):
+        with tempfile.TemporaryDirectory() as carpeta:
+            ruta = os.path.join(carpeta, "corpus.bin")
+            arbol = ArbolDeExpresion()
+            arbol.construir_arbol("1 + 2")
+            guardar_corpus(ruta, [arbol.raiz, arbol.raiz])
+            with CorpusArboles(ruta) as corpus:
+                self.assertEqual(corpus.evaluar(1), 3)
+            with open(ruta, 'r+b') as archivo:
+                archivo.seek(-24, os.SEEK_END)
+                archivo.write(struct.pack('<Q', 1 << 40))
+            with self.assertRaisesRegex(ValueError, "Índice del corpus corrupto"):
+                CorpusArboles(ruta)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+"""
+Pruebas del servidor de evaluación
+"""
+import asyncio
+import json
+import unittest
+
+from Controllers.controller_servidor import ServidorEvaluacion, evaluar_solicitud
+
+
+class TestEvaluarSolicitud(unittest.TestCase):
+
+    def test_recorridos_a_pedido(self):
+        respuesta = evaluar_solicitud({'id': 7, 'expresion': "1 + 2 * x", 'recorridos': True,
+                                       'variables': {'x': 3}})
+        self.assertEqual((respuesta['id'], respuesta['valor']), (7, 7))
+        self.assertEqual(respuesta['postorden'], "1.0  2.0  x  *  +")
+        self.assertEqual(respuesta['inorden'], "1.0  +  2.0  *  x")
+        self.assertNotIn('inorden', evaluar_solicitud({'expresion': "1 + 2"}))
+
+    def test_errores(self):
+        self.assertIsNotNone(evaluar_solicitud({'expresion': 3})['error'])
+        self.assertIn("columna", evaluar_solicitud({'expresion': "1 +"})['error'])
+        self.assertIn("cero", evaluar_solicitud({'expresion': "1 / 0"})['error'])
+
+
+class TestCerrarServidor(unittest.IsolatedAsyncioTestCase):
+
+    async def test_cerrar_con_clientes_conectados(self):
+        servidor = ServidorEvaluacion(espera_lote=0)
+        await servidor.iniciar(puerto=0)
+        host, puerto = servidor.direcciones()[0][:2]
+        clientes = [await asyncio.open_connection(host, puerto) for _ in range(3)]
+        for numero, (lector, escritor) in enumerate(clientes):
+            escritor.write(json.dumps({'id': numero, 'expresion': "2 * 3"}).encode() + b"\n")
+            self.assertEqual(json.loads(await lector.readline())['valor'], 6)
+        self.assertEqual(servidor.conexiones, 3)
+
+        await asyncio.wait_for(servidor.cerrar(), 5)
+        self.assertEqual(servidor.conexiones, 0)
+        propias = {asyncio.current_task()}
+        self.assertEqual([tarea for tarea in asyncio.all_tasks() if tarea not in propias], [])
+        for lector, escritor in clientes:
+            self.assertEqual(await asyncio.wait_for(lector.read(), 5), b"")
+            escritor.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,245 @@
+"""
+Instrumentación por etapas: tiempo, memoria y número de nodos
+"""
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+
+
+class MedicionEtapa:
+    """
+    Una ejecución medida de una etapa. Se usa como administrador de contexto:
+
+        with instrumentacion.etapa("construir") as medicion:
+            ...
+            medicion.nodos = 42
+    """
+
+    __slots__ = ('_instrumentacion', 'nombre', 'nodos', 'inicio', 'duracion',
+                 'memoria', 'pico', 'hilo', '_memoria_inicial', '_abierta', '_mide_pico')
+
+    activa = True  # Permite saltarse los conteos costosos cuando no se mide
+
+    def __init__(self, instrumentacion, nombre):
+        self._instrumentacion = instrumentacion
+        self.nombre = nombre
+        self.nodos = None
+        self.inicio = 0.0
+        self.duracion = 0.0
+        self.memoria = None  # Bytes retenidos al terminar la etapa
+        self.pico = None     # Bytes reservados en el momento de mayor uso
+        self.hilo = threading.get_ident()
+        self._memoria_inicial = 0
+        self._abierta = False   # Cuenta entre las etapas abiertas con memoria
+        self._mide_pico = False
+
+    def __enter__(self):
+        if tracemalloc.is_tracing():
+            self._abierta = True
+            self._mide_pico = self._instrumentacion._abrir_etapa()
+            self._memoria_inicial = tracemalloc.get_traced_memory()[0]
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        self.duracion = time.perf_counter() - self.inicio
+        if tracemalloc.is_tracing():
+            actual, pico = tracemalloc.get_traced_memory()
+            self.memoria = actual - self._memoria_inicial
+            if self._mide_pico:
+                self.pico = pico - self._memoria_inicial
+        if self._abierta:
+            self._instrumentacion._cerrar_etapa()
+        self._instrumentacion.registrar(self)
+        return False
+
+
+class _EtapaSinMedir:
+    """
+    Administrador de contexto que no mide nada; es el que se entrega cuando la
+    instrumentación está desactivada, así que su costo es el de una llamada.
+    """
+
+    __slots__ = ('nodos',)
+
+    activa = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        return False
+
+
+_SIN_MEDIR = _EtapaSinMedir()
+
+
+class Instrumentacion:
+    """
+    Registra, para cada etapa del programa, el tiempo de pared, la memoria
+    reservada (con `tracemalloc`) y el número de nodos procesados. Desactivada no
+    mide nada: `etapa()` devuelve un contexto vacío compartido.
+
+    Las mediciones de memoria son de todo el proceso; si dos etapas corren a la vez
+    en hilos distintos, cada una ve también lo que reserva la otra. El pico de
+    `tracemalloc` es uno solo para el proceso y reiniciarlo afectaría a las demás
+    etapas abiertas, así que solo lo mide la etapa más externa (la que empieza sin
+    ninguna otra abierta, en cualquier hilo), y abarca todo lo que ocurre mientras
+    dura; las etapas anidadas o concurrentes registran su memoria retenida pero
+    no un pico.
+    """
+
+    def __init__(self, capacidad=2000):
+        """
+        Crea la instrumentación desactivada.
+
+        Args:
+            capacidad (int): Número máximo de mediciones que se conservan (las más
+                             antiguas se descartan).
+        """
+        self.activa = False
+        self.mediciones = deque(maxlen=capacidad)
+        self._origen = time.perf_counter()
+        self._inicio_tracemalloc = False
+        self._candado = threading.Lock()
+        self._abiertas = 0  # Etapas abiertas que miden memoria, en todos los hilos
+
+    def activar(self, memoria=True):
+        """
+        Empieza a medir. Medir la memoria hace más lento todo el programa mientras
+        la instrumentación esté activa.
+
+        Args:
+            memoria (bool): Si es True, se inicia `tracemalloc` (si no estaba ya).
+        """
+        if memoria and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._inicio_tracemalloc = True
+        self.activa = True
+
+    def desactivar(self):
+        """
+        Deja de medir y detiene `tracemalloc` si lo inició esta instrumentación.
+        Las mediciones ya registradas se conservan.
+        """
+        self.activa = False
+        if self._inicio_tracemalloc:
+            tracemalloc.stop()
+            self._inicio_tracemalloc = False
+
+    def etapa(self, nombre):
+        """
+        Devuelve el contexto que mide una ejecución de la etapa `nombre`.
+
+        Args:
+            nombre (str): Nombre de la etapa.
+
+        Returns:
+            MedicionEtapa: La medición (o un contexto vacío si está desactivada).
+        """
+        if not self.activa:
+            return _SIN_MEDIR
+        return MedicionEtapa(self, nombre)
+
+    def _abrir_etapa(self):
+        """
+        Cuenta una etapa que empieza a medir memoria. Si no había ninguna otra
+        abierta, reinicia el pico de `tracemalloc` para ella.
+
+        Returns:
+            bool: True si la etapa es la más externa y debe medir el pico.
+        """
+        with self._candado:
+            self._abiertas += 1
+            if self._abiertas > 1:
+                return False
+            tracemalloc.reset_peak()
+            return True
+
+    def _cerrar_etapa(self):
+        """
+        Descuenta una etapa abierta con `_abrir_etapa`.
+        """
+        with self._candado:
+            self._abiertas -= 1
+
+    def registrar(self, medicion):
+        """
+        Guarda una medición terminada.
+
+        Args:
+            medicion (MedicionEtapa): La medición a guardar.
+        """
+        self.mediciones.append(medicion)
+
+    def limpiar(self):
+        """
+        Descarta todas las mediciones.
+        """
+        self.mediciones.clear()
+
+    def estadisticas(self):
+        """
+        Resume las mediciones por etapa, en el orden en que cada etapa apareció
+        por primera vez.
+
+        Returns:
+            dict: Para cada etapa, un dict con 'veces', 'total', 'media', 'maximo' y
+                  'ultima' (segundos), 'pico' (máximo de bytes en el pico, o None)
+                  y 'nodos' (de la última medición que los indicó, o None).
+        """
+        resumen = {}
+        for medicion in list(self.mediciones):
+            datos = resumen.get(medicion.nombre)
+            if datos is None:
+                datos = resumen[medicion.nombre] = {
+                    'veces': 0, 'total': 0.0, 'media': 0.0, 'maximo': 0.0,
+                    'ultima': 0.0, 'pico': None, 'nodos': None}
+            datos['veces'] += 1
+            datos['total'] += medicion.duracion
+            datos['maximo'] = max(datos['maximo'], medicion.duracion)
+            datos['ultima'] = medicion.duracion
+            if medicion.pico is not None:
+                datos['pico'] = max(datos['pico'] or 0, medicion.pico)
+            if medicion.nodos is not None:
+                datos['nodos'] = medicion.nodos
+        for datos in resumen.values():
+            datos['media'] = datos['total'] / datos['veces']
+        return resumen
+
+    def traza(self):
+        """
+        Convierte las mediciones al formato de trazas de eventos de Chrome, que se
+        puede abrir en chrome://tracing o en Perfetto.
+
+        Returns:
+            dict: La traza, con un evento completo ("X") por medición.
+        """
+        eventos = []
+        for medicion in list(self.mediciones):
+            argumentos = {'nodos': medicion.nodos, 'memoria': medicion.memoria,
+                          'pico': medicion.pico}
+            eventos.append({
+                'name': medicion.nombre,
+                'ph': 'X',
+                'ts': (medicion.inicio - self._origen) * 1e6,
+                'dur': medicion.duracion * 1e6,
+                'pid': os.getpid(),
+                'tid': medicion.hilo,
+                'args': {clave: valor for clave, valor in argumentos.items()
+                         if valor is not None},
+            })
+        return {'traceEvents': eventos, 'displayTimeUnit': 'ms'}
+
+    def volcar_json(self, ruta):
+        """
+        Escribe la traza de `traza()` en un archivo JSON.
+
+        Args:
+            ruta (str): Ruta del archivo de salida.
+        """
+        with open(ruta, 'w', encoding='utf-8') as archivo:
+            json.dump(self.traza(), archivo, ensure_ascii=False)